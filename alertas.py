@@ -0,0 +1,270 @@
+import json
+import queue
+import threading
+import time
+
+import numpy as np
+import requests
+from rich.table import Table
+
+from constants import (
+    DURACAO_MINIMA_ALERTA,
+    POSES_ALERTA,
+    RECARGA_ALERTA,
+    TOLERANCIA_ALERTA,
+)
+
+# Alertas aguardando a thread de envio; com a fila cheia o alerta é
+# descartado em vez de segurar o loop de inferência
+TAMANHO_FILA_ALERTAS = 100
+# Tempo limite (conexão, leitura) do webhook: um alerta atrasado perde o
+# sentido, então não há novas tentativas longas como em envio.py
+TIMEOUT_WEBHOOK = (1.0, 2.0)
+
+_FIM = object()
+
+
+class SaidaArquivo:
+    """
+    Acrescenta cada alerta como uma linha JSON ao arquivo.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._arquivo = open(caminho, 'a', encoding='utf-8')
+
+    def enviar(self, alerta):
+        self._arquivo.write(json.dumps(alerta, ensure_ascii=False) + '\n')
+        self._arquivo.flush()
+
+    def fechar(self):
+        self._arquivo.close()
+
+
+class SaidaWebhook:
+    """
+    Envia cada alerta por POST (JSON) ao webhook, reaproveitando a conexão.
+    """
+
+    def __init__(self, url, timeout=TIMEOUT_WEBHOOK):
+        self.url = url
+        self.timeout = timeout
+        self.sessao = requests.Session()
+
+    def enviar(self, alerta):
+        resposta = self.sessao.post(
+            self.url, json=alerta, timeout=self.timeout
+        )
+        resposta.raise_for_status()
+
+    def fechar(self):
+        self.sessao.close()
+
+
+class SaidaCallback:
+    """
+    Chama funcao(alerta) na thread de envio dos alertas.
+    """
+
+    def __init__(self, funcao):
+        self.funcao = funcao
+
+    def enviar(self, alerta):
+        self.funcao(alerta)
+
+    def fechar(self):
+        pass
+
+
+def criar_saida(destino):
+    """
+    Saída para o destino informado: URL http(s) vira webhook, qualquer
+    outro texto é o caminho de um arquivo .jsonl.
+    """
+    if destino.startswith(('http://', 'https://')):
+        return SaidaWebhook(destino)
+    return SaidaArquivo(destino)
+
+
+class _Episodio:
+    __slots__ = ('alertado', 'inicio', 'ultimo_alerta', 'ultimo_visto')
+
+    def __init__(self):
+        self.inicio = None
+        self.ultimo_visto = None
+        self.alertado = False
+        self.ultimo_alerta = None
+
+
+class MotorAlertas:
+    """
+    Observa a pose de cada frame e dispara um alerta quando uma das poses
+    de risco persiste por duracao_minima segundos.
+
+    Ausências de até tolerancia segundos (um frame mal classificado) não
+    encerram o episódio. Cada episódio gera no máximo um alerta e, entre
+    dois alertas da mesma pose, passam pelo menos recarga segundos; os
+    episódios que caem nesse intervalo são contados como suprimidos.
+
+    observar() custa tempo constante e nunca bloqueia: o alerta vai para
+    uma fila limitada e é entregue às saídas por uma thread de fundo. A
+    latência de cada alerta vai do instante de captura do frame que o
+    confirmou (ou do momento da emissão, com tempo_real=False, quando os
+    instantes são tempo da mídia) até a entrega à última saída.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        saidas,
+        poses=POSES_ALERTA,
+        duracao_minima=DURACAO_MINIMA_ALERTA,
+        tolerancia=TOLERANCIA_ALERTA,
+        recarga=RECARGA_ALERTA,
+        tempo_real=True,
+        origem='',
+    ):
+        self.saidas = saidas
+        self.duracao_minima = duracao_minima
+        self.tolerancia = tolerancia
+        self.recarga = recarga
+        self.tempo_real = tempo_real
+        self.origem = origem
+        self._episodios = {pose: _Episodio() for pose in poses}
+
+        self._fila = queue.Queue(maxsize=TAMANHO_FILA_ALERTAS)
+        self._trava = threading.Lock()
+
+        self.alertas = []
+        self.emitidos = 0
+        self.suprimidos = 0
+        self.descartados = 0
+        self.falhas = 0
+        self.ultimo_erro = None
+
+        self._thread = threading.Thread(
+            target=self._loop_envio, name='envio-alertas', daemon=True
+        )
+        self._thread.start()
+
+    def observar(self, instante, pose, confianca):
+        """
+        Registra a pose de um frame (instante em segundos). Retorna o
+        alerta emitido por este frame, se houver.
+        """
+        for pose_alerta, episodio in self._episodios.items():
+            if pose != pose_alerta:
+                continue
+            if (
+                episodio.ultimo_visto is None
+                or instante - episodio.ultimo_visto > self.tolerancia
+            ):
+                episodio.inicio = instante
+                episodio.alertado = False
+            episodio.ultimo_visto = instante
+
+            duracao = instante - episodio.inicio
+            if episodio.alertado or duracao < self.duracao_minima:
+                continue
+            # Um alerta por episódio, mesmo que suprimido pela recarga
+            episodio.alertado = True
+            if (
+                episodio.ultimo_alerta is not None
+                and instante - episodio.ultimo_alerta < self.recarga
+            ):
+                self.suprimidos += 1
+                continue
+            episodio.ultimo_alerta = instante
+            return self._emitir(instante, pose, confianca, duracao)
+        return None
+
+    def observar_lote(self, instantes, selecoes):
+        """
+        Observa um lote de frames e retorna a lista de alertas emitidos.
+        """
+        emitidos = []
+        for instante, (pose, confianca) in zip(instantes, selecoes):
+            alerta = self.observar(instante, pose, confianca)
+            if alerta is not None:
+                emitidos.append(alerta)
+        return emitidos
+
+    def _emitir(self, instante, pose, confianca, duracao):
+        alerta = {
+            'origem': self.origem,
+            'pose': pose,
+            'confianca': round(float(confianca), 4),
+            'inicio_s': instante - duracao,
+            'instante_s': instante,
+            'duracao_s': duracao,
+            'emitido_em': time.time(),
+        }
+        self.emitidos += 1
+        try:
+            self._fila.put_nowait(alerta)
+        except queue.Full:
+            self.descartados += 1
+        return alerta
+
+    def encerrar(self, timeout=None):
+        """
+        Entrega os alertas já emitidos, encerra a thread e fecha as saídas.
+        """
+        # put bloqueante: o fim precisa entrar mesmo com a fila cheia
+        self._fila.put(_FIM)
+        self._thread.join(timeout)
+        for saida in self.saidas:
+            saida.fechar()
+
+    def _loop_envio(self):
+        while True:
+            alerta = self._fila.get()
+            if alerta is _FIM:
+                break
+            entregue = True
+            for saida in self.saidas:
+                try:
+                    saida.enviar(alerta)
+                except Exception as e:
+                    # Uma saída com falha não impede a entrega nas demais
+                    entregue = False
+                    self.falhas += 1
+                    self.ultimo_erro = f'{type(saida).__name__}: {e}'
+            origem = (
+                alerta['instante_s']
+                if self.tempo_real
+                else alerta['emitido_em']
+            )
+            alerta['latencia_ms'] = (time.time() - origem) * 1000
+            alerta['entregue'] = entregue
+            with self._trava:
+                self.alertas.append(alerta)
+
+    def latencias_ms(self):
+        """
+        (p50, p95, máxima) da latência dos alertas já processados, em ms.
+        """
+        with self._trava:
+            latencias = [a['latencia_ms'] for a in self.alertas]
+        if not latencias:
+            return 0.0, 0.0, 0.0
+        p50, p95 = np.percentile(latencias, (50, 95))
+        return float(p50), float(p95), max(latencias)
+
+    def tabela(self, titulo='🚨 Alertas'):
+        table = Table(title=titulo)
+        table.add_column('Início (s)', justify='right')
+        table.add_column('Pose', style='cyan')
+        table.add_column('Duração (s)', justify='right')
+        table.add_column('Latência (ms)', justify='right')
+        table.add_column('Entregue')
+        with self._trava:
+            alertas = list(self.alertas)
+        for alerta in alertas:
+            table.add_row(
+                f'{alerta["inicio_s"]:.1f}',
+                alerta['pose'],
+                f'{alerta["duracao_s"]:.1f}',
+                f'{alerta["latencia_ms"]:.1f}',
+                'sim' if alerta['entregue'] else 'não',
+            )
+        return table
@@ -0,0 +1,282 @@
+import argparse
+import importlib.util
+import os
+from pathlib import Path
+
+import numpy as np
+from rich.console import Console
+from rich.table import Table
+from ultralytics import YOLO
+
+from constants import (
+    ARQUIVO_CONFIGURACAO_DATASET,
+    ARQUIVO_PESOS,
+    BACKENDS_INFERENCIA,
+)
+from deteccao import COLUNA_CONFIANCA, dados_deteccoes, selecionar_pose
+from inferencia import inferir_lote, iterar_lotes_imagens, listar_imagens
+
+# Formato de exportação do ultralytics e sufixo do artefato gerado ao lado
+# dos pesos (best.pt -> best.onnx, best_openvino_model/)
+FORMATOS_EXPORTACAO = {
+    'onnx': ('onnx', '.onnx'),
+    'openvino': ('openvino', '_openvino_model'),
+}
+# Modelos quantizados: só podem ser gerados por quantizacao.py, que valida
+# a precisão antes de gravá-los
+ARTEFATOS_QUANTIZADOS = {'openvino-int8': '_int8_openvino_model'}
+# Pacote de runtime de cada backend e o extra do pyproject que o instala
+PACOTES_BACKEND = {
+    'onnx': ('onnxruntime', 'onnx'),
+    'openvino': ('openvino', 'openvino'),
+    'openvino-int8': ('openvino', 'openvino'),
+}
+TAMANHO_EXPORTACAO = 640
+
+# Imagens usadas na verificação de paridade
+DIRETORIO_VALIDACAO = str(
+    Path(ARQUIVO_CONFIGURACAO_DATASET).parent / 'valid' / 'images'
+)
+CONCORDANCIA_MINIMA = 0.98  # fração das imagens com a mesma pose
+DIFERENCA_MAXIMA_CONFIANCA = 0.05
+IOU_MINIMO = 0.9
+
+console = Console()
+
+
+def _validar_backend(backend):
+    if backend not in BACKENDS_INFERENCIA:
+        raise ValueError(
+            f'Backend desconhecido: {backend!r}.'
+            + f' Opções: {", ".join(BACKENDS_INFERENCIA)}'
+        )
+
+
+def verificar_dependencias(backend):
+    """
+    Falha com uma mensagem de instalação quando o pacote de runtime do
+    backend não está instalado.
+    """
+    _validar_backend(backend)
+    if backend not in PACOTES_BACKEND:
+        return
+    pacote, extra = PACOTES_BACKEND[backend]
+    if importlib.util.find_spec(pacote) is None:
+        raise ModuleNotFoundError(
+            f'O backend {backend!r} requer o pacote {pacote!r}.'
+            + f' Instale com: uv sync --extra {extra}'
+            + f' (ou pip install ".[{extra}]")',
+            name=pacote,
+        )
+
+
+def caminho_exportado(weights_path, backend):
+    """
+    Caminho do artefato exportado para o backend, ao lado dos pesos.
+    """
+    _validar_backend(backend)
+    if backend == 'pytorch':
+        return weights_path
+    if backend in ARTEFATOS_QUANTIZADOS:
+        sufixo = ARTEFATOS_QUANTIZADOS[backend]
+    else:
+        _, sufixo = FORMATOS_EXPORTACAO[backend]
+    base, _ = os.path.splitext(weights_path)
+    return base + sufixo
+
+
+def exportacao_atualizada(weights_path, backend):
+    """
+    Indica se o artefato exportado existe e é mais novo que os pesos.
+    """
+    caminho = caminho_exportado(weights_path, backend)
+    if not os.path.exists(caminho):
+        return False
+    if not os.path.exists(weights_path):
+        return True
+    return os.path.getmtime(caminho) >= os.path.getmtime(weights_path)
+
+
+def exportar_modelo(
+    weights_path, backend, imgsz=TAMANHO_EXPORTACAO, forcar=False
+):
+    """
+    Exporta os pesos para o backend uma única vez e retorna o caminho a ser
+    carregado com YOLO(). O artefato é reaproveitado enquanto os pesos não
+    mudarem. A exportação usa eixos dinâmicos para aceitar lotes e tamanhos
+    de imagem variados. Falha antes de exportar se o pacote de runtime do
+    backend não estiver instalado.
+    """
+    caminho = caminho_exportado(weights_path, backend)
+    if backend == 'pytorch':
+        return caminho
+    verificar_dependencias(backend)
+    if not forcar and exportacao_atualizada(weights_path, backend):
+        return caminho
+    if backend in ARTEFATOS_QUANTIZADOS:
+        raise FileNotFoundError(
+            f'Modelo {backend} ausente ou mais antigo que os pesos.'
+            + ' Gere-o com: python quantizacao.py'
+        )
+
+    formato, _ = FORMATOS_EXPORTACAO[backend]
+    exportado = YOLO(weights_path).export(
+        format=formato, imgsz=imgsz, dynamic=True
+    )
+    return str(exportado or caminho)
+
+
+def _iou(caixa_a, caixa_b):
+    x1 = max(caixa_a[0], caixa_b[0])
+    y1 = max(caixa_a[1], caixa_b[1])
+    x2 = min(caixa_a[2], caixa_b[2])
+    y2 = min(caixa_a[3], caixa_b[3])
+    intersecao = max(x2 - x1, 0) * max(y2 - y1, 0)
+    area_a = (caixa_a[2] - caixa_a[0]) * (caixa_a[3] - caixa_a[1])
+    area_b = (caixa_b[2] - caixa_b[0]) * (caixa_b[3] - caixa_b[1])
+    return intersecao / max(area_a + area_b - intersecao, 1e-9)
+
+
+def _melhor_caixa(resultado):
+    dados = dados_deteccoes(resultado)
+    if not len(dados):
+        return None
+    return dados[int(dados[:, COLUNA_CONFIANCA].argmax()), :4]
+
+
+def _comparar_resultados(esperado, obtido):
+    """
+    Compara dois resultados da mesma imagem. Retorna (mesma_pose,
+    diferenca_confianca, iou), com iou None se algum não detectou nada.
+    """
+    pose_esperada, conf_esperada = selecionar_pose(esperado)
+    pose_obtida, conf_obtida = selecionar_pose(obtido)
+    caixa_esperada = _melhor_caixa(esperado)
+    caixa_obtida = _melhor_caixa(obtido)
+    iou = None
+    if caixa_esperada is not None and caixa_obtida is not None:
+        iou = _iou(caixa_esperada, caixa_obtida)
+    return (
+        pose_esperada == pose_obtida,
+        abs(conf_esperada - conf_obtida),
+        iou,
+    )
+
+
+def _comparar_modelos(referencia, candidato, caminhos, imgsz):
+    """
+    Infere cada imagem nos dois modelos. Retorna (diferencas, ious,
+    divergentes): as diferenças de confiança das imagens com a mesma pose,
+    os IoUs das caixas e os nomes das imagens com pose diferente.
+    """
+    diferencas, ious, divergentes = [], [], []
+    for lote_caminhos, imagens in iterar_lotes_imagens(caminhos, 1):
+        mesma_pose, diferenca, iou = _comparar_resultados(
+            inferir_lote(referencia, imagens, imgsz)[0],
+            inferir_lote(candidato, imagens, imgsz)[0],
+        )
+        if mesma_pose:
+            diferencas.append(diferenca)
+        else:
+            divergentes.append(os.path.basename(lote_caminhos[0]))
+        if iou is not None:
+            ious.append(iou)
+    return diferencas, ious, divergentes
+
+
+def verificar_paridade(
+    weights_path,
+    backend,
+    diretorio=DIRETORIO_VALIDACAO,
+    imgsz=TAMANHO_EXPORTACAO,
+):
+    """
+    Compara o backend com o modelo PyTorch nas imagens de validação: pose
+    escolhida, confiança e IoU da detecção mais confiante de cada imagem.
+    Retorna um dicionário com o resumo e se a paridade foi aprovada.
+    """
+    referencia = YOLO(weights_path)
+    candidato = YOLO(exportar_modelo(weights_path, backend, imgsz))
+    diferencas, ious, divergentes = _comparar_modelos(
+        referencia, candidato, listar_imagens(diretorio), imgsz
+    )
+
+    iguais = len(diferencas)
+    total = max(iguais + len(divergentes), 1)
+    concordancia = iguais / total
+    diferenca_maxima = max(diferencas, default=0.0)
+    iou_medio = float(np.mean(ious)) if ious else 1.0
+    return {
+        'backend': backend,
+        'imagens': iguais + len(divergentes),
+        'concordancia_pose': concordancia,
+        'diferenca_max_confianca': diferenca_maxima,
+        'iou_medio': iou_medio,
+        'divergentes': divergentes,
+        'aprovado': (
+            concordancia >= CONCORDANCIA_MINIMA
+            and diferenca_maxima <= DIFERENCA_MAXIMA_CONFIANCA
+            and iou_medio >= IOU_MINIMO
+        ),
+    }
+
+
+def tabela_paridade(resumo):
+    table = Table(title=f'🔁 Paridade PyTorch x {resumo["backend"]}')
+    table.add_column('Métrica', style='cyan')
+    table.add_column('Valor', justify='right')
+    table.add_column('Limite', justify='right')
+    table.add_row('Imagens', str(resumo['imagens']), '-')
+    table.add_row(
+        'Concordância da pose',
+        f'{resumo["concordancia_pose"] * 100:.1f}%',
+        f'≥ {CONCORDANCIA_MINIMA * 100:.0f}%',
+    )
+    table.add_row(
+        'Diferença máx. de confiança',
+        f'{resumo["diferenca_max_confianca"]:.4f}',
+        f'≤ {DIFERENCA_MAXIMA_CONFIANCA}',
+    )
+    table.add_row('IoU médio', f'{resumo["iou_medio"]:.3f}', f'≥ {IOU_MINIMO}')
+    return table
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Exporta os pesos para outro backend e verifica a'
+        ' paridade com o modelo PyTorch.'
+    )
+    parser.add_argument('--pesos', default=ARQUIVO_PESOS)
+    parser.add_argument(
+        '--backend',
+        choices=list(FORMATOS_EXPORTACAO),
+        default='onnx',
+    )
+    parser.add_argument('--imgsz', type=int, default=TAMANHO_EXPORTACAO)
+    parser.add_argument('--valid', default=DIRETORIO_VALIDACAO)
+    parser.add_argument(
+        '--forcar', action='store_true', help='exporta mesmo com cache'
+    )
+    args = parser.parse_args()
+
+    with console.status(f'[bold green]Exportando para {args.backend}...'):
+        caminho = exportar_modelo(
+            args.pesos, args.backend, args.imgsz, args.forcar
+        )
+    console.print(f'📦 Modelo exportado: [bold]{os.path.abspath(caminho)}[/]')
+
+    with console.status('[bold green]Verificando paridade...'):
+        resumo = verificar_paridade(
+            args.pesos, args.backend, args.valid, args.imgsz
+        )
+    console.print(tabela_paridade(resumo))
+    if resumo['divergentes']:
+        console.print(
+            '⚠️ Imagens com pose diferente: '
+            + ', '.join(resumo['divergentes'][:20])
+        )
+    if resumo['aprovado']:
+        console.print('[bold green]✓ Paridade aprovada[/]')
+    else:
+        console.print('[bold red]❌ Paridade reprovada[/]')
+        raise SystemExit(1)
@@ -0,0 +1,479 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import threading
+import time
+
+import cv2
+import psutil
+from rich.console import Console
+from rich.table import Table
+
+from captura import CapturaUltimoFrame
+from constants import (
+    ARQUIVO_PESOS,
+    BACKEND_PADRAO,
+    BACKENDS_INFERENCIA,
+    BASE_DIR,
+    CLASSES_DETECTADAS,
+    POSE_NAO_DETECTADA,
+)
+from deteccao import contabilizar_poses, selecionar_poses
+from inferencia import (
+    inferir_lote,
+    inferir_lote_com_movimento,
+    iterar_lotes_imagens,
+    ler_lote,
+    listar_imagens,
+)
+from linha_tempo import LinhaTempoPoses
+from metricas import MetricasEtapas
+from modelos import carregar_modelo
+
+# Diretórios de imagens dos datasets incluídos no repositório
+PADRAO_IMAGENS_DATASET = str(
+    BASE_DIR / 'downloads' / 'YOLOElderlyPose.*' / '*' / 'images'
+)
+
+# Configurações medidas por padrão
+TAMANHOS_IMAGEM_BENCHMARK = (320, 480, 640)
+LOTES_BENCHMARK = (1, 4, 8)
+
+# Vídeo sintético: cada imagem vira alguns frames consecutivos, como uma
+# cena parada de câmera, em resolução e FPS fixos
+FRAMES_POR_IMAGEM = 5
+FPS_VIDEO_SINTETICO = 15
+TAMANHO_VIDEO_SINTETICO = (640, 480)  # largura, altura
+
+# Intervalo (s) entre amostras de memória e CPU
+INTERVALO_AMOSTRAGEM_RECURSOS = 0.05
+
+console = Console()
+
+
+class MonitorRecursos:
+    """
+    Amostra em uma thread a memória residente (RSS) do processo para obter o
+    pico, e calcula a utilização de CPU pelo tempo de CPU consumido entre o
+    início e o fim da medição.
+    """
+
+    def __init__(self, intervalo=INTERVALO_AMOSTRAGEM_RECURSOS):
+        self.intervalo = intervalo
+        self.processo = psutil.Process()
+        self.pico_rss = 0
+        self.cpu_percentual = 0.0
+        self._parar = threading.Event()
+        self._thread = None
+
+    def _tempo_cpu(self):
+        tempos = self.processo.cpu_times()
+        return tempos.user + tempos.system
+
+    def _amostrar(self):
+        while not self._parar.is_set():
+            self.pico_rss = max(self.pico_rss, self.processo.memory_info().rss)
+            self._parar.wait(self.intervalo)
+
+    def __enter__(self):
+        self.pico_rss = self.processo.memory_info().rss
+        self._cpu_inicio = self._tempo_cpu()
+        self._inicio = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._amostrar, name='benchmark-recursos', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self._parar.set()
+        self._thread.join()
+        parede = max(time.perf_counter() - self._inicio, 1e-9)
+        # 100% = um núcleo inteiro ocupado durante a medição
+        self.cpu_percentual = (
+            (self._tempo_cpu() - self._cpu_inicio) / parede * 100
+        )
+
+
+def coletar_imagens(padrao=PADRAO_IMAGENS_DATASET, limite=None):
+    """
+    Lista as imagens dos diretórios que casam com o padrão, em ordem
+    determinística, para que execuções diferentes usem a mesma entrada.
+    """
+    caminhos = []
+    for diretorio in sorted(glob.glob(padrao)):
+        caminhos.extend(listar_imagens(diretorio))
+    return caminhos[:limite] if limite else caminhos
+
+
+def criar_video_sintetico(
+    caminhos,
+    destino,
+    frames_por_imagem=FRAMES_POR_IMAGEM,
+    fps=FPS_VIDEO_SINTETICO,
+    tamanho=TAMANHO_VIDEO_SINTETICO,
+):
+    """
+    Grava um vídeo com as imagens redimensionadas, cada uma repetida por
+    frames_por_imagem frames. Retorna o número de frames gravados.
+    """
+    writer = cv2.VideoWriter(
+        destino, cv2.VideoWriter_fourcc(*'mp4v'), fps, tamanho
+    )
+    frames = 0
+    try:
+        for _, imagens in iterar_lotes_imagens(caminhos, 1):
+            frame = cv2.resize(imagens[0], tamanho)
+            for _ in range(frames_por_imagem):
+                writer.write(frame)
+                frames += 1
+    finally:
+        writer.release()
+    return frames
+
+
+def _contadores_poses():
+    contadores = dict.fromkeys(CLASSES_DETECTADAS.values(), 0)
+    contadores[POSE_NAO_DETECTADA] = 0
+    return contadores
+
+
+def _resultado(configuracao, frames, tempo, metricas, recursos):
+    """
+    Resultado de uma medição: a configuração medida (modo, imgsz,
+    tamanho_lote) seguida da vazão, das latências e dos recursos.
+    """
+    latencias = {
+        linha['etapa']: {
+            'p50_ms': linha['p50_ms'],
+            'p95_ms': linha['p95_ms'],
+            'p99_ms': linha['p99_ms'],
+            'vazao_itens_s': linha['vazao_itens_s'],
+        }
+        for linha in metricas.resumo()
+    }
+    return {
+        **configuracao,
+        'frames': frames,
+        'tempo_s': tempo,
+        'frames_s': frames / max(tempo, 1e-9),
+        'latencia_frame_ms': latencias.get('frame', {}),
+        'etapas': latencias,
+        'pico_rss_mb': recursos.pico_rss / 2**20,
+        'cpu_percentual': recursos.cpu_percentual,
+    }
+
+
+def medir_imagens(model, caminhos, imgsz, tamanho_lote):
+    """
+    Processa as imagens como o modo imagem do monitor: leitura, inferência
+    em lote e seleção da pose de cada imagem.
+    """
+    pose_durations = _contadores_poses()
+    metricas = MetricasEtapas()
+    frames = 0
+
+    with MonitorRecursos() as recursos:
+        inicio = time.perf_counter()
+        lotes = iterar_lotes_imagens(caminhos, tamanho_lote)
+        while True:
+            inicio_frame = time.perf_counter()
+            _, imagens = next(lotes, (None, []))
+            metricas.registrar(
+                'captura', time.perf_counter() - inicio_frame, len(imagens)
+            )
+            if not imagens:
+                break
+            with metricas.medir('inferencia', len(imagens)):
+                resultados = inferir_lote(model, imagens, imgsz)
+            with metricas.medir('selecao', len(imagens)):
+                selecoes = selecionar_poses(resultados)
+            with metricas.medir('contabilizacao', len(imagens)):
+                contabilizar_poses(pose_durations, selecoes)
+            metricas.registrar(
+                'frame', time.perf_counter() - inicio_frame, len(imagens)
+            )
+            frames += len(imagens)
+        tempo = time.perf_counter() - inicio
+    metricas.finalizar()
+
+    configuracao = {
+        'modo': 'imagens',
+        'imgsz': imgsz,
+        'tamanho_lote': tamanho_lote,
+    }
+    return _resultado(configuracao, frames, tempo, metricas, recursos)
+
+
+def medir_video(model, caminho_video, imgsz, tamanho_lote):
+    """
+    Processa o vídeo pelo mesmo caminho do run_pose_monitoring em modo
+    offline: captura em thread, lotes, inferência, seleção das poses e
+    linha do tempo (sem janela do OpenCV).
+    """
+    cap = cv2.VideoCapture(caminho_video)
+    captura = CapturaUltimoFrame(cap, descartar_frames=False)
+    pose_durations = _contadores_poses()
+    linha_tempo = LinhaTempoPoses()
+    metricas = MetricasEtapas()
+    frames = 0
+
+    with MonitorRecursos() as recursos, captura:
+        inicio = time.perf_counter()
+        while True:
+            inicio_frame = time.perf_counter()
+            lote, instantes = ler_lote(captura, tamanho_lote, tempo_midia=True)
+            metricas.registrar(
+                'captura', time.perf_counter() - inicio_frame, len(lote)
+            )
+            if not lote:
+                break
+            resultados = inferir_lote_com_movimento(
+                model, lote, None, None, metricas, imgsz
+            )
+            with metricas.medir('selecao', len(lote)):
+                selecoes = selecionar_poses(resultados)
+            with metricas.medir('contabilizacao', len(lote)):
+                contabilizar_poses(pose_durations, selecoes)
+                linha_tempo.registrar_lote(instantes, selecoes)
+            metricas.registrar(
+                'frame', time.perf_counter() - inicio_frame, len(lote)
+            )
+            frames += len(lote)
+        tempo = time.perf_counter() - inicio
+    metricas.finalizar()
+    cap.release()
+
+    configuracao = {
+        'modo': 'video',
+        'imgsz': imgsz,
+        'tamanho_lote': tamanho_lote,
+    }
+    return _resultado(configuracao, frames, tempo, metricas, recursos)
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _ambiente():
+    import torch  # noqa: PLC0415
+    import ultralytics  # noqa: PLC0415
+
+    return {
+        'plataforma': platform.platform(),
+        'processador': platform.processor(),
+        'nucleos': os.cpu_count(),
+        'python': platform.python_version(),
+        'opencv': cv2.__version__,
+        'torch': torch.__version__,
+        'ultralytics': ultralytics.__version__,
+        'cuda': torch.cuda.is_available(),
+        'commit': _commit_atual(),
+    }
+
+
+def executar_benchmark(  # noqa: PLR0913, PLR0917
+    weights_path=ARQUIVO_PESOS,
+    tamanhos_imagem=TAMANHOS_IMAGEM_BENCHMARK,
+    tamanhos_lote=LOTES_BENCHMARK,
+    limite_imagens=None,
+    frames_por_imagem=FRAMES_POR_IMAGEM,
+    modos=('imagens', 'video'),
+    backend=BACKEND_PADRAO,
+):
+    """
+    Mede todas as combinações de modo, tamanho de imagem e tamanho de lote
+    e retorna um dicionário serializável em JSON.
+    """
+    caminhos = coletar_imagens(limite=limite_imagens)
+    if not caminhos:
+        raise FileNotFoundError(
+            f'Nenhuma imagem encontrada em {PADRAO_IMAGENS_DATASET}'
+        )
+
+    model = carregar_modelo(weights_path, backend=backend)
+    execucoes = []
+
+    with tempfile.TemporaryDirectory() as temporario:
+        caminho_video = os.path.join(temporario, 'sintetico.mp4')
+        frames_video = 0
+        if 'video' in modos:
+            frames_video = criar_video_sintetico(
+                caminhos, caminho_video, frames_por_imagem
+            )
+
+        for imgsz in tamanhos_imagem:
+            for tamanho_lote in tamanhos_lote:
+                # Aquecimento: a troca de imgsz refaz alocações do modelo
+                _, imagens = next(iterar_lotes_imagens(caminhos, tamanho_lote))
+                inferir_lote(model, imagens, imgsz)
+
+                if 'imagens' in modos:
+                    execucoes.append(
+                        medir_imagens(model, caminhos, imgsz, tamanho_lote)
+                    )
+                    _mostrar_progresso(execucoes[-1])
+                if 'video' in modos:
+                    execucoes.append(
+                        medir_video(model, caminho_video, imgsz, tamanho_lote)
+                    )
+                    _mostrar_progresso(execucoes[-1])
+
+    return {
+        'data': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'pesos': os.path.abspath(weights_path),
+        'backend': backend,
+        'imagens': len(caminhos),
+        'frames_video': frames_video,
+        'frames_por_imagem': frames_por_imagem,
+        'ambiente': _ambiente(),
+        'execucoes': execucoes,
+    }
+
+
+def _mostrar_progresso(execucao):
+    console.print(
+        f'- {execucao["modo"]} imgsz={execucao["imgsz"]}'
+        + f' lote={execucao["tamanho_lote"]}:'
+        + f' [bold]{execucao["frames_s"]:.1f}[/] frames/s'
+    )
+
+
+def tabela_resultados(resultado, anterior=None):
+    """
+    Tabela com as execuções. Com um resultado anterior, acrescenta a
+    variação de frames/s de cada configuração em relação a ele.
+    """
+    referencia = {}
+    if anterior:
+        referencia = {
+            (e['modo'], e['imgsz'], e['tamanho_lote']): e['frames_s']
+            for e in anterior['execucoes']
+        }
+
+    table = Table(title='🏁 Benchmark de Monitoramento de Poses')
+    table.add_column('Modo', style='cyan')
+    table.add_column('imgsz', justify='right')
+    table.add_column('Lote', justify='right')
+    table.add_column('Frames/s', justify='right')
+    table.add_column('p50 (ms)', justify='right')
+    table.add_column('p95 (ms)', justify='right')
+    table.add_column('p99 (ms)', justify='right')
+    table.add_column('Pico RSS (MB)', justify='right')
+    table.add_column('CPU (%)', justify='right')
+    if anterior:
+        table.add_column('Variação', justify='right')
+
+    for e in resultado['execucoes']:
+        latencia = e['latencia_frame_ms']
+        linha = [
+            e['modo'],
+            str(e['imgsz']),
+            str(e['tamanho_lote']),
+            f'{e["frames_s"]:.1f}',
+            f'{latencia.get("p50_ms", 0):.1f}',
+            f'{latencia.get("p95_ms", 0):.1f}',
+            f'{latencia.get("p99_ms", 0):.1f}',
+            f'{e["pico_rss_mb"]:.0f}',
+            f'{e["cpu_percentual"]:.0f}',
+        ]
+        if anterior:
+            base = referencia.get((e['modo'], e['imgsz'], e['tamanho_lote']))
+            if base:
+                variacao = (e['frames_s'] / base - 1) * 100
+                cor = 'red' if variacao < 0 else 'green'
+                linha.append(f'[{cor}]{variacao:+.1f}%[/]')
+            else:
+                linha.append('-')
+        table.add_row(*linha)
+    return table
+
+
+def salvar_json(resultado, diretorio):
+    os.makedirs(diretorio, exist_ok=True)
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
+    caminho = os.path.join(diretorio, f'benchmark_{timestamp}.json')
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    return caminho
+
+
+def _argumentos():
+    parser = argparse.ArgumentParser(
+        description='Benchmark headless do monitoramento de poses com as'
+        ' imagens do dataset YOLOElderlyPose.'
+    )
+    parser.add_argument('--pesos', default=ARQUIVO_PESOS)
+    parser.add_argument(
+        '--imgsz', type=int, nargs='+', default=TAMANHOS_IMAGEM_BENCHMARK
+    )
+    parser.add_argument(
+        '--lotes', type=int, nargs='+', default=LOTES_BENCHMARK
+    )
+    parser.add_argument(
+        '--limite',
+        type=int,
+        default=None,
+        help='número máximo de imagens usadas (padrão: todas)',
+    )
+    parser.add_argument(
+        '--frames-por-imagem', type=int, default=FRAMES_POR_IMAGEM
+    )
+    parser.add_argument(
+        '--modos',
+        nargs='+',
+        choices=['imagens', 'video'],
+        default=['imagens', 'video'],
+    )
+    parser.add_argument(
+        '--backend', choices=BACKENDS_INFERENCIA, default=BACKEND_PADRAO
+    )
+    parser.add_argument(
+        '--saida', default=os.path.join('.', 'relatorios', 'benchmark')
+    )
+    parser.add_argument(
+        '--comparar',
+        default=None,
+        help='JSON de uma execução anterior para comparar os frames/s',
+    )
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = _argumentos()
+
+    anterior = None
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            anterior = json.load(f)
+
+    with console.status('[bold green]Executando o benchmark...'):
+        resultado = executar_benchmark(
+            args.pesos,
+            args.imgsz,
+            args.lotes,
+            args.limite,
+            args.frames_por_imagem,
+            args.modos,
+            args.backend,
+        )
+
+    console.print(tabela_resultados(resultado, anterior))
+    caminho = salvar_json(resultado, args.saida)
+    console.print(
+        f'💾 Resultados salvos em: [bold]{os.path.abspath(caminho)}[/]'
+    )
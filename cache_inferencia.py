@@ -0,0 +1,210 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from constants import ARQUIVO_CACHE_INFERENCIA, TAMANHO_MAXIMO_CACHE_MB
+
+# Fração do tamanho máximo que sobra após uma remoção por LRU, para não
+# remover a cada nova gravação
+FRACAO_APOS_REMOCAO = 0.9
+# Chaves por consulta (o SQLite limita a quantidade de parâmetros)
+CHAVES_POR_CONSULTA = 500
+
+# Hash de arquivos já calculados: caminho -> ((tamanho, mtime), hash)
+_hashes = {}
+_lock = threading.Lock()
+
+
+def hash_arquivo(caminho):
+    """
+    SHA-256 do conteúdo do arquivo, calculado uma vez por processo enquanto
+    tamanho e mtime não mudarem.
+    """
+    caminho = os.path.abspath(caminho)
+    estado = os.stat(caminho)
+    versao = (estado.st_size, estado.st_mtime_ns)
+    with _lock:
+        entrada = _hashes.get(caminho)
+        if entrada is not None and entrada[0] == versao:
+            return entrada[1]
+
+    with open(caminho, 'rb') as f:
+        digest = hashlib.file_digest(f, 'sha256').hexdigest()
+    with _lock:
+        _hashes[caminho] = (versao, digest)
+    return digest
+
+
+def _hash_pesos(weights_path):
+    try:
+        return hash_arquivo(weights_path)
+    except OSError:
+        # Ex.: nomes como 'yolo11n.pt', baixados pelo ultralytics
+        return weights_path
+
+
+class CacheInferencia:
+    """
+    Cache em disco (SQLite) das detecções de cada frame, como arrays
+    (N, 6) do NumPy em float32.
+
+    A chave de cada frame combina o hash do arquivo de pesos, o backend e
+    os parâmetros de inferência com o hash do arquivo de mídia e o índice
+    do frame dentro dele; basta mudar um deles para a entrada não valer
+    mais. Cada leitura atualiza o último acesso da entrada e, quando o
+    total passa de tamanho_maximo_mb, as entradas menos usadas
+    recentemente são removidas (LRU).
+    """
+
+    def __init__(
+        self,
+        weights_path,
+        backend,
+        parametros=None,
+        caminho=ARQUIVO_CACHE_INFERENCIA,
+        tamanho_maximo_mb=TAMANHO_MAXIMO_CACHE_MB,
+    ):
+        self.caminho = caminho
+        self.tamanho_maximo = tamanho_maximo_mb * 1024 * 1024
+        parametros = sorted((parametros or {}).items())
+        self._prefixo = (
+            f'{_hash_pesos(weights_path)}|{backend}|{parametros}'.encode()
+        )
+
+        os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.execute('PRAGMA journal_mode=WAL')
+        self._conexao.execute('PRAGMA synchronous=NORMAL')
+        self._conexao.execute(
+            'CREATE TABLE IF NOT EXISTS deteccoes ('
+            ' chave BLOB PRIMARY KEY,'
+            ' dados BLOB NOT NULL,'
+            ' tamanho INTEGER NOT NULL,'
+            ' acesso REAL NOT NULL)'
+        )
+        self._conexao.execute(
+            'CREATE INDEX IF NOT EXISTS idx_acesso ON deteccoes (acesso)'
+        )
+        self._conexao.commit()
+        self._tamanho = self._conexao.execute(
+            'SELECT COALESCE(SUM(tamanho), 0) FROM deteccoes'
+        ).fetchone()[0]
+
+        self.acertos = 0
+        self.faltas = 0
+        self.removidas = 0
+
+    def chave(self, hash_midia, indice=0):
+        """
+        Chave do frame indice (0 para imagens) da mídia com o hash dado.
+        """
+        return hashlib.blake2b(
+            self._prefixo + f'|{hash_midia}|{indice}'.encode(),
+            digest_size=16,
+        ).digest()
+
+    def chaves_arquivo(self, caminho, inicio, quantidade):
+        hash_midia = hash_arquivo(caminho)
+        return [
+            self.chave(hash_midia, indice)
+            for indice in range(inicio, inicio + quantidade)
+        ]
+
+    def obter_lote(self, chaves):
+        """
+        Lista alinhada às chaves com o array (N, 6) de cada frame em cache,
+        ou None nos que faltam.
+        """
+        encontrados = {}
+        for i in range(0, len(chaves), CHAVES_POR_CONSULTA):
+            parte = chaves[i : i + CHAVES_POR_CONSULTA]
+            marcadores = ','.join('?' * len(parte))
+            encontrados.update(
+                self._conexao.execute(
+                    'SELECT chave, dados FROM deteccoes'
+                    f' WHERE chave IN ({marcadores})',
+                    parte,
+                )
+            )
+        if encontrados:
+            agora = time.time()
+            with self._conexao:
+                self._conexao.executemany(
+                    'UPDATE deteccoes SET acesso = ? WHERE chave = ?',
+                    [(agora, chave) for chave in encontrados],
+                )
+
+        resultados = []
+        for chave in chaves:
+            dados = encontrados.get(chave)
+            if dados is None:
+                self.faltas += 1
+                resultados.append(None)
+            else:
+                self.acertos += 1
+                resultados.append(
+                    np.frombuffer(dados, dtype=np.float32).reshape(-1, 6)
+                )
+        return resultados
+
+    def guardar_lote(self, chaves, deteccoes):
+        """
+        Guarda o array (N, 6) de cada chave e aplica o limite de tamanho.
+        """
+        if not chaves:
+            return
+        agora = time.time()
+        linhas = []
+        for chave, dados in zip(chaves, deteccoes):
+            blob = np.ascontiguousarray(dados, dtype=np.float32).tobytes()
+            linhas.append((chave, blob, len(blob), agora))
+        with self._conexao:
+            self._conexao.executemany(
+                'INSERT OR REPLACE INTO deteccoes'
+                ' (chave, dados, tamanho, acesso) VALUES (?, ?, ?, ?)',
+                linhas,
+            )
+        # Entradas substituídas contam duas vezes até a próxima remoção;
+        # a soma é refeita nela
+        self._tamanho += sum(linha[2] for linha in linhas)
+        if self._tamanho > self.tamanho_maximo:
+            self._remover_antigas()
+
+    def _remover_antigas(self):
+        alvo = self.tamanho_maximo * FRACAO_APOS_REMOCAO
+        remover = []
+        total = self._conexao.execute(
+            'SELECT COALESCE(SUM(tamanho), 0) FROM deteccoes'
+        ).fetchone()[0]
+        cursor = self._conexao.execute(
+            'SELECT chave, tamanho FROM deteccoes ORDER BY acesso'
+        )
+        for chave, tamanho in cursor:
+            if total <= alvo:
+                break
+            remover.append((chave,))
+            total -= tamanho
+        cursor.close()
+        with self._conexao:
+            self._conexao.executemany(
+                'DELETE FROM deteccoes WHERE chave = ?', remover
+            )
+        self.removidas += len(remover)
+        self._tamanho = total
+
+    @property
+    def tamanho_mb(self):
+        return self._tamanho / 1024 / 1024
+
+    def taxa_acerto(self):
+        total = self.acertos + self.faltas
+        if total == 0:
+            return 0.0
+        return self.acertos / total
+
+    def fechar(self):
+        self._conexao.close()
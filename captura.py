@@ -0,0 +1,398 @@
+import os
+import statistics
+import threading
+import time
+from collections import deque
+
+import cv2
+
+from constants import (
+    ESPERA_RECONEXAO_INICIAL,
+    ESPERA_RECONEXAO_MAXIMA,
+    ESQUEMAS_STREAM,
+    INTERVALOS_MINIMOS_JITTER,
+    OPCOES_FFMPEG_STREAM,
+    TEMPO_LIMITE_STREAM_MS,
+)
+
+# Idade (em segundos) a partir da qual um frame entregue é considerado
+# atrasado em relação ao momento em que foi capturado
+LIMITE_ATRASO_FRAME = 0.5
+# Intervalos entre frames recentes usados no cálculo do jitter do stream
+JANELA_JITTER = 300
+
+
+def eh_stream(caminho):
+    """
+    Indica se o caminho é a URL de um stream de rede (RTSP, HTTP...).
+    """
+    return str(caminho).lower().startswith(ESQUEMAS_STREAM)
+
+
+def abrir_stream(url, tempo_limite_ms=TEMPO_LIMITE_STREAM_MS):
+    """
+    Abre o stream com o FFmpeg em modo de baixa latência: sem buffer de
+    entrada, buffer de captura de 1 frame e tempo limite para abrir e ler,
+    de modo que uma câmera que caiu não trave a leitura indefinidamente.
+    OPENCV_FFMPEG_CAPTURE_OPTIONS definida no ambiente tem prioridade.
+    """
+    os.environ.setdefault(
+        'OPENCV_FFMPEG_CAPTURE_OPTIONS', OPCOES_FFMPEG_STREAM
+    )
+    cap = cv2.VideoCapture(
+        url,
+        cv2.CAP_FFMPEG,
+        [
+            cv2.CAP_PROP_OPEN_TIMEOUT_MSEC,
+            tempo_limite_ms,
+            cv2.CAP_PROP_READ_TIMEOUT_MSEC,
+            tempo_limite_ms,
+        ],
+    )
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+
+class CapturaUltimoFrame:
+    """
+    Lê frames de um cv2.VideoCapture em uma thread separada.
+
+    Com descartar_frames=True (fontes ao vivo, como a webcam) mantém apenas
+    o frame mais recente: frames não consumidos são sobrescritos e contados
+    como descartados, de modo que a inferência sempre recebe a imagem mais
+    nova, independente da lentidão do modelo.
+
+    Com descartar_frames=False (arquivos de vídeo) a thread apenas adianta
+    a decodificação do próximo frame, sem perder nenhum.
+
+    indice_inicial informa a posição do primeiro frame quando a captura já
+    foi posicionada no meio do arquivo (CAP_PROP_POS_FRAMES).
+    """
+
+    def __init__(
+        self,
+        cap,
+        descartar_frames=True,
+        limite_atraso=LIMITE_ATRASO_FRAME,
+        indice_inicial=0,
+    ):
+        self.cap = cap
+        self.indice_inicial = indice_inicial
+        self.descartar_frames = descartar_frames
+        self.limite_atraso = limite_atraso
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+
+        self._condicao = threading.Condition()
+        self._pendente = None
+        self._encerrado = False
+        self._ativo = False
+        self._thread = None
+
+        # Contadores expostos no relatório final
+        self.frames_capturados = 0
+        self.frames_entregues = 0
+        self.frames_descartados = 0
+        self.frames_atrasados = 0
+        self.idade_ultimo_frame = 0.0
+        self.idade_maxima = 0.0
+
+        # Posição do último frame entregue dentro da mídia
+        self.indice_frame = -1
+        self.timestamp_ms = 0.0
+        self.instante_captura = 0.0
+
+    def iniciar(self):
+        self._ativo = True
+        self._thread = threading.Thread(
+            target=self._loop_captura, name='captura-frames', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def parar(self):
+        with self._condicao:
+            self._ativo = False
+            self._condicao.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
+
+    @property
+    def encerrada(self):
+        return self._encerrado
+
+    def _ler_frame(self):
+        return self.cap.read()
+
+    def _loop_captura(self):
+        while self._ativo:
+            ret, frame = self._ler_frame()
+            instante = time.monotonic()
+            instante_epoch = time.time()
+            if ret:
+                indice = self.indice_inicial + self.frames_capturados
+                timestamp_ms = self._timestamp_midia(indice)
+
+            with self._condicao:
+                if not self.descartar_frames:
+                    # Aguarda o consumidor pegar o frame anterior
+                    self._condicao.wait_for(
+                        lambda: self._pendente is None or not self._ativo
+                    )
+                if not self._ativo:
+                    break
+                if not ret:
+                    self._encerrado = True
+                    self._condicao.notify_all()
+                    break
+
+                if self._pendente is not None:
+                    self.frames_descartados += 1
+                self._pendente = (
+                    frame,
+                    instante,
+                    instante_epoch,
+                    indice,
+                    timestamp_ms,
+                )
+                self.frames_capturados += 1
+                self._condicao.notify_all()
+
+        with self._condicao:
+            self._encerrado = True
+            self._condicao.notify_all()
+
+    def _timestamp_midia(self, indice):
+        """
+        Timestamp (ms) do frame recém-lido. Usa CAP_PROP_POS_MSEC e, quando o
+        backend não o informa, estima a partir do índice e do FPS.
+        """
+        timestamp_ms = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+        if timestamp_ms <= 0 and indice > 0 and self.fps > 0:
+            timestamp_ms = indice * 1000 / self.fps
+        return max(timestamp_ms, 0.0)
+
+    def duracao_midia(self):
+        """
+        Tempo de mídia (s) coberto pelos frames entregues até agora,
+        incluindo a duração do último frame.
+        """
+        if self.indice_frame < 0:
+            return 0.0
+        duracao_frame = 1 / self.fps if self.fps > 0 else 0.0
+        return self.timestamp_ms / 1000 + duracao_frame
+
+    def ler(self, timeout=None):
+        """
+        Retorna (ret, frame) com o frame mais recente ainda não consumido,
+        bloqueando até que haja um novo frame ou a fonte termine.
+        """
+        with self._condicao:
+            self._condicao.wait_for(
+                lambda: self._pendente is not None or self._encerrado,
+                timeout,
+            )
+            if self._pendente is None:
+                return False, None
+            frame, instante, instante_epoch, indice, timestamp_ms = (
+                self._pendente
+            )
+            self._pendente = None
+            self._condicao.notify_all()
+
+        self.indice_frame = indice
+        self.timestamp_ms = timestamp_ms
+        self.instante_captura = instante_epoch
+        idade = time.monotonic() - instante
+        self.frames_entregues += 1
+        self.idade_ultimo_frame = idade
+        self.idade_maxima = max(self.idade_maxima, idade)
+        if idade > self.limite_atraso:
+            self.frames_atrasados += 1
+
+        return True, frame
+
+    def estatisticas(self):
+        return {
+            'frames_capturados': self.frames_capturados,
+            'frames_entregues': self.frames_entregues,
+            'frames_descartados': self.frames_descartados,
+            'frames_atrasados': self.frames_atrasados,
+            'idade_maxima_s': self.idade_maxima,
+        }
+
+
+class CapturaStream(CapturaUltimoFrame):
+    """
+    CapturaUltimoFrame para câmeras IP (RTSP/HTTP) com reconexão.
+
+    O stream é aberto com abrir_stream() e, como na webcam, só o frame mais
+    recente é mantido. Quando a leitura falha a thread de captura reabre o
+    stream com espera exponencial (espera_inicial, dobrando até
+    espera_maxima) até conseguir ou até parar() ser chamado; o consumidor
+    apenas deixa de receber frames enquanto isso, sem perder o estado do
+    monitoramento.
+
+    Além dos contadores da classe base, registra reconexões, tentativas
+    que falharam, tempo desconectado e o jitter (desvio padrão do intervalo
+    entre frames recebidos).
+    """
+
+    def __init__(
+        self,
+        url,
+        limite_atraso=LIMITE_ATRASO_FRAME,
+        espera_inicial=ESPERA_RECONEXAO_INICIAL,
+        espera_maxima=ESPERA_RECONEXAO_MAXIMA,
+    ):
+        super().__init__(
+            abrir_stream(url),
+            descartar_frames=True,
+            limite_atraso=limite_atraso,
+        )
+        self.url = url
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+
+        self._intervalos = deque(maxlen=JANELA_JITTER)
+        self._ultimo_recebido = None
+
+        self.conectado = self.cap.isOpened()
+        self.reconexoes = 0
+        self.falhas_reconexao = 0
+        self.tempo_desconectado = 0.0
+
+    def _ler_frame(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            ret, frame = self._reconectar()
+        if ret:
+            agora = time.monotonic()
+            if self._ultimo_recebido is not None:
+                self._intervalos.append(agora - self._ultimo_recebido)
+            self._ultimo_recebido = agora
+        return ret, frame
+
+    def _reconectar(self):
+        self.conectado = False
+        inicio = time.monotonic()
+        espera = self.espera_inicial
+        while self._ativo:
+            self.cap.release()
+            with self._condicao:
+                self._condicao.wait_for(lambda: not self._ativo, espera)
+            if not self._ativo:
+                break
+            self.cap = abrir_stream(self.url)
+            ret, frame = False, None
+            if self.cap.isOpened():
+                ret, frame = self.cap.read()
+            if ret:
+                self.conectado = True
+                self.reconexoes += 1
+                self.tempo_desconectado += time.monotonic() - inicio
+                # O intervalo até o primeiro frame após a queda não é jitter
+                self._ultimo_recebido = None
+                return ret, frame
+            self.falhas_reconexao += 1
+            espera = min(espera * 2, self.espera_maxima)
+        self.tempo_desconectado += time.monotonic() - inicio
+        return False, None
+
+    def jitter_ms(self):
+        intervalos = list(self._intervalos)
+        if len(intervalos) < INTERVALOS_MINIMOS_JITTER:
+            return 0.0
+        return statistics.pstdev(intervalos) * 1000
+
+    def intervalo_maximo_ms(self):
+        return max(self._intervalos, default=0.0) * 1000
+
+    def estatisticas(self):
+        return super().estatisticas() | {
+            'reconexoes': self.reconexoes,
+            'falhas_reconexao': self.falhas_reconexao,
+            'tempo_desconectado_s': self.tempo_desconectado,
+            'jitter_ms': self.jitter_ms(),
+            'intervalo_maximo_ms': self.intervalo_maximo_ms(),
+        }
+
+
+class AmostradorFrames:
+    """
+    Amostra frames a uma taxa fixa dentro de uma janela de tempo.
+
+    Os frames entre amostras são apenas capturados com cap.grab(), sem
+    decodificação, e somente o primeiro frame em ou após cada prazo é
+    decodificado com cap.retrieve(). Os prazos são calculados a partir do
+    início da janela (inicio + k / taxa), então o tempo gasto na inferência
+    não acumula deriva: prazos perdidos são pulados e contados.
+
+    Em fontes ao vivo o relógio é o tempo real; em arquivos, o tempo da mídia.
+    """
+
+    def __init__(self, cap, taxa_amostragem, janela, ao_vivo=True):
+        self.cap = cap
+        self.intervalo = 1 / taxa_amostragem
+        self.janela = janela
+        self.ao_vivo = ao_vivo
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+
+        self.frames_capturados = 0
+        self.frames_decodificados = 0
+        self.amostras_perdidas = 0
+
+    def _relogio(self, inicio):
+        if self.ao_vivo:
+            return time.monotonic() - inicio
+        timestamp_ms = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+        if timestamp_ms <= 0 and self.fps > 0:
+            timestamp_ms = (self.frames_capturados - 1) * 1000 / self.fps
+        return timestamp_ms / 1000 - inicio
+
+    def amostras(self):
+        """
+        Gera (indice_amostra, instante, frame) para cada prazo da janela,
+        com o instante relativo ao início da janela em segundos.
+        """
+        inicio = time.monotonic() if self.ao_vivo else 0.0
+        k = 0
+        while k * self.intervalo < self.janela:
+            prazo = k * self.intervalo
+
+            # Descarta, sem decodificar, os frames anteriores ao prazo
+            while True:
+                if not self.cap.grab():
+                    return
+                self.frames_capturados += 1
+                instante = self._relogio(inicio)
+                if instante >= prazo:
+                    break
+
+            ret, frame = self.cap.retrieve()
+            if not ret:
+                return
+            self.frames_decodificados += 1
+            yield k, instante, frame
+
+            # Pula os prazos que já passaram durante o processamento
+            proximo = k + 1
+            if self.ao_vivo:
+                atual = int(self._relogio(inicio) / self.intervalo)
+                if atual >= proximo:
+                    self.amostras_perdidas += atual - proximo + 1
+                    proximo = atual + 1
+            k = proximo
+
+    def estatisticas(self):
+        return {
+            'frames_capturados': self.frames_capturados,
+            'frames_decodificados': self.frames_decodificados,
+            'amostras_perdidas': self.amostras_perdidas,
+        }
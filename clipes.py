@@ -0,0 +1,254 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from constants import (
+    DIRETORIO_CLIPES,
+    FPS_CLIPE,
+    LARGURA_CLIPE,
+    MEMORIA_MAXIMA_CLIPE_MB,
+    QUALIDADE_JPEG_CLIPE,
+    SEGUNDOS_ANTES_CLIPE,
+    SEGUNDOS_DEPOIS_CLIPE,
+)
+
+# Clipes completos aguardando o codificador; com a fila cheia o clipe é
+# descartado em vez de segurar o loop de inferência
+TAMANHO_FILA_CLIPES = 4
+CODEC_CLIPE = 'mp4v'
+
+_FIM = object()
+
+
+class _ClipePendente:
+    """
+    Clipe disparado que ainda recebe os frames de depois do evento.
+    """
+
+    def __init__(self, motivo, instante, fim, frames):
+        self.motivos = [motivo]
+        self.instante = instante
+        self.fim = fim
+        self.frames = frames
+
+
+class GravadorClipes:
+    """
+    Guarda os últimos segundos_antes segundos de vídeo em um buffer
+    circular na memória e, quando disparado, grava um clipe do intervalo
+    [instante - segundos_antes, instante + segundos_depois].
+
+    Os frames entram reduzidos para largura pixels, comprimidos em JPEG e
+    amostrados a no máximo fps quadros por segundo. O buffer respeita um
+    teto de memória: os frames mais antigos saem quando ele é atingido.
+    Disparos que chegam com um clipe ainda pendente entram nele como
+    motivo adicional, sem gerar outro arquivo.
+
+    O clipe completo vai para uma fila limitada e é decodificado e gravado
+    em MP4 por uma thread de fundo, de modo que a codificação nunca
+    segura a inferência. Com gatilho 'transicoes', cada mudança da pose
+    informada em adicionar() dispara um clipe.
+    """
+
+    def __init__(  # noqa: PLR0913, PLR0917
+        self,
+        diretorio=DIRETORIO_CLIPES,
+        segundos_antes=SEGUNDOS_ANTES_CLIPE,
+        segundos_depois=SEGUNDOS_DEPOIS_CLIPE,
+        fps=FPS_CLIPE,
+        largura=LARGURA_CLIPE,
+        qualidade=QUALIDADE_JPEG_CLIPE,
+        memoria_maxima_mb=MEMORIA_MAXIMA_CLIPE_MB,
+        gatilho='alertas',
+    ):
+        self.diretorio = diretorio
+        self.segundos_antes = segundos_antes
+        self.segundos_depois = segundos_depois
+        self.intervalo = 1 / fps
+        self.largura = largura
+        self.parametros_jpeg = [cv2.IMWRITE_JPEG_QUALITY, qualidade]
+        self.memoria_maxima = memoria_maxima_mb * 1024 * 1024
+        self.gatilho = gatilho
+
+        self._buffer = deque()
+        self._ultimo_instante = None
+        self._ultima_pose = None
+        self._pendente = None
+        self._fila = queue.Queue(maxsize=TAMANHO_FILA_CLIPES)
+        self._trava = threading.Lock()
+
+        self.memoria_bytes = 0
+        self.memoria_pico = 0
+        self.frames_comprimidos = 0
+        self.tempo_compressao = 0.0
+        self.clipes = []
+        self.disparos = 0
+        self.descartados = 0
+        self.falhas = 0
+        self.ultimo_erro = None
+
+        os.makedirs(diretorio, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._loop_gravacao, name='gravacao-clipes', daemon=True
+        )
+        self._thread.start()
+
+    def adicionar(self, frame, instante, pose=None):
+        """
+        Oferece um frame (BGR) ao buffer. Frames mais próximos que o
+        intervalo do FPS do clipe são ignorados.
+        """
+        self._concluir_pendente(instante)
+        if self.gatilho == 'transicoes' and pose is not None:
+            if self._ultima_pose is not None and pose != self._ultima_pose:
+                self.disparar(instante, f'{self._ultima_pose} -> {pose}')
+            self._ultima_pose = pose
+
+        if (
+            self._ultimo_instante is not None
+            and instante - self._ultimo_instante < self.intervalo
+        ):
+            return
+        self._ultimo_instante = instante
+
+        inicio = time.perf_counter()
+        altura, largura = frame.shape[:2]
+        if largura > self.largura:
+            frame = cv2.resize(
+                frame,
+                (self.largura, int(altura * self.largura / largura)),
+                interpolation=cv2.INTER_AREA,
+            )
+        _, jpeg = cv2.imencode('.jpg', frame, self.parametros_jpeg)
+        dados = jpeg.tobytes()
+        self.tempo_compressao += time.perf_counter() - inicio
+        self.frames_comprimidos += 1
+
+        self._buffer.append((instante, dados))
+        self.memoria_bytes += len(dados)
+        limite_antigo = instante - self.segundos_antes
+        while self._buffer and (
+            self.memoria_bytes > self.memoria_maxima
+            or self._buffer[0][0] < limite_antigo
+        ):
+            _, antigo = self._buffer.popleft()
+            self.memoria_bytes -= len(antigo)
+        self.memoria_pico = max(self.memoria_pico, self.memoria_bytes)
+
+        if self._pendente is not None:
+            self._pendente.frames.append((instante, dados))
+
+    def disparar(self, instante, motivo):
+        """
+        Agenda um clipe ao redor do instante. Os frames de antes já estão
+        no buffer; os de depois são acrescentados por adicionar().
+        """
+        self.disparos += 1
+        if self._pendente is not None:
+            self._pendente.motivos.append(motivo)
+            return
+        inicio = instante - self.segundos_antes
+        frames = [item for item in self._buffer if item[0] >= inicio]
+        self._pendente = _ClipePendente(
+            motivo, instante, instante + self.segundos_depois, frames
+        )
+
+    def _concluir_pendente(self, instante):
+        if self._pendente is None or instante <= self._pendente.fim:
+            return
+        clipe, self._pendente = self._pendente, None
+        try:
+            self._fila.put_nowait(clipe)
+        except queue.Full:
+            self.descartados += 1
+
+    def encerrar(self, timeout=None):
+        """
+        Grava o clipe pendente (com o que houver depois do evento) e os já
+        enfileirados, e encerra a thread.
+        """
+        if self._pendente is not None:
+            clipe, self._pendente = self._pendente, None
+            self._fila.put(clipe)
+        self._fila.put(_FIM)
+        self._thread.join(timeout)
+
+    def _loop_gravacao(self):
+        while True:
+            clipe = self._fila.get()
+            if clipe is _FIM:
+                break
+            inicio = time.perf_counter()
+            try:
+                caminho = self._gravar(clipe)
+            except (cv2.error, OSError) as e:
+                self.falhas += 1
+                self.ultimo_erro = str(e)
+                continue
+            if caminho is None:
+                continue
+            with self._trava:
+                self.clipes.append({
+                    'caminho': caminho,
+                    'motivos': clipe.motivos,
+                    'frames': len(clipe.frames),
+                    'duracao_s': clipe.frames[-1][0] - clipe.frames[0][0],
+                    'codificacao_s': time.perf_counter() - inicio,
+                })
+
+    def _gravar(self, clipe):
+        if not clipe.frames:
+            return None
+        duracao = clipe.frames[-1][0] - clipe.frames[0][0]
+        # FPS efetivo dos frames guardados, para o clipe durar o mesmo
+        # tempo que o evento
+        fps = (len(clipe.frames) - 1) / duracao if duracao > 0 else 1.0
+
+        primeiro = cv2.imdecode(
+            np.frombuffer(clipe.frames[0][1], np.uint8), cv2.IMREAD_COLOR
+        )
+        altura, largura = primeiro.shape[:2]
+        carimbo = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        caminho = os.path.join(self.diretorio, f'clipe_{carimbo}.mp4')
+        writer = cv2.VideoWriter(
+            caminho,
+            cv2.VideoWriter_fourcc(*CODEC_CLIPE),
+            fps,
+            (largura, altura),
+        )
+        try:
+            writer.write(primeiro)
+            for _, dados in clipe.frames[1:]:
+                frame = cv2.imdecode(
+                    np.frombuffer(dados, np.uint8), cv2.IMREAD_COLOR
+                )
+                writer.write(frame)
+        finally:
+            writer.release()
+        return caminho
+
+    def estatisticas(self):
+        with self._trava:
+            clipes = list(self.clipes)
+        codificacao = [clipe['codificacao_s'] for clipe in clipes]
+        return {
+            'frames_no_buffer': len(self._buffer),
+            'memoria_mb': self.memoria_bytes / 1024 / 1024,
+            'memoria_pico_mb': self.memoria_pico / 1024 / 1024,
+            'compressao_ms_por_frame': (
+                self.tempo_compressao * 1000 / max(self.frames_comprimidos, 1)
+            ),
+            'disparos': self.disparos,
+            'clipes': len(clipes),
+            'clipes_descartados': self.descartados,
+            'codificacao_media_s': (
+                sum(codificacao) / len(codificacao) if codificacao else 0.0
+            ),
+            'codificacao_maxima_s': max(codificacao, default=0.0),
+        }
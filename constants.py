@@ -18,6 +18,100 @@ ARQUIVO_VIDEO_PADRAO = str(BASE_DIR / 'video_idoso.mp4')
 ARQUIVO_CONFIGURACAO_DATASET = str(
     BASE_DIR / 'downloads/YOLOElderlyPose.v2i.yolov11/data.yaml'
 )
+# Extensões aceitas como imagem
+EXTENSOES_IMAGEM = ('.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tif', '.tiff')
+
+# Inferência em lotes (arquivos de vídeo e diretórios de imagens)
+TAMANHO_LOTE_PADRAO = 'auto'  # 'auto' ajusta pelo desempenho medido
+LOTES_CANDIDATOS = (1, 2, 4, 8, 16)
+
+# Backends de inferência: 'pytorch' usa o best.pt diretamente; os demais
+# usam o modelo exportado, guardado ao lado dos pesos. 'openvino-int8' é
+# gerado por quantizacao.py apenas se a precisão ficar dentro do limite
+BACKENDS_INFERENCIA = ('pytorch', 'onnx', 'openvino', 'openvino-int8')
+BACKEND_PADRAO = 'pytorch'
+
+# Filtro de movimento: pula a inferência quando a cena não mudou
+LARGURA_MOVIMENTO = 160  # largura (px) do frame reduzido comparado
+LIMIAR_MOVIMENTO_PIXEL = 25  # diferença mínima de intensidade por pixel
+LIMIAR_MOVIMENTO_AREA = 0.01  # fração mínima de pixels alterados
+INTERVALO_MAXIMO_SEM_INFERENCIA = 30  # frames até forçar nova inferência
+
+# Detecção a cada N frames com rastreamento (fluxo óptico) entre elas
+INTERVALO_DETECCAO_PADRAO = 5  # frames entre detecções no início
+INTERVALO_DETECCAO_MAXIMO = 12
+LARGURA_RASTREAMENTO = 320  # largura (px) do frame usado no fluxo óptico
+LADO_MINIMO_CAIXA = 2  # px, no frame reduzido, para buscar pontos
+IOU_ASSOCIACAO = 0.3  # IoU mínimo para associar rastro e nova detecção
+CONCORDANCIA_RASTREAMENTO_ESTAVEL = 0.9  # acima disso o intervalo cresce
+CONCORDANCIA_RASTREAMENTO_MINIMA = 0.6  # abaixo disso o intervalo cai
+LIMIAR_PONTOS_PERDIDOS = 0.5  # fração de pontos perdidos que antecipa
+LIMIAR_DESLOCAMENTO = 0.2  # deslocamento/lado da caixa que antecipa
+
+# Câmeras IP (RTSP/HTTP): opções do FFmpeg para baixa latência (sem buffer
+# de entrada nem fila de reordenação) e reconexão com espera exponencial
+ESQUEMAS_STREAM = (
+    'rtsp://',
+    'rtsps://',
+    'rtmp://',
+    'http://',
+    'https://',
+    'udp://',
+    'tcp://',
+)
+OPCOES_FFMPEG_STREAM = (
+    'rtsp_transport;tcp|fflags;nobuffer|flags;low_delay'
+    '|max_delay;500000|reorder_queue_size;0'
+)
+TEMPO_LIMITE_STREAM_MS = 5000  # para abrir e para cada leitura
+ESPERA_RECONEXAO_INICIAL = 0.5  # segundos
+ESPERA_RECONEXAO_MAXIMA = 10.0
+ESPERA_FRAME_STREAM = 1.0  # s que o loop aguarda um frame antes de seguir
+INTERVALOS_MINIMOS_JITTER = 2  # intervalos necessários para medir o jitter
+
+# Controle de latência: tamanhos de entrada e passo de frames ajustados
+# para manter o FPS alvo (0 desativa o controle)
+FPS_ALVO_PADRAO = 0
+TAMANHOS_ENTRADA = (640, 480, 320)
+PASSO_MAXIMO_FRAMES = 4  # no máximo 1 de cada N frames é inferido
+FRAMES_POR_AJUSTE = 30  # frames medidos entre dois ajustes
+FOLGA_LATENCIA = 0.85  # fração do orçamento que libera mais qualidade
+
+# Suavização temporal da pose de cada frame antes da contagem
+METODOS_SUAVIZACAO = ('nenhuma', 'maioria', 'ema', 'histerese')
+SUAVIZACAO_PADRAO = 'nenhuma'
+JANELA_SUAVIZACAO = 7  # frames da janela da votação por maioria
+ALFA_SUAVIZACAO = 0.3  # peso do frame atual na média móvel exponencial
+CONFIRMACAO_HISTERESE = 5  # frames seguidos para aceitar uma nova pose
+
+# Alertas em tempo real quando uma pose de risco persiste
+POSES_ALERTA = ('idoso deitado',)
+ARQUIVO_ALERTAS = 'alertas.jsonl'
+DURACAO_MINIMA_ALERTA = 10.0  # s seguidos na pose para disparar
+TOLERANCIA_ALERTA = 1.0  # s de ausência que não encerram o episódio
+RECARGA_ALERTA = 300.0  # s mínimos entre alertas da mesma pose
+
+# Clipes de vídeo ao redor de alertas ou transições de pose, montados a
+# partir de um buffer circular de frames reduzidos e comprimidos em JPEG
+GATILHOS_CLIPE = ('nenhum', 'alertas', 'transicoes')
+GATILHO_CLIPE_PADRAO = 'nenhum'
+DIRETORIO_CLIPES = 'clipes'
+SEGUNDOS_ANTES_CLIPE = 10.0
+SEGUNDOS_DEPOIS_CLIPE = 5.0
+FPS_CLIPE = 10  # frames por segundo guardados no buffer
+LARGURA_CLIPE = 480  # pixels
+QUALIDADE_JPEG_CLIPE = 70
+MEMORIA_MAXIMA_CLIPE_MB = 64
+
+# Cache em disco das detecções por frame (vídeos e imagens já processados
+# com os mesmos pesos e parâmetros não passam de novo pelo modelo)
+ARQUIVO_CACHE_INFERENCIA = str(BASE_DIR / 'cache' / 'inferencia.sqlite3')
+TAMANHO_MAXIMO_CACHE_MB = 512
+
+# Amostragem periódica do monitor contínuo (monitor1.py)
+TAXA_AMOSTRAGEM_PADRAO = 1.0  # frames por segundo
+JANELA_AMOSTRAGEM_PADRAO = 20  # segundos por relatório
+
 # Estados de pose inicial
 POSE_NAO_DETECTADA = 'não detectado'
 
@@ -25,3 +119,4 @@ POSE_NAO_DETECTADA = 'não detectado'
 COR_BBOX = (0, 255, 0)  # Verde em BGR
 ESPESSURA_BBOX = 2
 TAMANHO_FONTE = 0.5
+TAXA_ATUALIZACAO_TELA = 30  # exibições por segundo da janela do OpenCV
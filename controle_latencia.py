@@ -0,0 +1,163 @@
+import csv
+import time
+
+from rich.table import Table
+
+from constants import (
+    FOLGA_LATENCIA,
+    FRAMES_POR_AJUSTE,
+    PASSO_MAXIMO_FRAMES,
+    TAMANHOS_ENTRADA,
+)
+
+# Peso de cada nova medição na média móvel exponencial da latência
+SUAVIZACAO_LATENCIA = 0.2
+
+
+class ControladorLatencia:
+    """
+    Ajusta o tamanho de entrada da inferência (imgsz) e o passo de frames
+    para manter o FPS alvo.
+
+    A latência por frame (do fim da captura ao fim do loop) é suavizada por
+    uma média móvel exponencial. A cada FRAMES_POR_AJUSTE frames, se ela
+    passar do orçamento (1 / fps_alvo) a qualidade cai um degrau: primeiro
+    o imgsz (640 -> 480 -> 320), depois o passo (inferir 1 de cada 2, 3...
+    frames, reutilizando a última detecção nos demais). Com folga, os
+    degraus são devolvidos na ordem inversa, mas só quando a latência
+    estimada após a volta ainda couber em FOLGA_LATENCIA do orçamento,
+    o que evita oscilar entre dois degraus.
+
+    Cada ajuste é guardado em ajustes para o relatório final.
+    """
+
+    def __init__(
+        self,
+        fps_alvo,
+        tamanhos=TAMANHOS_ENTRADA,
+        passo_maximo=PASSO_MAXIMO_FRAMES,
+        frames_por_ajuste=FRAMES_POR_AJUSTE,
+        folga=FOLGA_LATENCIA,
+    ):
+        self.fps_alvo = fps_alvo
+        self.orcamento = 1 / fps_alvo
+        self.tamanhos = sorted(tamanhos, reverse=True)
+        self.passo_maximo = passo_maximo
+        self.frames_por_ajuste = frames_por_ajuste
+        self.folga = folga
+
+        self.passo = 1
+        self._nivel = 0
+        self._latencia = None
+        self._frames_desde_ajuste = 0
+        self._contador = 0
+        self._inicio = time.perf_counter()
+
+        self.ajustes = []
+
+    @property
+    def imgsz(self):
+        return self.tamanhos[self._nivel]
+
+    def frames_a_inferir(self, quantidade):
+        """
+        Indica, para os próximos quantidade frames, quais devem passar pela
+        inferência de acordo com o passo atual.
+        """
+        selecao = []
+        for _ in range(quantidade):
+            selecao.append(self._contador % self.passo == 0)
+            self._contador += 1
+        return selecao
+
+    def registrar(self, duracao, frames):
+        """
+        Registra o tempo gasto com frames frames e ajusta imgsz e passo
+        quando já houver medições suficientes desde o último ajuste.
+        """
+        if frames <= 0:
+            return
+        por_frame = duracao / frames
+        if self._latencia is None:
+            self._latencia = por_frame
+        else:
+            variacao = por_frame - self._latencia
+            self._latencia += SUAVIZACAO_LATENCIA * variacao
+
+        self._frames_desde_ajuste += frames
+        if self._frames_desde_ajuste < self.frames_por_ajuste:
+            return
+        if self._latencia > self.orcamento:
+            self._reduzir_qualidade()
+        else:
+            self._aumentar_qualidade()
+
+    def _reduzir_qualidade(self):
+        if self._nivel < len(self.tamanhos) - 1:
+            self._nivel += 1
+            self._anotar(f'imgsz -> {self.imgsz}')
+        elif self.passo < self.passo_maximo:
+            self.passo += 1
+            self._anotar(f'passo -> {self.passo}')
+
+    def _aumentar_qualidade(self):
+        limite = self.orcamento * self.folga
+        if self.passo > 1:
+            # Com passo p - 1 há p / (p - 1) vezes mais inferências
+            estimada = self._latencia * self.passo / (self.passo - 1)
+            if estimada <= limite:
+                self.passo -= 1
+                self._anotar(f'passo -> {self.passo}')
+        elif self._nivel > 0:
+            # O custo da inferência cresce com a área da entrada
+            maior = self.tamanhos[self._nivel - 1]
+            estimada = self._latencia * (maior / self.imgsz) ** 2
+            if estimada <= limite:
+                self._nivel -= 1
+                self._anotar(f'imgsz -> {self.imgsz}')
+
+    def _anotar(self, acao):
+        self.ajustes.append({
+            'instante_s': time.perf_counter() - self._inicio,
+            'latencia_ms': self._latencia * 1000,
+            'acao': acao,
+            'imgsz': self.imgsz,
+            'passo': self.passo,
+        })
+        # A latência medida com a configuração anterior não vale mais
+        self._latencia = None
+        self._frames_desde_ajuste = 0
+
+    def tabela(self, titulo='🎚️ Ajustes de latência'):
+        table = Table(
+            title=f'{titulo} (alvo: {self.fps_alvo:g} FPS,'
+            + f' {self.orcamento * 1000:.1f} ms/frame)'
+        )
+        table.add_column('Instante (s)', justify='right')
+        table.add_column('Latência (ms)', justify='right')
+        table.add_column('Ajuste', style='cyan')
+        table.add_column('imgsz', justify='right')
+        table.add_column('Passo', justify='right')
+        for ajuste in self.ajustes:
+            table.add_row(
+                f'{ajuste["instante_s"]:.1f}',
+                f'{ajuste["latencia_ms"]:.1f}',
+                ajuste['acao'],
+                str(ajuste['imgsz']),
+                str(ajuste['passo']),
+            )
+        return table
+
+    def salvar_csv(self, caminho_csv):
+        campos = ['instante_s', 'latencia_ms', 'acao', 'imgsz', 'passo']
+        with open(caminho_csv, mode='w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=campos, delimiter=';')
+            writer.writeheader()
+            for ajuste in self.ajustes:
+                writer.writerow({
+                    chave: (
+                        f'{valor:.4f}' if isinstance(valor, float) else valor
+                    )
+                    for chave, valor in ajuste.items()
+                })
+        return caminho_csv
@@ -0,0 +1,83 @@
+import numpy as np
+
+from constants import CLASSES_DETECTADAS, POSE_NAO_DETECTADA
+
+# Índices das colunas em results.boxes.data: x1, y1, x2, y2, conf, classe
+COLUNA_CONFIANCA = 4
+COLUNA_CLASSE = 5
+
+_IDS_CLASSES = np.array(sorted(CLASSES_DETECTADAS), dtype=np.int64)
+
+
+def dados_deteccoes(resultado):
+    """
+    Converte as detecções de um resultado em um array (N, 6) do NumPy com
+    uma única transferência do tensor, em vez de um acesso por elemento.
+    """
+    boxes = getattr(resultado, 'boxes', resultado)
+    dados = getattr(boxes, 'data', boxes)
+    if dados is None:
+        return np.empty((0, 6), dtype=np.float32)
+    if hasattr(dados, 'cpu'):
+        dados = dados.cpu().numpy()
+    return np.asarray(dados, dtype=np.float32).reshape(-1, 6)
+
+
+def selecionar_pose(resultado):
+    """
+    Retorna (pose, confiança) da detecção mais confiante entre as classes
+    conhecidas, ou (POSE_NAO_DETECTADA, 0.0) quando não há nenhuma.
+    """
+    dados = dados_deteccoes(resultado)
+    classes = dados[:, COLUNA_CLASSE].astype(np.int64)
+    mascara = np.isin(classes, _IDS_CLASSES)
+    if not mascara.any():
+        return POSE_NAO_DETECTADA, 0.0
+
+    confiancas = np.where(mascara, dados[:, COLUNA_CONFIANCA], -np.inf)
+    melhor = int(confiancas.argmax())
+    return CLASSES_DETECTADAS[int(classes[melhor])], float(confiancas[melhor])
+
+
+def selecionar_poses(resultados):
+    """
+    Versão em lote de selecionar_pose: concatena as detecções de todos os
+    frames e escolhe a mais confiante de cada frame com operações
+    vetorizadas. Retorna uma lista de (pose, confiança) alinhada aos
+    resultados.
+    """
+    selecoes = [(POSE_NAO_DETECTADA, 0.0)] * len(resultados)
+    dados = [dados_deteccoes(r) for r in resultados]
+    contagens = [len(d) for d in dados]
+    if sum(contagens) == 0:
+        return selecoes
+
+    todos = np.concatenate(dados)
+    frames = np.repeat(np.arange(len(dados)), contagens)
+    classes = todos[:, COLUNA_CLASSE].astype(np.int64)
+    mascara = np.isin(classes, _IDS_CLASSES)
+    frames = frames[mascara]
+    classes = classes[mascara]
+    confiancas = todos[mascara, COLUNA_CONFIANCA]
+    if len(frames) == 0:
+        return selecoes
+
+    # Ordena por frame e confiança decrescente (estável, como o laço
+    # original): a primeira linha de cada frame é a escolhida
+    ordem = np.lexsort((-confiancas, frames))
+    frames_ordenados = frames[ordem]
+    inicio_frame = np.r_[True, frames_ordenados[1:] != frames_ordenados[:-1]]
+    for i in ordem[inicio_frame]:
+        selecoes[frames[i]] = (
+            CLASSES_DETECTADAS[int(classes[i])],
+            float(confiancas[i]),
+        )
+    return selecoes
+
+
+def contabilizar_poses(pose_durations, selecoes):
+    """
+    Soma um frame em pose_durations para cada (pose, confiança) informado.
+    """
+    for pose, _ in selecoes:
+        pose_durations[pose] += 1
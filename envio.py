@@ -0,0 +1,201 @@
+import json
+import os
+import queue
+import threading
+import time
+from http import HTTPStatus
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Tempo limite (conexão, leitura) em segundos de cada requisição
+TIMEOUT_ENVIO = (3.05, 10)
+TENTATIVAS_ENVIO = 3
+ESPERA_INICIAL = 1.0  # segundos antes da primeira nova tentativa
+ESPERA_MAXIMA = 300.0  # teto do backoff exponencial
+
+_FIM = object()
+
+
+def _falha_transitoria(erro):
+    """
+    Indica se vale tentar de novo: falha de conexão, tempo esgotado, erro
+    5xx ou 429. Outras respostas de erro (4xx) rejeitam o próprio relatório.
+    """
+    if isinstance(erro, (requests.ConnectionError, requests.Timeout)):
+        return True
+    resposta = erro.response
+    if resposta is None:
+        return False
+    return (
+        resposta.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+        or resposta.status_code == HTTPStatus.TOO_MANY_REQUESTS
+    )
+
+
+class EnviadorRelatorios:
+    """
+    Envia relatórios JSON ao servidor em uma thread de fundo.
+
+    As requisições usam uma requests.Session (conexões reaproveitadas), com
+    tempo limite e novas tentativas com backoff exponencial. Relatórios que
+    não puderam ser entregues vão para um diretório de spool em disco e são
+    reenviados quando o servidor volta a responder, de modo que o
+    monitoramento nunca espera pela rede. Relatórios rejeitados pelo
+    servidor (4xx) não são reenviados: ficam no spool como .invalido, fora
+    da fila.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        server_url,
+        diretorio_spool,
+        *,
+        timeout=TIMEOUT_ENVIO,
+        tentativas=TENTATIVAS_ENVIO,
+        espera_inicial=ESPERA_INICIAL,
+        espera_maxima=ESPERA_MAXIMA,
+    ):
+        self.server_url = server_url
+        self.diretorio_spool = diretorio_spool
+        self.timeout = timeout
+        self.tentativas = tentativas
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+
+        self.sessao = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.sessao.mount('http://', adaptador)
+        self.sessao.mount('https://', adaptador)
+
+        self._fila = queue.Queue()
+        self._espera_spool = espera_inicial
+        self._proximo_spool = 0.0
+
+        self.enviados = 0
+        self.falhas = 0
+        self.rejeitados = 0
+        self.ultimo_erro = None
+
+        os.makedirs(diretorio_spool, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._loop_envio, name='envio-relatorios', daemon=True
+        )
+        self._thread.start()
+
+    def enviar(self, dados, nome):
+        """
+        Agenda o envio dos dados (já em memória) e retorna imediatamente.
+        O nome identifica o relatório no spool caso o envio falhe.
+        """
+        self._fila.put((dados, nome))
+
+    def pendentes_spool(self):
+        return len(self._arquivos_spool())
+
+    def encerrar(self, timeout=None):
+        """
+        Termina a thread após processar os envios já agendados. O que não
+        for entregue permanece no spool para a próxima execução.
+        """
+        self._fila.put(_FIM)
+        self._thread.join(timeout)
+        self.sessao.close()
+
+    def _post(self, dados):
+        resposta = self.sessao.post(
+            self.server_url, json=dados, timeout=self.timeout
+        )
+        resposta.raise_for_status()
+
+    def _post_com_tentativas(self, dados):
+        """
+        Retorna se o relatório foi entregue. Uma rejeição do servidor não é
+        repetida e propaga a exceção.
+        """
+        espera = self.espera_inicial
+        for tentativa in range(self.tentativas):
+            try:
+                self._post(dados)
+                self.enviados += 1
+                return True
+            except requests.RequestException as e:
+                self.ultimo_erro = str(e)
+                if not _falha_transitoria(e):
+                    raise
+                if tentativa + 1 < self.tentativas:
+                    time.sleep(espera)
+                    espera = min(espera * 2, self.espera_maxima)
+        self.falhas += 1
+        return False
+
+    def _arquivos_spool(self):
+        return sorted(
+            os.path.join(self.diretorio_spool, nome)
+            for nome in os.listdir(self.diretorio_spool)
+            if nome.endswith('.json')
+        )
+
+    def _guardar_spool(self, dados, nome, extensao='.json'):
+        caminho = os.path.join(self.diretorio_spool, nome + extensao)
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False)
+        os.replace(temporario, caminho)
+
+    def _esvaziar_spool(self):
+        """
+        Reenvia os relatórios do spool em ordem. Na primeira falha
+        transitória agenda a próxima tentativa com backoff exponencial;
+        relatórios rejeitados são separados e a fila segue.
+        """
+        if time.monotonic() < self._proximo_spool:
+            return
+        for caminho in self._arquivos_spool():
+            try:
+                with open(caminho, encoding='utf-8') as f:
+                    dados = json.load(f)
+            except (OSError, ValueError):
+                # Arquivo corrompido: separa para não bloquear a fila
+                os.replace(caminho, caminho + '.invalido')
+                continue
+            try:
+                self._post(dados)
+            except requests.RequestException as e:
+                self.ultimo_erro = str(e)
+                if not _falha_transitoria(e):
+                    # Rejeitado pelo servidor: separa para não bloquear a fila
+                    self.rejeitados += 1
+                    os.replace(caminho, caminho + '.invalido')
+                    continue
+                self._proximo_spool = time.monotonic() + self._espera_spool
+                self._espera_spool = min(
+                    self._espera_spool * 2, self.espera_maxima
+                )
+                return
+            self.enviados += 1
+            os.remove(caminho)
+        self._espera_spool = self.espera_inicial
+
+    def _loop_envio(self):
+        while True:
+            try:
+                item = self._fila.get(timeout=self.espera_inicial)
+            except queue.Empty:
+                self._esvaziar_spool()
+                continue
+            if item is _FIM:
+                break
+
+            dados, nome = item
+            try:
+                entregue = self._post_com_tentativas(dados)
+            except requests.RequestException:
+                # Rejeitado pelo servidor: guardado à parte, sem reenvio
+                self.rejeitados += 1
+                self._guardar_spool(dados, nome, '.json.invalido')
+                continue
+            if entregue:
+                self._esvaziar_spool()
+            else:
+                self._guardar_spool(dados, nome)
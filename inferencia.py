@@ -0,0 +1,286 @@
+import glob
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+
+import cv2
+import numpy as np
+
+from constants import (
+    EXTENSOES_IMAGEM,
+    LOTES_CANDIDATOS,
+    TAMANHO_LOTE_PADRAO,
+)
+from deteccao import dados_deteccoes
+
+
+def _sem_medicao(etapa, itens=1):
+    return nullcontext()
+
+
+def inferir_lote(model, imagens, imgsz=None):
+    """
+    Executa uma única chamada de predição para todas as imagens do lote e
+    retorna a lista de resultados na mesma ordem das imagens. imgsz define
+    o tamanho de entrada do modelo (None usa o padrão do modelo).
+    """
+    if not imagens:
+        return []
+    opcoes = {} if imgsz is None else {'imgsz': imgsz}
+    return model(list(imagens), verbose=False, **opcoes)
+
+
+def inferir_lote_com_movimento(  # noqa: PLR0913, PLR0917
+    model,
+    imagens,
+    detector,
+    ultimo_resultado,
+    metricas=None,
+    imgsz=None,
+    controlador=None,
+):
+    """
+    Infere apenas as imagens em que o detector de movimento indicou mudança
+    e reutiliza o resultado anterior nas demais. Retorna a lista de
+    resultados alinhada às imagens. Sem detector, infere todas.
+    Com controlador (ControladorLatencia), o imgsz e o passo de frames
+    inferidos vêm dele; os frames fora do passo também reutilizam o
+    resultado anterior. Com metricas (MetricasEtapas), mede as etapas
+    'pre-processamento' (filtro de movimento) e 'inferencia'.
+    """
+    medir = metricas.medir if metricas is not None else _sem_medicao
+
+    if controlador is None:
+        no_passo = [True] * len(imagens)
+    else:
+        imgsz = controlador.imgsz
+        no_passo = controlador.frames_a_inferir(len(imagens))
+
+    if detector is None:
+        precisa_inferir = no_passo
+    else:
+        with medir('pre-processamento', len(imagens)):
+            precisa_inferir = [
+                passo and detector.houve_mudanca(img)
+                for img, passo in zip(imagens, no_passo)
+            ]
+    if ultimo_resultado is None and precisa_inferir:
+        # Sem detecção anterior não há o que reutilizar
+        precisa_inferir[0] = True
+
+    selecionadas = [img for img, p in zip(imagens, precisa_inferir) if p]
+    with medir('inferencia', len(selecionadas)):
+        inferidos = iter(inferir_lote(model, selecionadas, imgsz))
+
+    resultados = []
+    for inferir in precisa_inferir:
+        if inferir:
+            ultimo_resultado = next(inferidos)
+        resultados.append(ultimo_resultado)
+    return resultados
+
+
+def inferir_lote_com_rastreamento(
+    model, imagens, rastreador, metricas=None, imgsz=None
+):
+    """
+    Infere as imagens em que o rastreador (RastreadorPoses) pede uma nova
+    detecção e, nas demais, usa as caixas e poses propagadas por ele.
+    Retorna uma lista de arrays (N, 6) alinhada às imagens. Com metricas,
+    mede as etapas 'inferencia' e 'rastreamento'.
+    """
+    medir = metricas.medir if metricas is not None else _sem_medicao
+
+    resultados = []
+    for img in imagens:
+        if rastreador.deve_detectar():
+            with medir('inferencia'):
+                resultado = inferir_lote(model, [img], imgsz)[0]
+                resultados.append(
+                    rastreador.atualizar_deteccao(img, resultado)
+                )
+        else:
+            with medir('rastreamento'):
+                resultados.append(rastreador.propagar(img))
+    return resultados
+
+
+def inferir_lote_com_cache(  # noqa: PLR0913, PLR0917
+    model, imagens, chaves, cache, metricas=None, imgsz=None
+):
+    """
+    Busca no cache (CacheInferencia) as detecções de cada imagem pela sua
+    chave e infere, em um único lote, apenas as que faltam, guardando-as
+    no cache. Retorna uma lista de arrays (N, 6) alinhada às imagens. Com
+    metricas, mede as etapas 'cache' e 'inferencia'. imgsz deve ser o
+    mesmo usado na chave do cache.
+    """
+    medir = metricas.medir if metricas is not None else _sem_medicao
+
+    with medir('cache', len(imagens)):
+        deteccoes = cache.obter_lote(chaves)
+    faltando = [i for i, dados in enumerate(deteccoes) if dados is None]
+    if not faltando:
+        return deteccoes
+
+    with medir('inferencia', len(faltando)):
+        inferidos = inferir_lote(model, [imagens[i] for i in faltando], imgsz)
+        novos = [dados_deteccoes(r) for r in inferidos]
+    with medir('cache', len(faltando)):
+        cache.guardar_lote([chaves[i] for i in faltando], novos)
+    for i, dados in zip(faltando, novos):
+        deteccoes[i] = dados
+    return deteccoes
+
+
+def ler_lote(captura, tamanho_lote, tempo_midia=False, timeout=None):
+    """
+    Lê até tamanho_lote frames da captura. Retorna (frames, instantes), com
+    o instante de cada frame em segundos: tempo da mídia quando tempo_midia
+    é verdadeiro, senão o epoch da captura. As listas ficam vazias quando a
+    fonte terminou ou, com timeout, quando nenhum frame chegou a tempo
+    (captura.encerrada distingue os dois casos).
+    """
+    frames, instantes = [], []
+    while len(frames) < tamanho_lote:
+        ret, frame = captura.ler(timeout)
+        if not ret:
+            break
+        frames.append(frame)
+        instantes.append(
+            captura.timestamp_ms / 1000
+            if tempo_midia
+            else captura.instante_captura
+        )
+    return frames, instantes
+
+
+def listar_imagens(diretorio):
+    """
+    Lista, em ordem alfabética, os arquivos de imagem de um diretório.
+    """
+    return sorted(
+        os.path.join(diretorio, nome)
+        for nome in os.listdir(diretorio)
+        if os.path.splitext(nome)[1].lower() in EXTENSOES_IMAGEM
+    )
+
+
+def resolver_imagens(caminho):
+    """
+    Lista as imagens de um diretório ou de um padrão glob (ex.:
+    'arquivo/**/*.jpg'), em ordem alfabética.
+    """
+    if os.path.isdir(caminho):
+        return listar_imagens(caminho)
+    return sorted(
+        c
+        for c in glob.glob(caminho, recursive=True)
+        if os.path.splitext(c)[1].lower() in EXTENSOES_IMAGEM
+    )
+
+
+def iterar_lotes_imagens(caminhos, tamanho_lote):
+    """
+    Gera lotes (caminhos, imagens) decodificados com cv2.imread. Imagens que
+    não puderam ser abertas são ignoradas.
+    """
+    lote_caminhos, lote_imagens = [], []
+    for caminho in caminhos:
+        img = cv2.imread(caminho)
+        if img is None:
+            continue
+        lote_caminhos.append(caminho)
+        lote_imagens.append(img)
+        if len(lote_imagens) == tamanho_lote:
+            yield lote_caminhos, lote_imagens
+            lote_caminhos, lote_imagens = [], []
+    if lote_imagens:
+        yield lote_caminhos, lote_imagens
+
+
+def iterar_lotes_imagens_paralelo(caminhos, tamanho_lote, trabalhadores=None):
+    """
+    Igual a iterar_lotes_imagens, mas decodifica as imagens em um pool de
+    threads (cv2.imread libera o GIL). Apenas um número limitado de imagens
+    fica adiantado na memória, e a ordem dos caminhos é mantida.
+    """
+    trabalhadores = trabalhadores or min(32, (os.cpu_count() or 1) + 4)
+    limite = trabalhadores + 2 * tamanho_lote
+    caminhos = iter(caminhos)
+    pendentes = deque()
+
+    with ThreadPoolExecutor(
+        trabalhadores, thread_name_prefix='leitura-imagens'
+    ) as executor:
+
+        def adiantar():
+            for caminho in islice(caminhos, limite - len(pendentes)):
+                futuro = executor.submit(cv2.imread, caminho)
+                pendentes.append((caminho, futuro))
+
+        adiantar()
+        lote_caminhos, lote_imagens = [], []
+        while pendentes:
+            caminho, futuro = pendentes.popleft()
+            img = futuro.result()
+            adiantar()
+            if img is None:
+                continue
+            lote_caminhos.append(caminho)
+            lote_imagens.append(img)
+            if len(lote_imagens) == tamanho_lote:
+                yield lote_caminhos, lote_imagens
+                lote_caminhos, lote_imagens = [], []
+        if lote_imagens:
+            yield lote_caminhos, lote_imagens
+
+
+def inferir_em_lotes(model, lotes):
+    """
+    Recebe lotes (chaves, imagens) e gera (chave, imagem, resultado) na
+    ordem original, com uma predição por lote.
+    """
+    for chaves, imagens in lotes:
+        resultados = inferir_lote(model, imagens)
+        yield from zip(chaves, imagens, resultados)
+
+
+def ajustar_tamanho_lote(
+    model, frame, candidatos=LOTES_CANDIDATOS, ganho_minimo=0.05
+):
+    """
+    Mede a vazão (frames/s) de cada tamanho de lote candidato usando cópias
+    do frame informado e retorna o maior lote que ainda melhora a vazão em
+    pelo menos ganho_minimo em relação ao anterior.
+    """
+    # Aquecimento: a primeira inferência inclui custos de inicialização
+    inferir_lote(model, [frame])
+
+    melhor_lote, melhor_vazao = 1, 0.0
+    for tamanho in candidatos:
+        inicio = time.perf_counter()
+        inferir_lote(model, [frame] * tamanho)
+        vazao = tamanho / max(time.perf_counter() - inicio, 1e-9)
+        if vazao < melhor_vazao * (1 + ganho_minimo):
+            break
+        melhor_lote, melhor_vazao = tamanho, vazao
+
+    return melhor_lote
+
+
+def resolver_tamanho_lote(model, cap, tamanho_lote=TAMANHO_LOTE_PADRAO):
+    """
+    Converte o tamanho de lote configurado em um inteiro. Com 'auto', mede
+    o melhor tamanho usando um frame vazio nas dimensões da fonte de vídeo.
+    """
+    if str(tamanho_lote).strip().lower() != 'auto':
+        return max(int(tamanho_lote), 1)
+
+    largura = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) or 640
+    altura = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) or 480
+    frame = np.zeros((altura, largura, 3), dtype=np.uint8)
+    return ajustar_tamanho_lote(model, frame)
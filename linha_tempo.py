@@ -0,0 +1,223 @@
+import csv
+
+import numpy as np
+
+from constants import CLASSES_DETECTADAS, POSE_NAO_DETECTADA
+
+# Identificador usado na linha do tempo para frames sem detecção
+ID_NAO_DETECTADO = -1
+
+CAPACIDADE_INICIAL = 256
+
+
+class LinhaTempoPoses:
+    """
+    Linha do tempo das poses por frame, compactada por run-length encoding.
+
+    Frames consecutivos com a mesma pose formam um único trecho (início, fim,
+    classe, número de frames, soma das confianças), guardado em arrays do
+    NumPy pré-alocados. Horas de vídeo com poses estáveis ocupam poucos KB.
+
+    Os tempos são em segundos: tempo da mídia para arquivos ou epoch
+    (time.time()) para fontes ao vivo. Cada trecho termina no instante do
+    primeiro frame do trecho seguinte.
+    """
+
+    def __init__(self, capacidade=CAPACIDADE_INICIAL):
+        self._ids_pose = {pose: i for i, pose in CLASSES_DETECTADAS.items()}
+        self._ids_pose[POSE_NAO_DETECTADA] = ID_NAO_DETECTADO
+
+        self._inicio = np.empty(capacidade, dtype=np.float64)
+        self._fim = np.empty(capacidade, dtype=np.float64)
+        self._classe = np.empty(capacidade, dtype=np.int16)
+        self._frames = np.empty(capacidade, dtype=np.uint32)
+        self._soma_confianca = np.empty(capacidade, dtype=np.float32)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def nbytes(self):
+        return sum(
+            a.nbytes
+            for a in (
+                self._inicio,
+                self._fim,
+                self._classe,
+                self._frames,
+                self._soma_confianca,
+            )
+        )
+
+    def _crescer(self):
+        capacidade = len(self._inicio) * 2
+        for nome in (
+            '_inicio',
+            '_fim',
+            '_classe',
+            '_frames',
+            '_soma_confianca',
+        ):
+            antigo = getattr(self, nome)
+            novo = np.empty(capacidade, dtype=antigo.dtype)
+            novo[: self._n] = antigo[: self._n]
+            setattr(self, nome, novo)
+
+    def registrar(self, timestamp, pose, confianca=0.0):
+        """
+        Registra a pose de um frame no instante timestamp (s).
+        """
+        classe = self._ids_pose[pose]
+        n = self._n
+        if n:
+            # O trecho anterior se estende até o frame atual
+            self._fim[n - 1] = max(timestamp, self._fim[n - 1])
+            if self._classe[n - 1] == classe:
+                self._frames[n - 1] += 1
+                self._soma_confianca[n - 1] += confianca
+                return
+
+        if n == len(self._inicio):
+            self._crescer()
+        self._inicio[n] = timestamp
+        self._fim[n] = timestamp
+        self._classe[n] = classe
+        self._frames[n] = 1
+        self._soma_confianca[n] = confianca
+        self._n += 1
+
+    def registrar_lote(self, timestamps, selecoes):
+        """
+        Registra vários frames: selecoes é uma lista de (pose, confiança)
+        alinhada a timestamps.
+        """
+        for timestamp, (pose, confianca) in zip(timestamps, selecoes):
+            self.registrar(timestamp, pose, confianca)
+
+    def anexar(self, outra):
+        """
+        Acrescenta os trechos de uma linha do tempo posterior a esta (ex.:
+        partes de um vídeo processadas em paralelo), com o mesmo resultado
+        de registrar todos os frames em sequência.
+        """
+        inicio, fim, classe, frames, _ = outra.trechos()
+        soma_confianca = outra._soma_confianca[: len(outra)]
+        for i in range(len(outra)):
+            n = self._n
+            if n:
+                self._fim[n - 1] = max(inicio[i], self._fim[n - 1])
+                if self._classe[n - 1] == classe[i]:
+                    self._fim[n - 1] = max(fim[i], self._fim[n - 1])
+                    self._frames[n - 1] += frames[i]
+                    self._soma_confianca[n - 1] += soma_confianca[i]
+                    continue
+
+            if n == len(self._inicio):
+                self._crescer()
+            self._inicio[n] = inicio[i]
+            self._fim[n] = fim[i]
+            self._classe[n] = classe[i]
+            self._frames[n] = frames[i]
+            self._soma_confianca[n] = soma_confianca[i]
+            self._n += 1
+
+    def finalizar(self, duracao_ultimo_frame=0.0):
+        """
+        Fecha o último trecho somando a duração do último frame.
+        """
+        if self._n:
+            self._fim[self._n - 1] += duracao_ultimo_frame
+
+    def trechos(self):
+        """
+        Retorna (inicio, fim, classe, frames, confianca_media) dos trechos
+        como arrays do NumPy (visões, sem cópia dos dados).
+        """
+        n = self._n
+        frames = self._frames[:n]
+        return (
+            self._inicio[:n],
+            self._fim[:n],
+            self._classe[:n],
+            frames,
+            self._soma_confianca[:n] / np.maximum(frames, 1),
+        )
+
+    def tempo_em_pose(self, pose, inicio=None, fim=None):
+        """
+        Tempo (s) passado em uma pose dentro do intervalo [inicio, fim].
+        Ex.: tempo deitado entre 02:00 e 04:00, com os instantes em epoch.
+        """
+        n = self._n
+        inicios = self._inicio[:n]
+        fins = self._fim[:n]
+        if inicio is not None:
+            inicios = np.maximum(inicios, inicio)
+        if fim is not None:
+            fins = np.minimum(fins, fim)
+        sobreposicao = np.clip(fins - inicios, 0, None)
+        mascara = self._classe[:n] == self._ids_pose[pose]
+        return float(sobreposicao[mascara].sum())
+
+    def duracao_total(self):
+        if not self._n:
+            return 0.0
+        return float(self._fim[self._n - 1] - self._inicio[0])
+
+    def duracoes(self):
+        """
+        Tempo total (s) em cada pose, na ordem do relatório.
+        """
+        return {pose: self.tempo_em_pose(pose) for pose in self._ids_pose}
+
+    def contagens(self):
+        """
+        Número de frames em cada pose, na ordem do relatório.
+        """
+        n = self._n
+        return {
+            pose: int(self._frames[:n][self._classe[:n] == classe].sum())
+            for pose, classe in self._ids_pose.items()
+        }
+
+    def resumo(self):
+        """
+        Lista de (pose, duracao_s, porcentagem). A porcentagem é calculada
+        pelo tempo e, quando a linha do tempo não tem duração (ex.: uma
+        única imagem), pelo número de frames.
+        """
+        duracoes = self.duracoes()
+        total = sum(duracoes.values())
+        pesos = duracoes if total > 0 else self.contagens()
+        total_pesos = sum(pesos.values()) or 1
+        return [
+            (pose, duracoes[pose], pesos[pose] / total_pesos * 100)
+            for pose in self._ids_pose
+        ]
+
+    def salvar_csv(self, caminho_csv):
+        """
+        Salva os trechos da linha do tempo em CSV.
+        Colunas: inicio_s, fim_s, pose, frames, confianca_media
+        """
+        nomes = {classe: pose for pose, classe in self._ids_pose.items()}
+        inicio, fim, classe, frames, confianca = self.trechos()
+        with open(caminho_csv, mode='w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f, delimiter=';')
+            writer.writerow([
+                'inicio_s',
+                'fim_s',
+                'pose',
+                'frames',
+                'confianca_media',
+            ])
+            for i in range(len(self)):
+                writer.writerow([
+                    f'{inicio[i]:.3f}',
+                    f'{fim[i]:.3f}',
+                    nomes[int(classe[i])],
+                    int(frames[i]),
+                    f'{confianca[i]:.3f}',
+                ])
+        return caminho_csv
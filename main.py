@@ -1,5 +1,7 @@
+import os
 import sys
 import time
+from dataclasses import asdict, dataclass
 
 import cv2
 from rich.console import Console
@@ -7,15 +9,42 @@ from rich.panel import Panel
 from rich.progress import Progress
 from rich.prompt import Confirm, Prompt
 from rich.table import Table
-from ultralytics import YOLO
 
+from alertas import MotorAlertas, SaidaCallback, criar_saida
+from captura import CapturaStream, CapturaUltimoFrame, eh_stream
+from clipes import GravadorClipes
 from constants import (
+    ARQUIVO_ALERTAS,
     ARQUIVO_PESOS,
     ARQUIVO_VIDEO_PADRAO,
+    BACKEND_PADRAO,
+    BACKENDS_INFERENCIA,
     CLASSES_DETECTADAS,
     DURACAO_PADRAO,
+    ESPERA_FRAME_STREAM,
+    FPS_ALVO_PADRAO,
+    GATILHO_CLIPE_PADRAO,
+    GATILHOS_CLIPE,
+    METODOS_SUAVIZACAO,
+    PASSO_MAXIMO_FRAMES,
     POSE_NAO_DETECTADA,
+    SUAVIZACAO_PADRAO,
+    TAMANHO_LOTE_PADRAO,
 )
+from controle_latencia import ControladorLatencia
+from deteccao import contabilizar_poses, selecionar_poses
+from inferencia import (
+    inferir_lote_com_movimento,
+    inferir_lote_com_rastreamento,
+    ler_lote,
+    resolver_tamanho_lote,
+)
+from metricas import MetricasEtapas
+from modelos import carregar_modelo
+from movimento import DetectorMovimento
+from rastreamento import RastreadorPoses
+from renderizacao import RenderizadorAnotacoes
+from suavizacao import SuavizadorPoses
 
 # Tentativa de importar o módulo msvcrt
 try:
@@ -42,59 +71,201 @@ def initialize_app():
 console = Console()
 
 
+@dataclass
+class ParametrosMonitoramento:
+    """
+    Configuração escolhida pelo usuário, com os mesmos nomes dos
+    parâmetros de run_pose_monitoring.
+    """
+
+    video_path: str = ARQUIVO_VIDEO_PADRAO
+    duration_seconds: float = DURACAO_PADRAO
+    weights_path: str = ARQUIVO_PESOS
+    annotated_frame_cv2: bool = True
+    offline: bool = False
+    tamanho_lote: str = TAMANHO_LOTE_PADRAO
+    filtro_movimento: bool = False
+    backend: str = BACKEND_PADRAO
+    rastreamento: bool = False
+    fps_alvo: float = FPS_ALVO_PADRAO
+    suavizacao: str = SUAVIZACAO_PADRAO
+    destino_alertas: str | None = None
+    gatilho_clipes: str = GATILHO_CLIPE_PADRAO
+
+
 def get_user_parameters():
     console.print(
         Panel('🎮 Configuração do Monitoramento', style='bold green')
     )
+    parametros = ParametrosMonitoramento()
 
     # Seleção da fonte de vídeo
     video_source = Prompt.ask(
         '\n📹 Escolha a fonte de vídeo',
-        choices=['webcam', 'arquivo'],
+        choices=['webcam', 'arquivo', 'stream'],
         default='webcam',
     )
 
-    video_path = (
-        '0'
-        if video_source == 'webcam'
-        else Prompt.ask(
+    if video_source == 'webcam':
+        parametros.video_path = '0'
+    elif video_source == 'stream':
+        parametros.video_path = Prompt.ask(
+            '🌐 Digite a URL da câmera IP (rtsp://, http://...)'
+        )
+    else:
+        parametros.video_path = Prompt.ask(
             '🎥 Digite o caminho do arquivo de vídeo',
             default=ARQUIVO_VIDEO_PADRAO,
         )
+
+    # Modo offline: processa o arquivo inteiro o mais rápido possível
+    parametros.offline = video_source == 'arquivo' and Confirm.ask(
+        '\n⚡ Processar o arquivo inteiro o mais rápido possível (offline)?',
+        default=False,
     )
 
+    # Tamanho do lote de inferência (apenas arquivos)
+    if video_source == 'arquivo':
+        parametros.tamanho_lote = Prompt.ask(
+            '\n📦 Tamanho do lote de inferência (auto = ajuste automático)',
+            default=TAMANHO_LOTE_PADRAO,
+        )
+
     # Seleção da duração
-    duration_str = Prompt.ask(
-        '\n⏱️ Digite a duração desejada em minutos', default='5'
-    )
-    duration_seconds = float(duration_str) * 60
+    if not parametros.offline:
+        duration_str = Prompt.ask(
+            '\n⏱️ Digite a duração desejada em minutos', default='5'
+        )
+        parametros.duration_seconds = float(duration_str) * 60
 
     # Seleção do arquivo de pesos
     use_default_weights = Confirm.ask(
         '\n🎯 Usar arquivo de pesos padrão?', default=True
     )
-    weights_path = (
-        ARQUIVO_PESOS
-        if use_default_weights
-        else Prompt.ask(
+    if not use_default_weights:
+        parametros.weights_path = Prompt.ask(
             'Digite o caminho para o arquivo de pesos personalizado'
         )
+
+    # Backend de inferência (modelos exportados são gerados na 1ª vez)
+    parametros.backend = Prompt.ask(
+        '\n⚙️ Backend de inferência',
+        choices=list(BACKENDS_INFERENCIA),
+        default=BACKEND_PADRAO,
+    )
+
+    # Detecção a cada N frames com rastreamento entre elas; quando
+    # ativo, dispensa o filtro de movimento
+    parametros.rastreamento = Confirm.ask(
+        '\n🛰️ Detectar a cada N frames e rastrear entre as detecções?',
+        default=False,
+    )
+
+    # Filtro de movimento
+    parametros.filtro_movimento = not parametros.rastreamento and (
+        Confirm.ask(
+            '\n🧊 Pular a inferência em frames sem movimento?', default=True
+        )
+    )
+
+    # FPS alvo do controle de latência (não se aplica ao modo offline)
+    if not parametros.offline:
+        parametros.fps_alvo = float(
+            Prompt.ask(
+                '\n🎚️ FPS alvo (0 = sem controle de latência)',
+                default=str(FPS_ALVO_PADRAO),
+            )
+        )
+
+    # Suavização da pose de cada frame antes da contagem
+    parametros.suavizacao = Prompt.ask(
+        '\n🪄 Suavização temporal das poses',
+        choices=list(METODOS_SUAVIZACAO),
+        default=SUAVIZACAO_PADRAO,
+    )
+
+    # Alertas em tempo real para poses de risco (webhook ou arquivo)
+    if Confirm.ask('\n🚨 Emitir alertas de pessoa deitada?', default=False):
+        parametros.destino_alertas = Prompt.ask(
+            '🚨 Destino dos alertas (URL do webhook ou arquivo .jsonl)',
+            default=ARQUIVO_ALERTAS,
+        )
+
+    # Clipes com os segundos antes e depois de um alerta ou transição
+    parametros.gatilho_clipes = Prompt.ask(
+        '\n🎬 Gravar clipes de vídeo ao redor de',
+        choices=list(GATILHOS_CLIPE),
+        default=GATILHO_CLIPE_PADRAO,
     )
 
     # Seleção da visualização dos frames
-    annotated_frame_cv2 = Confirm.ask(
+    parametros.annotated_frame_cv2 = Confirm.ask(
         '\n🖼️ Visualizar frames com anotações?', default=True
     )
 
-    return video_path, duration_seconds, weights_path, annotated_frame_cv2
+    return parametros
 
 
-def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
+def run_pose_monitoring(  # noqa: PLR0912, PLR0913, PLR0914, PLR0915, PLR0917
     video_path=ARQUIVO_VIDEO_PADRAO,
     duration_seconds=DURACAO_PADRAO,
     weights_path=ARQUIVO_PESOS,
     annotated_frame_cv2=True,
+    offline=False,
+    tamanho_lote=TAMANHO_LOTE_PADRAO,
+    filtro_movimento=False,
+    backend=BACKEND_PADRAO,
+    gancho_metricas=None,
+    perfilar=False,
+    rastreamento=False,
+    fps_alvo=FPS_ALVO_PADRAO,
+    suavizacao=SUAVIZACAO_PADRAO,
+    destino_alertas=None,
+    gatilho_clipes=GATILHO_CLIPE_PADRAO,
 ):
+    """
+    Monitora as poses na fonte de vídeo informada.
+
+    No modo offline (apenas arquivos) o vídeo é processado inteiro, tão
+    rápido quanto a decodificação e a inferência permitirem, e as durações
+    são calculadas pelo tempo da mídia e não pelo tempo de relógio.
+
+    Arquivos são inferidos em lotes de tamanho_lote frames ('auto' mede o
+    melhor tamanho na máquina atual).
+
+    Com filtro_movimento, frames em que a cena não mudou reutilizam a última
+    detecção, sem deixar de contar a pose em pose_durations.
+
+    Com rastreamento, o modelo roda a cada N frames (N adaptativo) e as
+    caixas e poses são propagadas por fluxo óptico nos frames entre as
+    detecções; todo frame continua contado em pose_durations.
+
+    backend escolhe entre o modelo PyTorch e o exportado (ONNX/OpenVINO).
+
+    Com fps_alvo > 0 (fora do modo offline), o imgsz da inferência e o
+    passo de frames inferidos são ajustados durante o monitoramento para
+    manter a taxa (com rastreamento, só o imgsz); cada ajuste aparece no
+    relatório final.
+
+    Com suavizacao diferente de 'nenhuma', a pose de cada frame passa por
+    um filtro temporal ('maioria', 'ema' ou 'histerese') antes de ser
+    contada; o relatório compara as contagens brutas e suavizadas.
+
+    Com destino_alertas (URL de webhook ou arquivo .jsonl), uma pose de
+    risco que persiste dispara um alerta imediato, entregue em segundo
+    plano sem segurar o loop; a latência de cada alerta vai no relatório.
+
+    Com gatilho_clipes 'alertas' ou 'transicoes', os últimos segundos de
+    vídeo ficam em um buffer circular comprimido e cada alerta (ou mudança
+    de pose) gera um clipe MP4 com os segundos antes e depois do evento.
+
+    A latência de cada etapa do loop é medida e exibida no relatório final.
+    gancho_metricas(etapa, duracao_s, itens) recebe cada medição e
+    perfilar=True ativa o cProfile durante o monitoramento.
+    """
+    stream = eh_stream(video_path)
+    offline = offline and video_path != '0' and not stream
+
     # Inicialização do monitoramento
     console.print(
         Panel('🎥 Sistema de Monitoramento de Poses', style='bold blue')
@@ -113,7 +284,9 @@ def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
     # Carregamento do modelo YOLO
     with console.status('[bold green]Carregando o modelo YOLO...'):
         try:
-            model = YOLO(weights_path)
+            # Reutiliza o modelo já carregado e aquecido em sessões
+            # anteriores; só recarrega se o arquivo de pesos mudar
+            model = carregar_modelo(weights_path, backend=backend)
             model.classes = [0, 1, 2, 3, 4]
             # confiança mínima
             model.conf = 0.5
@@ -123,105 +296,236 @@ def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
             )
             return
 
-    # Inicialização da câmera ou vídeo
-    cap = cv2.VideoCapture(0 if video_path == '0' else video_path)
+    # Inicialização da câmera, do stream ou do vídeo. Streams são abertos
+    # em modo de baixa latência e reconectados se caírem
+    if stream:
+        captura = CapturaStream(video_path)
+        cap = captura.cap
+    else:
+        cap = cv2.VideoCapture(0 if video_path == '0' else video_path)
     if not cap.isOpened():
         console.print('[bold red]❌ Erro ao abrir fonte de vídeo!')
         return
 
+    total_frames_midia = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
     console.print('\n📊 Configurações:')
-    console.print(f'- Duração planejada: {duration_seconds / 60:.1f} minutos')
+    if offline:
+        console.print(
+            f'- Modo offline: arquivo completo ({total_frames_midia} frames)'
+        )
+    else:
+        console.print(
+            f'- Duração planejada: {duration_seconds / 60:.1f} minutos'
+        )
     console.print(
         '- Classes detectadas:'
         + f' {[CLASSES_DETECTADAS[c] for c in model.classes]}'
     )
 
+    # Fontes ao vivo usam lote 1 para não acumular latência
+    if video_path == '0' or stream:
+        tamanho_lote = 1
+    else:
+        with console.status('[bold green]Ajustando o tamanho do lote...'):
+            tamanho_lote = resolver_tamanho_lote(model, cap, tamanho_lote)
+    console.print(f'- Tamanho do lote de inferência: {tamanho_lote}')
+
+    # Captura em thread separada: para a webcam mantém apenas o frame
+    # mais recente, para arquivos apenas adianta a decodificação
+    if not stream:
+        captura = CapturaUltimoFrame(cap, descartar_frames=video_path == '0')
+    captura.iniciar()
+
+    # Filtro de movimento antes da inferência
+    detector = DetectorMovimento() if filtro_movimento else None
+    ultimo_resultado = None
+    rastreador = RastreadorPoses() if rastreamento else None
+    suavizador = (
+        SuavizadorPoses(suavizacao) if suavizacao != 'nenhuma' else None
+    )
+
+    # Alertas entregues em thread própria, também exibidos no terminal
+    motor_alertas = None
+    if destino_alertas or gatilho_clipes == 'alertas':
+        saidas = [
+            SaidaCallback(
+                lambda alerta: console.print(
+                    f'🚨 [bold red]{alerta["pose"]}[/] há'
+                    + f' {alerta["duracao_s"]:.0f} s'
+                )
+            )
+        ]
+        if destino_alertas:
+            saidas.append(criar_saida(destino_alertas))
+        motor_alertas = MotorAlertas(saidas, tempo_real=not offline)
+
+    # Buffer de vídeo para os clipes, gravados em thread própria
+    gravador = None
+    if gatilho_clipes != 'nenhum':
+        gravador = GravadorClipes(gatilho=gatilho_clipes)
+
+    # Controle de latência: imgsz e passo de frames para o FPS alvo. O
+    # rastreador já decide quais frames passam pelo modelo, então com ele
+    # só o imgsz é ajustado
+    controlador = None
+    if fps_alvo > 0 and not offline:
+        controlador = ControladorLatencia(
+            fps_alvo, passo_maximo=1 if rastreador else PASSO_MAXIMO_FRAMES
+        )
+
+    # Latência por etapa do loop (p50/p95/p99 e vazão)
+    metricas = MetricasEtapas(gancho=gancho_metricas, perfilar=perfilar)
+
+    # Anotações desenhadas apenas na taxa de atualização da tela
+    renderizador = RenderizadorAnotacoes(
+        'Sistema de Monitoramento de Poses - Deteccao em Tempo Real'
+    )
+
     # Processamento dos frames
     with Progress(console=console) as progress:
         task = progress.add_task(
             '[cyan]Processando frames...[/cyan] [yellow]'
             + '(Pressione q para terminar)[/yellow]',
-            total=duration_seconds,
+            total=total_frames_midia if offline else duration_seconds,
         )
 
-        while cap.isOpened():
-            current_time = time.time()
-            elapsed = current_time - start_time
-
-            # Atualiza a barra de progresso baseada no tempo real
-            progress.update(task, completed=min(elapsed, duration_seconds))
-
-            # Verifica se atingiu o tempo desejado
-            if elapsed >= duration_seconds:
-                break
-
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            frame_count += 1
-            results = model(frame, verbose=False)[
-                0
-            ]  # Obtém o primeiro resultado
-            person_detected = False
-            best_confidence = 0
-            best_pose = POSE_NAO_DETECTADA
-
-            if annotated_frame_cv2:
-                # Adiciona as anotações ao frame
-                annotated_frame = results.plot()
-
-                # Mostra o frame com as anotações na tela
-                cv2.imshow(
-                    'Sistema de Monitoramento de '
-                    + 'Poses - Deteccao em Tempo Real',
-                    annotated_frame,
-                )
-
-                # tecla a ser pressionada na janela
-                # do openvc para quebrar o loop
-                key = cv2.waitKey(1) & 0xFF
-                # Verifica se a tecla q foi pressionada na janela do OpenCV
-                if key == ord('q'):
-                    console.print(
-                        '\n❌ Monitoramento interrompido'
-                        + ' pela janela do OpenCV.'
+        while True:
+            if not offline:
+                current_time = time.time()
+                elapsed = current_time - start_time
+
+                # Atualiza a barra de progresso baseada no tempo real
+                with metricas.medir('progresso'):
+                    progress.update(
+                        task, completed=min(elapsed, duration_seconds)
                     )
-                    break
 
-            # Verifica se há tecla pressionada no terminal
-            if msvcrt.kbhit():
-                terminal_key = msvcrt.getch().decode().lower()
-                if terminal_key == 'q':
-                    console.print(
-                        '\n❌ Monitoramento interrompido pelo terminal.'
-                    )
+                # Verifica se atingiu o tempo desejado
+                if elapsed >= duration_seconds:
                     break
 
-            for detection in results.boxes.data:
-                class_id = int(
-                    detection[5]
-                )  # O índice da classe está na posição 5
-                confidence = float(
-                    detection[4]
-                )  # A confiança está na posição 4
-
-                if class_id in CLASSES_DETECTADAS:
-                    person_detected = True
-                    if confidence > best_confidence:
-                        best_confidence = confidence
-                        best_pose = CLASSES_DETECTADAS[class_id]
-
-            detected_pose_this_frame = (
-                best_pose if person_detected else POSE_NAO_DETECTADA
+            inicio_captura = time.perf_counter()
+            frames, instantes = ler_lote(
+                captura,
+                tamanho_lote,
+                tempo_midia=offline,
+                timeout=ESPERA_FRAME_STREAM if stream else None,
             )
-            pose_durations[detected_pose_this_frame] += 1
+            metricas.registrar(
+                'captura', time.perf_counter() - inicio_captura, len(frames)
+            )
+            if not frames:
+                if stream and not captura.encerrada:
+                    # Stream reconectando: o monitoramento continua e o
+                    # tempo limite segue sendo verificado
+                    continue
+                break
+            inicio_processamento = time.perf_counter()
+
+            if offline:
+                # Progresso pela posição do frame dentro do arquivo
+                with metricas.medir('progresso'):
+                    progress.update(task, completed=captura.indice_frame + 1)
+
+            # Inferência em lote: uma predição para todos os frames lidos,
+            # com os resultados devolvidos na ordem de captura. Frames sem
+            # movimento reutilizam a última detecção. Com o rastreador,
+            # apenas os frames de detecção passam pelo modelo.
+            if rastreador:
+                resultados = inferir_lote_com_rastreamento(
+                    model,
+                    frames,
+                    rastreador,
+                    metricas,
+                    controlador.imgsz if controlador else None,
+                )
+            else:
+                resultados = inferir_lote_com_movimento(
+                    model,
+                    frames,
+                    detector,
+                    ultimo_resultado,
+                    metricas,
+                    controlador=controlador,
+                )
+            ultimo_resultado = resultados[-1]
+            # Melhor pose de cada frame, escolhida de forma vetorizada
+            with metricas.medir('selecao', len(resultados)):
+                selecoes = selecionar_poses(resultados)
+            interrompido = False
+            processados = 0
+            for frame, results in zip(frames, resultados):
+                if annotated_frame_cv2 and renderizador.pronto_para_exibir():
+                    # Adiciona as anotações ao frame
+                    with metricas.medir('anotacao'):
+                        annotated_frame = renderizador.desenhar(frame, results)
+
+                    # Mostra o frame com as anotações na tela e lê a
+                    # tecla pressionada na janela do opencv
+                    with metricas.medir('exibicao'):
+                        key = renderizador.mostrar(annotated_frame)
+                    # Verifica se a tecla q foi pressionada na janela do OpenCV
+                    if key == ord('q'):
+                        console.print(
+                            '\n❌ Monitoramento interrompido'
+                            + ' pela janela do OpenCV.'
+                        )
+                        interrompido = True
+                        break
+
+                # Verifica se há tecla pressionada no terminal
+                if msvcrt and msvcrt.kbhit():
+                    terminal_key = msvcrt.getch().decode().lower()
+                    if terminal_key == 'q':
+                        console.print(
+                            '\n❌ Monitoramento interrompido pelo terminal.'
+                        )
+                        interrompido = True
+                        break
+
+                processados += 1
+
+            # Contabiliza de uma vez os frames processados do lote
+            with metricas.medir('contabilizacao', processados):
+                selecoes = selecoes[:processados]
+                if suavizador:
+                    selecoes = suavizador.suavizar_lote(selecoes)
+                contabilizar_poses(pose_durations, selecoes)
+            alertas = []
+            if motor_alertas:
+                with metricas.medir('alertas', processados):
+                    alertas = motor_alertas.observar_lote(instantes, selecoes)
+            if gravador:
+                with metricas.medir('clipes', processados):
+                    for frame, instante, (pose, _) in zip(
+                        frames, instantes, selecoes
+                    ):
+                        gravador.adicionar(frame, instante, pose)
+                    for alerta in alertas:
+                        gravador.disparar(alerta['instante_s'], alerta['pose'])
+            frame_count += processados
+            if controlador:
+                controlador.registrar(
+                    time.perf_counter() - inicio_processamento, processados
+                )
+
+            if interrompido:
+                break
 
     # Finalização e relatório
-    cap.release()
+    metricas.finalizar()
+    if motor_alertas:
+        motor_alertas.encerrar()
+    if gravador:
+        gravador.encerrar()
+    captura.parar()
+    captura.cap.release()
     cv2.destroyAllWindows()
     end_time = time.time()
-    total_time = end_time - start_time
+    processing_time = end_time - start_time
+    # No modo offline as durações seguem o tempo da mídia processada
+    total_time = captura.duracao_midia() if offline else processing_time
 
     # Criação do relatório em tabela
     table = Table(title='📊 Relatório de Monitoramento de Poses')
@@ -239,13 +543,90 @@ def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
 
     console.print('\n')
     console.print(table)
+    console.print(metricas.tabela())
     console.print(
         '\n⏱️ Tempo total monitorado: [bold]'
         + f'{total_time / 60:.2f}[/] minutos'
     )
     console.print(
-        f'⚡ Tempo de processamento: [bold]{total_time:.2f}[/] segundos'
+        '⚡ Tempo de processamento: [bold]'
+        + f'{processing_time:.2f}[/] segundos'
     )
+    console.print(
+        f'🎞️ Frames descartados: [bold]{captura.frames_descartados}[/]'
+        + f' | atrasados: [bold]{captura.frames_atrasados}[/]'
+        + f' | idade máxima: [bold]{captura.idade_maxima:.2f}[/] s'
+    )
+    if stream:
+        console.print(
+            f'🌐 Reconexões: [bold]{captura.reconexoes}[/]'
+            + f' | falhas: [bold]{captura.falhas_reconexao}[/]'
+            + f' | desconectado: [bold]{captura.tempo_desconectado:.1f}[/] s'
+            + f' | jitter: [bold]{captura.jitter_ms():.1f}[/] ms'
+            + f' | maior intervalo: [bold]{captura.intervalo_maximo_ms():.0f}'
+            + '[/] ms'
+        )
+    if annotated_frame_cv2:
+        console.print(
+            f'🖼️ Frames exibidos: [bold]{renderizador.frames_exibidos}[/]'
+            + f' | não exibidos: [bold]{renderizador.frames_pulados}[/]'
+        )
+    if detector:
+        console.print(
+            '🧊 Inferências economizadas pelo filtro de movimento: [bold]'
+            + f'{detector.inferencias_puladas}[/] de'
+            + f' {detector.frames_avaliados} frames'
+            + f' ({detector.taxa_economia() * 100:.1f}%)'
+        )
+    if rastreador:
+        console.print(
+            f'🛰️ Detecções: [bold]{rastreador.deteccoes}[/]'
+            + f' | frames rastreados: [bold]{rastreador.frames_rastreados}[/]'
+            + f' ({rastreador.taxa_economia() * 100:.1f}%)'
+            + f' | antecipadas: [bold]{rastreador.deteccoes_antecipadas}[/]'
+            + f' | intervalo final: [bold]{rastreador.intervalo}[/]'
+        )
+    if suavizador:
+        console.print(suavizador.tabela())
+    if motor_alertas:
+        console.print(motor_alertas.tabela())
+        p50, p95, maxima = motor_alertas.latencias_ms()
+        console.print(
+            f'🚨 Alertas: [bold]{motor_alertas.emitidos}[/]'
+            + f' | suprimidos: [bold]{motor_alertas.suprimidos}[/]'
+            + f' | descartados: [bold]{motor_alertas.descartados}[/]'
+            + f' | falhas: [bold]{motor_alertas.falhas}[/]'
+            + f' | latência p50/p95/máx: [bold]{p50:.0f}/{p95:.0f}/'
+            + f'{maxima:.0f}[/] ms'
+        )
+    if gravador:
+        estatisticas = gravador.estatisticas()
+        console.print(
+            f'🎬 Clipes: [bold]{estatisticas["clipes"]}[/]'
+            + f' em {os.path.abspath(gravador.diretorio)}'
+            + f' | descartados: [bold]{estatisticas["clipes_descartados"]}[/]'
+            + ' | codificação média: [bold]'
+            + f'{estatisticas["codificacao_media_s"]:.2f}[/] s'
+        )
+        console.print(
+            '🎬 Buffer: [bold]'
+            + f'{estatisticas["memoria_pico_mb"]:.1f}[/] MB no pico'
+            + f' ({estatisticas["frames_no_buffer"]} frames)'
+            + ' | compressão: [bold]'
+            + f'{estatisticas["compressao_ms_por_frame"]:.2f}[/] ms/frame'
+        )
+    if controlador:
+        console.print(controlador.tabela())
+        console.print(
+            f'🎚️ Configuração final: imgsz [bold]{controlador.imgsz}[/]'
+            + f' | passo [bold]{controlador.passo}[/]'
+            + f' | {len(controlador.ajustes)} ajustes'
+        )
+    perfil_path = metricas.salvar_perfil('perfil_monitoramento.prof')
+    if perfil_path:
+        console.print(
+            f'🔬 Perfil do cProfile salvo em: [bold]{perfil_path}[/]'
+        )
 
     return pose_durations
 
@@ -271,22 +652,22 @@ if __name__ == '__main__':
                 console.print('\n👋 Até logo!', style='bold blue')
                 break
 
-            video_path, duration_seconds, weights_path, annotated_frame_cv2 = (
-                get_user_parameters()
-            )
+            parametros = get_user_parameters()
 
             console.print('\n✨ Iniciando monitoramento com as configurações:')
-            console.print(f'📹 Fonte de vídeo: {video_path}')
-            console.print(f'⏱️ Duração: {duration_seconds / 60:.1f} minutos')
-            console.print(f'🎯 Arquivo de pesos: {weights_path}')
+            console.print(f'📹 Fonte de vídeo: {parametros.video_path}')
+            if parametros.offline:
+                console.print('⚡ Modo offline: arquivo completo')
+            else:
+                console.print(
+                    '⏱️ Duração: '
+                    f'{parametros.duration_seconds / 60:.1f} minutos'
+                )
+            console.print(f'🎯 Arquivo de pesos: {parametros.weights_path}')
+            console.print(f'⚙️ Backend: {parametros.backend}')
 
             if Confirm.ask('\n▶️ Confirmar e começar?', default=True):
-                report = run_pose_monitoring(
-                    video_path,
-                    duration_seconds,
-                    weights_path,
-                    annotated_frame_cv2,
-                )
+                report = run_pose_monitoring(**asdict(parametros))
 
             if not Confirm.ask(
                 '\n🔄 Deseja realizar outro monitoramento?', default=True
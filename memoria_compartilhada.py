@@ -0,0 +1,430 @@
+import os
+import queue
+import time
+from multiprocessing import Event, Process, Queue, shared_memory
+
+import cv2
+import numpy as np
+
+from backends import exportar_modelo
+from captura import (
+    CapturaStream,
+    CapturaUltimoFrame,
+    abrir_stream,
+    eh_stream,
+)
+from constants import BACKEND_PADRAO, CLASSES_DETECTADAS, POSE_NAO_DETECTADA
+from deteccao import contabilizar_poses, dados_deteccoes, selecionar_poses
+from inferencia import inferir_lote
+from linha_tempo import LinhaTempoPoses
+from modelos import carregar_modelo
+
+# Frames que cada processo de inferência junta em um lote, quando já há
+# tarefas na fila
+TAMANHO_LOTE_TRABALHADOR = 4
+# Slots extras do anel além dos que os processos de inferência podem estar
+# usando: a captura escreve no próximo enquanto os demais são inferidos
+SLOTS_EXTRAS = 2
+ESPERA_FILA = 0.5  # segundos
+
+
+class AnelFrames:
+    """
+    Anel de slots de frames pré-alocados em multiprocessing.shared_memory.
+
+    O processo de captura cria o anel uma vez e escreve cada frame
+    decodificado em um slot livre; os processos de inferência anexam a
+    mesma memória e leem o slot como um array do NumPy, sem cópia e sem
+    passar o frame por uma fila. Quais slots estão livres é controlado
+    fora daqui, por uma fila de índices.
+    """
+
+    def __init__(self, slots, formato, nome=None):
+        self.slots = slots
+        self.formato = tuple(formato)
+        self._criador = nome is None
+        if self._criador:
+            self._memoria = shared_memory.SharedMemory(
+                create=True, size=slots * int(np.prod(self.formato))
+            )
+        else:
+            self._memoria = shared_memory.SharedMemory(name=nome)
+        self.frames = np.ndarray(
+            (slots, *self.formato), dtype=np.uint8, buffer=self._memoria.buf
+        )
+
+    @property
+    def nome(self):
+        return self._memoria.name
+
+    def descritor(self):
+        """
+        (nome, slots, formato): o necessário para anexar o anel em outro
+        processo com AnelFrames(slots, formato, nome).
+        """
+        return self.nome, self.slots, self.formato
+
+    def escrever(self, slot, frame):
+        destino = self.frames[slot]
+        if frame.shape == destino.shape:
+            np.copyto(destino, frame)
+        else:
+            # Alguns backends mudam a resolução depois de abrir a fonte
+            altura, largura = destino.shape[:2]
+            cv2.resize(frame, (largura, altura), dst=destino)
+
+    def fechar(self):
+        # A view precisa ser liberada antes de fechar o buffer
+        self.frames = None
+        self._memoria.close()
+        if self._criador:
+            self._memoria.unlink()
+
+
+def _abrir_fonte(fonte):
+    if fonte == '0':
+        return cv2.VideoCapture(0)
+    if eh_stream(fonte):
+        return abrir_stream(fonte)
+    return cv2.VideoCapture(fonte)
+
+
+def _formato_fonte(fonte):
+    """
+    Lê um frame da fonte para descobrir o formato (altura, largura, canais)
+    dos slots do anel.
+    """
+    cap = _abrir_fonte(fonte)
+    ret, frame = cap.read()
+    cap.release()
+    if not ret:
+        raise RuntimeError(f'Não foi possível ler um frame de {fonte!r}')
+    return frame.shape
+
+
+def _obter_slot(livres, ao_vivo, parar):
+    """
+    Retorna um slot livre do anel, ou None se não houver: fontes ao vivo
+    não esperam, arquivos esperam até haver slot ou o sinal de parada.
+    """
+    espera = 0 if ao_vivo else ESPERA_FILA
+    while not parar.is_set():
+        try:
+            return livres.get(timeout=espera)
+        except queue.Empty:
+            if ao_vivo:
+                return None
+    return None
+
+
+def _processo_captura(  # noqa: PLR0913, PLR0917
+    indice_fonte, fonte, descritor, livres, tarefas, resultados, parar
+):
+    """
+    Lê a fonte e escreve cada frame em um slot livre do anel, publicando
+    (fonte, sequência, slot, instante) na fila de tarefas. Fontes ao vivo
+    descartam o frame quando não há slot livre; arquivos aguardam.
+    """
+    ao_vivo = fonte == '0' or eh_stream(fonte)
+    nome, slots, formato = descritor
+    anel = AnelFrames(slots, formato, nome=nome)
+    sequencia = 0
+    descartados = 0
+    fps = 0.0
+    try:
+        if eh_stream(fonte):
+            captura = CapturaStream(fonte)
+        else:
+            captura = CapturaUltimoFrame(
+                _abrir_fonte(fonte), descartar_frames=ao_vivo
+            )
+        fps = captura.fps
+        with captura:
+            while not parar.is_set():
+                ret, frame = captura.ler(ESPERA_FILA)
+                if not ret:
+                    if captura.encerrada:
+                        break
+                    continue
+                instante = (
+                    captura.instante_captura
+                    if ao_vivo
+                    else captura.timestamp_ms / 1000
+                )
+
+                slot = _obter_slot(livres, ao_vivo, parar)
+                if slot is None:
+                    descartados += 1
+                    continue
+
+                anel.escrever(slot, frame)
+                tarefas.put((indice_fonte, sequencia, slot, instante))
+                sequencia += 1
+        captura.cap.release()
+    finally:
+        anel.fechar()
+        resultados.put(('fim', indice_fonte, sequencia, descartados, fps))
+
+
+def _processo_inferencia(  # noqa: PLR0913, PLR0917
+    caminho_modelo,
+    descritores,
+    livres,
+    tarefas,
+    resultados,
+    threads,
+    tamanho_lote,
+):
+    """
+    Infere os slots indicados na fila de tarefas, juntando em lote as
+    tarefas já disponíveis, devolve cada slot à fila de livres e envia as
+    detecções (arrays (N, 6), pequenos) de volta ao processo principal.
+    caminho_modelo são os pesos ou o modelo já exportado para o backend.
+    """
+    import torch  # noqa: PLC0415
+
+    # O principal só envia o sinal de fim depois de receber todos os
+    # resultados; sem esperar as filas ao sair, um erro no principal não
+    # deixa o processo preso no join
+    for fila in [*livres, resultados]:
+        fila.cancel_join_thread()
+
+    torch.set_num_threads(threads)
+    cv2.setNumThreads(1)
+
+    # O processo principal já exportou o modelo: o arquivo é carregado
+    # como está, sem nova exportação
+    model = carregar_modelo(caminho_modelo, backend='pytorch')
+    aneis = [
+        AnelFrames(slots, formato, nome=nome)
+        for nome, slots, formato in descritores
+    ]
+    encerrar = False
+    try:
+        while not encerrar:
+            tarefa = tarefas.get()
+            if tarefa is None:
+                break
+            lote = [tarefa]
+            while len(lote) < tamanho_lote:
+                try:
+                    proxima = tarefas.get_nowait()
+                except queue.Empty:
+                    break
+                if proxima is None:
+                    encerrar = True
+                    break
+                lote.append(proxima)
+
+            imagens = [aneis[f].frames[slot] for f, _, slot, _ in lote]
+            deteccoes = [
+                dados_deteccoes(r) for r in inferir_lote(model, imagens)
+            ]
+            for (fonte, sequencia, slot, instante), dados in zip(
+                lote, deteccoes
+            ):
+                livres[fonte].put(slot)
+                resultados.put((
+                    'resultado',
+                    fonte,
+                    sequencia,
+                    instante,
+                    dados,
+                ))
+    finally:
+        for anel in aneis:
+            anel.fechar()
+
+
+class _EstadoFonte:
+    """
+    Reordena os resultados de uma fonte pela sequência e acumula as poses.
+    """
+
+    def __init__(self):
+        self.pose_durations = dict.fromkeys(CLASSES_DETECTADAS.values(), 0)
+        self.pose_durations[POSE_NAO_DETECTADA] = 0
+        self.linha_tempo = LinhaTempoPoses()
+        self.pendentes = {}
+        self.proximo = 0
+        self.total = None
+        self.descartados = 0
+        self.fps = 0.0
+
+    @property
+    def concluido(self):
+        return self.total is not None and self.proximo >= self.total
+
+    def receber(self, sequencia, instante, dados):
+        """
+        Guarda o resultado e acumula todos os que já estão em ordem.
+        Retorna a lista de (instante, pose, confiança) acumulados.
+        """
+        self.pendentes[sequencia] = (instante, dados)
+        prontos = []
+        while self.proximo in self.pendentes:
+            prontos.append(self.pendentes.pop(self.proximo))
+            self.proximo += 1
+        if not prontos:
+            return []
+
+        instantes = [instante for instante, _ in prontos]
+        selecoes = selecionar_poses([dados for _, dados in prontos])
+        contabilizar_poses(self.pose_durations, selecoes)
+        self.linha_tempo.registrar_lote(instantes, selecoes)
+        return [
+            (instante, pose, confianca)
+            for instante, (pose, confianca) in zip(instantes, selecoes)
+        ]
+
+
+def _verificar_processos(processos):
+    falhos = [p.name for p in processos if p.exitcode not in {None, 0}]
+    if falhos:
+        raise RuntimeError(
+            'Processos encerrados com erro: ' + ', '.join(falhos)
+        )
+
+
+def _receber_resultados(  # noqa: PLR0913, PLR0917
+    estados, resultados, processos, parar, duracao, ao_processar
+):
+    """
+    Recebe as mensagens dos processos até todas as fontes concluírem,
+    repassando a cada estado os resultados e o fim da sua fonte.
+    """
+    inicio = time.monotonic()
+    while not all(estado.concluido for estado in estados):
+        if duracao is not None and time.monotonic() - inicio >= duracao:
+            parar.set()
+        try:
+            mensagem = resultados.get(timeout=ESPERA_FILA)
+        except queue.Empty:
+            _verificar_processos(processos)
+            continue
+
+        if mensagem[0] == 'fim':
+            _, indice, total, descartados, fps = mensagem
+            estados[indice].total = total
+            estados[indice].descartados = descartados
+            estados[indice].fps = fps
+            continue
+
+        _, indice, sequencia, instante, dados = mensagem
+        prontos = estados[indice].receber(sequencia, instante, dados)
+        if ao_processar is not None:
+            for instante_frame, pose, confianca in prontos:
+                ao_processar(indice, instante_frame, pose, confianca)
+
+
+def processar_fontes_compartilhadas(  # noqa: PLR0913, PLR0914, PLR0917
+    fontes,
+    weights_path,
+    trabalhadores=None,
+    backend=BACKEND_PADRAO,
+    duracao=None,
+    tamanho_lote=TAMANHO_LOTE_TRABALHADOR,
+    ao_processar=None,
+):
+    """
+    Monitora uma ou mais fontes (webcam '0', URL de stream ou arquivo) com
+    um processo de captura por fonte e trabalhadores processos de
+    inferência, cada um com o próprio modelo.
+
+    Os frames passam da captura para a inferência por um AnelFrames por
+    fonte; pelas filas circulam apenas índices de slot e as detecções. Os
+    resultados são reordenados pela sequência de cada fonte antes de serem
+    contados. duracao (s) limita fontes ao vivo; arquivos terminam no fim.
+    ao_processar(indice_fonte, instante, pose, confianca) é chamada para
+    cada frame já em ordem.
+
+    Retorna, por fonte, um dicionário com pose_durations, linha_tempo,
+    frames e descartados (frames ao vivo sem slot livre).
+    """
+    trabalhadores = trabalhadores or max(
+        (os.cpu_count() or 1) - len(fontes), 1
+    )
+    threads = max((os.cpu_count() or 1) // trabalhadores, 1)
+    slots = trabalhadores * tamanho_lote + SLOTS_EXTRAS
+
+    formatos = [_formato_fonte(fonte) for fonte in fontes]
+    # Exporta uma única vez antes de criar os processos, para que eles não
+    # gravem o mesmo artefato ONNX/OpenVINO ao mesmo tempo
+    caminho_modelo = exportar_modelo(weights_path, backend)
+    aneis = [AnelFrames(slots, formato) for formato in formatos]
+    livres = [Queue() for _ in fontes]
+    for fila in livres:
+        for slot in range(slots):
+            fila.put(slot)
+    tarefas = Queue()
+    resultados = Queue()
+    parar = Event()
+
+    processos_inferencia = [
+        Process(
+            target=_processo_inferencia,
+            args=(
+                caminho_modelo,
+                [anel.descritor() for anel in aneis],
+                livres,
+                tarefas,
+                resultados,
+                threads,
+                tamanho_lote,
+            ),
+            name=f'inferencia-{i}',
+        )
+        for i in range(trabalhadores)
+    ]
+    processos_captura = [
+        Process(
+            target=_processo_captura,
+            args=(
+                i,
+                fonte,
+                anel.descritor(),
+                livres[i],
+                tarefas,
+                resultados,
+                parar,
+            ),
+            name=f'captura-{i}',
+        )
+        for i, (fonte, anel) in enumerate(zip(fontes, aneis))
+    ]
+    estados = [_EstadoFonte() for _ in fontes]
+
+    try:
+        for processo in processos_inferencia + processos_captura:
+            processo.start()
+
+        _receber_resultados(
+            estados,
+            resultados,
+            processos_inferencia + processos_captura,
+            parar,
+            duracao,
+            ao_processar,
+        )
+    finally:
+        parar.set()
+        for processo in processos_captura:
+            processo.join()
+        for _ in processos_inferencia:
+            tarefas.put(None)
+        for processo in processos_inferencia:
+            processo.join()
+        for anel in aneis:
+            anel.fechar()
+
+    relatorios = []
+    for estado in estados:
+        duracao_frame = 1 / estado.fps if estado.fps > 0 else 0.0
+        estado.linha_tempo.finalizar(duracao_frame)
+        relatorios.append({
+            'pose_durations': estado.pose_durations,
+            'linha_tempo': estado.linha_tempo,
+            'frames': estado.proximo,
+            'descartados': estado.descartados,
+        })
+    return relatorios
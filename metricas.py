@@ -0,0 +1,145 @@
+import cProfile
+import csv
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+from rich.table import Table
+
+# Quantidade de medições recentes mantidas por etapa para os percentis
+JANELA_METRICAS = 2000
+
+
+class MetricasEtapas:
+    """
+    Mede a latência de cada etapa do loop de monitoramento.
+
+    Cada etapa guarda as latências por item das últimas JANELA_METRICAS
+    medições (uma medição de um lote de N frames vale duração/N), de onde
+    saem p50/p95/p99, além de contadores de itens e tempo total para a
+    vazão. O gancho opcional recebe (etapa, duracao_s, itens) a cada
+    medição; perfilar=True liga o cProfile durante o monitoramento.
+    """
+
+    def __init__(self, janela=JANELA_METRICAS, gancho=None, perfilar=False):
+        self.janela = janela
+        self.gancho = gancho
+        self._latencias = {}
+        self._itens = {}
+        self._tempo_total = {}
+        self._inicio = time.perf_counter()
+        self._fim = None
+        self._perfil = cProfile.Profile() if perfilar else None
+        if self._perfil is not None:
+            self._perfil.enable()
+
+    @contextmanager
+    def medir(self, etapa, itens=1):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(etapa, time.perf_counter() - inicio, itens)
+
+    def registrar(self, etapa, duracao, itens=1):
+        if itens <= 0:
+            return
+        if etapa not in self._latencias:
+            self._latencias[etapa] = deque(maxlen=self.janela)
+            self._itens[etapa] = 0
+            self._tempo_total[etapa] = 0.0
+        self._latencias[etapa].append(duracao / itens)
+        self._itens[etapa] += itens
+        self._tempo_total[etapa] += duracao
+        if self.gancho is not None:
+            self.gancho(etapa, duracao, itens)
+
+    def finalizar(self):
+        """
+        Encerra a medição do tempo total e o cProfile, se ativo.
+        """
+        self._fim = time.perf_counter()
+        if self._perfil is not None:
+            self._perfil.disable()
+
+    def resumo(self):
+        """
+        Lista de dicionários por etapa com amostras, p50/p95/p99 (ms),
+        tempo total (s), fração do tempo de parede e vazão (itens/s).
+        """
+        fim = self._fim or time.perf_counter()
+        parede = max(fim - self._inicio, 1e-9)
+        linhas = []
+        for etapa, latencias in self._latencias.items():
+            p50, p95, p99 = np.percentile(
+                np.fromiter(latencias, dtype=np.float64), (50, 95, 99)
+            )
+            linhas.append({
+                'etapa': etapa,
+                'itens': self._itens[etapa],
+                'p50_ms': p50 * 1000,
+                'p95_ms': p95 * 1000,
+                'p99_ms': p99 * 1000,
+                'total_s': self._tempo_total[etapa],
+                'fracao_tempo': self._tempo_total[etapa] / parede,
+                'vazao_itens_s': self._itens[etapa]
+                / max(self._tempo_total[etapa], 1e-9),
+            })
+        return linhas
+
+    def tabela(self, titulo='⏱️ Latência por etapa'):
+        table = Table(title=titulo)
+        table.add_column('Etapa', style='cyan')
+        table.add_column('Itens', justify='right')
+        table.add_column('p50 (ms)', justify='right')
+        table.add_column('p95 (ms)', justify='right')
+        table.add_column('p99 (ms)', justify='right')
+        table.add_column('Total (s)', justify='right')
+        table.add_column('% do tempo', justify='right')
+        table.add_column('Vazão (itens/s)', justify='right')
+        for linha in self.resumo():
+            table.add_row(
+                linha['etapa'],
+                str(linha['itens']),
+                f'{linha["p50_ms"]:.1f}',
+                f'{linha["p95_ms"]:.1f}',
+                f'{linha["p99_ms"]:.1f}',
+                f'{linha["total_s"]:.2f}',
+                f'{linha["fracao_tempo"] * 100:.1f}%',
+                f'{linha["vazao_itens_s"]:.1f}',
+            )
+        return table
+
+    def salvar_csv(self, caminho_csv):
+        campos = [
+            'etapa',
+            'itens',
+            'p50_ms',
+            'p95_ms',
+            'p99_ms',
+            'total_s',
+            'fracao_tempo',
+            'vazao_itens_s',
+        ]
+        with open(caminho_csv, mode='w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=campos, delimiter=';')
+            writer.writeheader()
+            for linha in self.resumo():
+                writer.writerow({
+                    chave: (
+                        f'{valor:.4f}' if isinstance(valor, float) else valor
+                    )
+                    for chave, valor in linha.items()
+                })
+        return caminho_csv
+
+    def salvar_perfil(self, caminho):
+        """
+        Salva as estatísticas do cProfile (abrir com pstats ou snakeviz).
+        Retorna None quando o perfilamento não foi ativado.
+        """
+        if self._perfil is None:
+            return None
+        self._perfil.dump_stats(caminho)
+        return caminho
@@ -0,0 +1,72 @@
+import os
+import threading
+
+import numpy as np
+from ultralytics import YOLO
+
+from backends import exportar_modelo
+from constants import BACKEND_PADRAO
+
+# Tamanho (altura, largura) do frame usado para aquecer o modelo
+TAMANHO_AQUECIMENTO = (480, 640)
+
+# Cache de modelos: (caminho absoluto, backend) -> (mtime, modelo)
+_modelos = {}
+_lock = threading.Lock()
+
+
+def _mtime(caminho):
+    try:
+        return os.path.getmtime(caminho)
+    except OSError:
+        # Ex.: nomes como 'yolo11n.pt', baixados pelo ultralytics
+        return None
+
+
+def aquecer_modelo(model, tamanho=TAMANHO_AQUECIMENTO):
+    """
+    Executa uma inferência em um frame vazio para que os custos da primeira
+    predição (alocação, inicialização do backend) não caiam no monitoramento.
+    """
+    altura, largura = tamanho
+    model(np.zeros((altura, largura, 3), dtype=np.uint8), verbose=False)
+
+
+def carregar_modelo(weights_path, aquecer=True, backend=BACKEND_PADRAO):
+    """
+    Retorna o modelo YOLO do arquivo de pesos, carregando-o apenas na
+    primeira chamada. Chamadas seguintes reutilizam o mesmo modelo já
+    aquecido; só uma alteração no arquivo (mtime) provoca nova carga.
+    Com backend 'onnx' ou 'openvino' carrega o modelo exportado (exportando
+    na primeira vez); a interface e os resultados são os mesmos. Sem o
+    pacote do backend instalado (extras 'onnx'/'openvino' do pyproject),
+    falha com ModuleNotFoundError indicando como instalá-lo.
+    """
+    caminho = os.path.abspath(weights_path)
+    chave = (caminho, backend)
+    mtime = _mtime(caminho)
+
+    with _lock:
+        entrada = _modelos.get(chave)
+        if entrada is not None and entrada[0] == mtime:
+            return entrada[1]
+
+        model = YOLO(exportar_modelo(weights_path, backend))
+        if aquecer:
+            aquecer_modelo(model)
+        _modelos[chave] = (mtime, model)
+        return model
+
+
+def modelo_em_cache(weights_path, backend=BACKEND_PADRAO):
+    """
+    Indica se o modelo do arquivo de pesos já está carregado e atualizado.
+    """
+    caminho = os.path.abspath(weights_path)
+    entrada = _modelos.get((caminho, backend))
+    return entrada is not None and entrada[0] == _mtime(caminho)
+
+
+def limpar_cache():
+    with _lock:
+        _modelos.clear()
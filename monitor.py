@@ -1,23 +1,65 @@
 import os
 import sys
 import time
-import csv
+import multiprocessing
+from dataclasses import asdict, dataclass
 
 import cv2
+import numpy as np
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress
 from rich.prompt import Confirm, Prompt
 from rich.table import Table
-from ultralytics import YOLO
 
+from alertas import MotorAlertas, SaidaCallback, criar_saida
+from cache_inferencia import CacheInferencia, hash_arquivo
+from captura import CapturaStream, CapturaUltimoFrame, eh_stream
+from clipes import GravadorClipes
 from constants import (
+    ARQUIVO_ALERTAS,
     ARQUIVO_PESOS,
     ARQUIVO_VIDEO_PADRAO,
+    BACKEND_PADRAO,
+    BACKENDS_INFERENCIA,
     CLASSES_DETECTADAS,
     DURACAO_PADRAO,
+    ESPERA_FRAME_STREAM,
+    FPS_ALVO_PADRAO,
+    GATILHO_CLIPE_PADRAO,
+    GATILHOS_CLIPE,
+    EXTENSOES_IMAGEM,
+    METODOS_SUAVIZACAO,
+    PASSO_MAXIMO_FRAMES,
     POSE_NAO_DETECTADA,
+    SUAVIZACAO_PADRAO,
+    TAMANHO_LOTE_PADRAO,
+    TAMANHOS_ENTRADA,
 )
+from controle_latencia import ControladorLatencia
+from deteccao import contabilizar_poses, selecionar_pose, selecionar_poses
+from inferencia import (
+    ajustar_tamanho_lote,
+    inferir_lote,
+    inferir_lote_com_cache,
+    inferir_lote_com_movimento,
+    inferir_lote_com_rastreamento,
+    iterar_lotes_imagens_paralelo,
+    ler_lote,
+    resolver_imagens,
+    resolver_tamanho_lote,
+)
+from linha_tempo import LinhaTempoPoses
+from memoria_compartilhada import processar_fontes_compartilhadas
+from metricas import MetricasEtapas
+from modelos import carregar_modelo
+from movimento import DetectorMovimento
+from multicamera import interpretar_cameras, monitorar_cameras, relatar_cameras
+from particoes import TAMANHO_LOTE_PARTICAO, processar_video_particionado
+from rastreamento import RastreadorPoses
+from relatorios import salvar_csv_relatorio
+from renderizacao import RenderizadorAnotacoes
+from suavizacao import SuavizadorPoses
 
 # Tentativa de importar o módulo msvcrt
 try:
@@ -44,102 +86,433 @@ def initialize_app():
 console = Console()
 
 
+@dataclass
+class ParametrosMonitoramento:
+    """
+    Configuração escolhida pelo usuário. cameras e processos decidem o
+    modo de execução; os demais campos têm os nomes dos parâmetros de
+    run_pose_monitoring.
+    """
+
+    midia_path: str = '0'
+    duration_seconds: float = DURACAO_PADRAO
+    weights_path: str = ARQUIVO_PESOS
+    annotated_frame_cv2: bool = True
+    output_dir: str = os.path.join('.', 'relatorios')
+    offline: bool = False
+    tamanho_lote: str = TAMANHO_LOTE_PADRAO
+    filtro_movimento: bool = False
+    backend: str = BACKEND_PADRAO
+    processos: int = 1
+    rastreamento: bool = False
+    fps_alvo: float = FPS_ALVO_PADRAO
+    suavizacao: str = SUAVIZACAO_PADRAO
+    destino_alertas: str | None = None
+    gatilho_clipes: str = GATILHO_CLIPE_PADRAO
+    usar_cache: bool = False
+    cameras: list[tuple[str, str]] | None = None
+
+
+def _perguntar_midia(video_source):
+    if video_source == 'webcam':
+        return '0'
+    if video_source == 'video':
+        return Prompt.ask(
+            '🎥 Digite o caminho do arquivo de vídeo',
+            default=ARQUIVO_VIDEO_PADRAO,
+        )
+    if video_source == 'stream':
+        return Prompt.ask('🌐 Digite a URL da câmera IP (rtsp://, http://...)')
+    if video_source == 'diretorio':
+        return Prompt.ask(
+            '🗂️ Digite o diretório ou padrão glob das imagens'
+            ' (ex.: fotos/**/*.jpg)'
+        )
+    return Prompt.ask('🖼️ Digite o caminho da imagem (jpg, png, etc.)')
+
+
+def _perguntar_cameras():
+    pares = Prompt.ask(
+        '📷 Digite as câmeras como nome=fonte separados por espaço'
+        ' (ex.: sala=rtsp://... quarto=0)'
+    )
+    return interpretar_cameras(pares.split())
+
+
+def _perguntar_tempo_real(parametros):
+    """
+    Opções do monitoramento sequencial de webcam, stream ou vídeo.
+    """
+    # FPS alvo do controle de latência
+    parametros.fps_alvo = float(
+        Prompt.ask(
+            '\n🎚️ FPS alvo (0 = sem controle de latência)',
+            default=str(FPS_ALVO_PADRAO),
+        )
+    )
+
+    # Suavização temporal da pose de cada frame
+    parametros.suavizacao = Prompt.ask(
+        '\n🪄 Suavização temporal das poses',
+        choices=list(METODOS_SUAVIZACAO),
+        default=SUAVIZACAO_PADRAO,
+    )
+
+    # Alertas em tempo real para poses de risco (webhook ou arquivo)
+    if Confirm.ask('\n🚨 Emitir alertas de pessoa deitada?', default=False):
+        parametros.destino_alertas = Prompt.ask(
+            '🚨 Destino dos alertas (URL do webhook ou arquivo .jsonl)',
+            default=ARQUIVO_ALERTAS,
+        )
+
+    # Clipes com os segundos antes e depois de um alerta ou transição
+    parametros.gatilho_clipes = Prompt.ask(
+        '\n🎬 Gravar clipes de vídeo ao redor de',
+        choices=list(GATILHOS_CLIPE),
+        default=GATILHO_CLIPE_PADRAO,
+    )
+
+
 def get_user_parameters():
     console.print(
         Panel('🎮 Configuração do Monitoramento', style='bold green')
     )
+    parametros = ParametrosMonitoramento()
 
     # Seleção da fonte
     video_source = Prompt.ask(
         '\n📹 Escolha a fonte',
-        choices=['webcam', 'video', 'imagem'],
+        choices=[
+            'webcam',
+            'video',
+            'stream',
+            'imagem',
+            'diretorio',
+            'cameras',
+        ],
         default='webcam',
     )
+    if video_source == 'cameras':
+        parametros.cameras = _perguntar_cameras()
+    else:
+        parametros.midia_path = _perguntar_midia(video_source)
+
+    # Modo offline: processa o vídeo inteiro o mais rápido possível
+    parametros.offline = video_source == 'video' and Confirm.ask(
+        '\n⚡ Processar o vídeo inteiro o mais rápido possível (offline)?',
+        default=False,
+    )
 
-    if video_source == 'webcam':
-        midia_path = '0'
-    elif video_source == 'video':
-        midia_path = Prompt.ask(
-            '🎥 Digite o caminho do arquivo de vídeo',
-            default=ARQUIVO_VIDEO_PADRAO,
+    # Processos em paralelo no modo offline (partes do vídeo) ou, ao vivo,
+    # processos de inferência lendo os frames da memória compartilhada
+    if parametros.offline:
+        parametros.processos = int(
+            Prompt.ask(
+                '\n🧩 Processos em paralelo (1 = sequencial)',
+                default=str(os.cpu_count() or 1),
+            )
+        )
+    elif video_source in {'webcam', 'stream'}:
+        parametros.processos = int(
+            Prompt.ask(
+                '\n🧩 Processos de inferência (1 = no processo principal)',
+                default='1',
+            )
         )
-    else:  # imagem
-        midia_path = Prompt.ask('🖼️ Digite o caminho da imagem (jpg, png, etc.)')
 
-    # Seleção da duração (apenas para webcam/vídeo)
-    duration_seconds = DURACAO_PADRAO
-    if video_source in ('webcam', 'video'):
+    # Tamanho do lote de inferência (vídeo e diretório de imagens)
+    if video_source in {'video', 'diretorio'}:
+        parametros.tamanho_lote = Prompt.ask(
+            '\n📦 Tamanho do lote de inferência (auto = ajuste automático)',
+            default=TAMANHO_LOTE_PADRAO,
+        )
+
+    # Seleção da duração (webcam/stream/vídeo em tempo real e câmeras)
+    tempo_real = video_source in {'webcam', 'video', 'stream'}
+    if (tempo_real and not parametros.offline) or parametros.cameras:
         duration_str = Prompt.ask(
             '\n⏱️ Digite a duração desejada em minutos', default='5'
         )
-        duration_seconds = float(duration_str) * 60
+        parametros.duration_seconds = float(duration_str) * 60
 
     # Seleção do arquivo de pesos
     use_default_weights = Confirm.ask(
         '\n🎯 Usar arquivo de pesos padrão?', default=True
     )
-    weights_path = (
-        ARQUIVO_PESOS
-        if use_default_weights
-        else Prompt.ask('Digite o caminho para o arquivo de pesos personalizado')
+    if not use_default_weights:
+        parametros.weights_path = Prompt.ask(
+            'Digite o caminho para o arquivo de pesos personalizado'
+        )
+
+    # Backend de inferência (modelos exportados são gerados na 1ª vez)
+    parametros.backend = Prompt.ask(
+        '\n⚙️ Backend de inferência',
+        choices=list(BACKENDS_INFERENCIA),
+        default=BACKEND_PADRAO,
+    )
+
+    # Detecção a cada N frames com rastreamento entre elas e filtro de
+    # movimento (apenas webcam/stream/vídeo, sem partes em paralelo)
+    sequencial = tempo_real and parametros.processos <= 1
+    parametros.rastreamento = sequencial and Confirm.ask(
+        '\n🛰️ Detectar a cada N frames e rastrear entre as detecções?',
+        default=False,
+    )
+    parametros.filtro_movimento = (
+        sequencial
+        and not parametros.rastreamento
+        and Confirm.ask(
+            '\n🧊 Pular a inferência em frames sem movimento?', default=True
+        )
+    )
+
+    if sequencial:
+        _perguntar_tempo_real(parametros)
+
+    # Cache das detecções em disco (vídeo, imagem e diretório): frames já
+    # inferidos com os mesmos pesos não passam de novo pelo modelo. Não
+    # combina com rastreamento, filtro de movimento e controle de latência,
+    # que não inferem todos os frames
+    parametros.usar_cache = (
+        video_source in {'video', 'imagem', 'diretorio'}
+        and parametros.processos <= 1
+        and not (
+            parametros.rastreamento
+            or parametros.filtro_movimento
+            or parametros.fps_alvo > 0
+        )
+        and Confirm.ask(
+            '\n🗃️ Reutilizar as detecções em cache de execuções anteriores?',
+            default=True,
+        )
     )
 
     # Visualização
-    annotated_frame_cv2 = Confirm.ask(
+    parametros.annotated_frame_cv2 = Confirm.ask(
         '\n🖼️ Visualizar frames com anotações?', default=True
     )
 
     # Diretório de saída para CSV
-    output_dir = Prompt.ask(
+    parametros.output_dir = Prompt.ask(
         '\n📁 Diretório para salvar o CSV',
-        default=os.path.join('.', 'relatorios'),
+        default=parametros.output_dir,
     )
 
-    return midia_path, duration_seconds, weights_path, annotated_frame_cv2, output_dir
+    return parametros
 
 
 def eh_imagem(caminho: str) -> bool:
     ext = os.path.splitext(caminho)[1].lower()
-    return ext in ('.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tif', '.tiff')
+    return ext in EXTENSOES_IMAGEM
 
 
-def salvar_csv_relatorio(pose_durations, total_time, csv_dir, origem='midia'):
+def eh_lote_imagens(caminho: str) -> bool:
     """
-    Salva a tabela final como CSV no diretório informado.
-    Colunas: pose, duracao_min, porcentagem
+    Indica se o caminho é um diretório ou um padrão glob de imagens.
     """
-    os.makedirs(csv_dir, exist_ok=True)
-    total_frames = sum(pose_durations.values())
+    if eh_stream(caminho):
+        # URLs podem ter '?' na query string
+        return False
+    if os.path.isdir(caminho):
+        return True
+    return not os.path.isfile(caminho) and any(c in caminho for c in '*?[')
 
-    # evita divisão por zero
-    if total_frames == 0:
-        total_frames = 1
 
-    linhas = []
-    for pose, frames in pose_durations.items():
-        duracao_min = (frames / total_frames) * (total_time / 60) if total_time > 0 else 0.0
-        porcentagem = (frames / total_frames) * 100
-        linhas.append([pose, f'{duracao_min:.2f}', f'{porcentagem:.1f}%'])
+def resumir_cache(cache):
+    """
+    Exibe o aproveitamento do cache de inferência e fecha o arquivo.
+    """
+    console.print(
+        f'🗃️ Cache: [bold]{cache.acertos}[/] acertos,'
+        + f' [bold]{cache.faltas}[/] inferidos'
+        + f' ({cache.taxa_acerto() * 100:.1f}%)'
+        + f' | {cache.tamanho_mb:.1f} MB em disco'
+        + f' | removidas: [bold]{cache.removidas}[/]'
+    )
+    cache.fechar()
 
-    timestamp = time.strftime('%Y%m%d_%H%M%S')
-    nome_arquivo = f'relatorio_poses_{origem}_{timestamp}.csv'
-    caminho_csv = os.path.join(csv_dir, nome_arquivo)
 
-    with open(caminho_csv, mode='w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f, delimiter=';')
-        writer.writerow(['pose', 'duracao_min', 'porcentagem'])
-        writer.writerows(linhas)
+def monitorar_imagens_em_lote(  # noqa: PLR0913, PLR0914, PLR0915, PLR0917
+    model,
+    padrao,
+    annotated_frame_cv2=False,
+    output_dir='./relatorios',
+    tamanho_lote=TAMANHO_LOTE_PADRAO,
+    cache=None,
+    imgsz=None,
+):
+    """
+    Processa todas as imagens de um diretório ou padrão glob sem interação:
+    decodificação em um pool de threads, inferência em lotes e um CSV
+    agregado mais um CSV com a pose de cada imagem.
+    Com cache (CacheInferencia), imagens já inferidas com os mesmos pesos
+    são lidas do cache, pelo hash do arquivo, em vez de inferidas; imgsz
+    é o tamanho de entrada usado na chave do cache.
+    """
+    caminhos = resolver_imagens(padrao)
+    if not caminhos:
+        console.print(
+            f'[bold red]❌ Nenhuma imagem encontrada em "{padrao}".[/]'
+        )
+        return
 
-    return caminho_csv
+    if str(tamanho_lote).strip().lower() == 'auto':
+        amostra = cv2.imread(caminhos[0])
+        if amostra is None:
+            amostra = np.zeros((480, 640, 3), dtype=np.uint8)
+        with console.status('[bold green]Ajustando o tamanho do lote...'):
+            tamanho_lote = ajustar_tamanho_lote(model, amostra)
+    tamanho_lote = max(int(tamanho_lote), 1)
 
+    console.print('\n📊 Configurações:')
+    console.print('- Modo: diretório de imagens')
+    console.print(f'- Origem: {padrao} ({len(caminhos)} imagens)')
+    console.print(f'- Tamanho do lote de inferência: {tamanho_lote}')
+
+    start_time = time.time()
+    pose_durations = dict.fromkeys(CLASSES_DETECTADAS.values(), 0)
+    pose_durations[POSE_NAO_DETECTADA] = 0
+    # Imagens não têm tempo: todas no instante 0, e as porcentagens do
+    # relatório saem da contagem de imagens
+    linha_tempo = LinhaTempoPoses()
+    poses_por_imagem = []
+    renderizador = RenderizadorAnotacoes(
+        'Sistema de Monitoramento de Poses - Imagens'
+    )
+
+    with Progress(console=console) as progress:
+        task = progress.add_task(
+            '[cyan]Processando imagens...[/cyan]', total=len(caminhos)
+        )
+        for lote_caminhos, imagens in iterar_lotes_imagens_paralelo(
+            caminhos, tamanho_lote
+        ):
+            if cache:
+                chaves = [cache.chave(hash_arquivo(c)) for c in lote_caminhos]
+                resultados = inferir_lote_com_cache(
+                    model, imagens, chaves, cache, imgsz=imgsz
+                )
+            else:
+                resultados = inferir_lote(model, imagens)
+            selecoes = selecionar_poses(resultados)
+            contabilizar_poses(pose_durations, selecoes)
+            linha_tempo.registrar_lote([0.0] * len(selecoes), selecoes)
+            poses_por_imagem.extend(
+                (caminho, pose, confianca)
+                for caminho, (pose, confianca) in zip(lote_caminhos, selecoes)
+            )
+            progress.update(task, advance=len(imagens))
+
+            if annotated_frame_cv2 and renderizador.pronto_para_exibir():
+                annotated_frame = renderizador.desenhar(
+                    imagens[-1], resultados[-1]
+                )
+                if renderizador.mostrar(annotated_frame) == ord('q'):
+                    console.print(
+                        '\n❌ Processamento interrompido pela janela do'
+                        ' OpenCV.'
+                    )
+                    break
+        else:
+            # Imagens ilegíveis são puladas sem avançar a barra
+            progress.update(task, completed=len(caminhos))
+    cv2.destroyAllWindows()
+    processing_time = time.time() - start_time
+
+    # Tabela (console)
+    table = Table(title='📊 Relatório de Monitoramento de Poses (Imagens)')
+    table.add_column('Pose', style='cyan')
+    table.add_column('Imagens', justify='right')
+    table.add_column('Porcentagem', justify='right')
 
-def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
+    contagens = linha_tempo.contagens()
+    for pose, _, percentage in linha_tempo.resumo():
+        table.add_row(pose, str(contagens[pose]), f'{percentage:.1f}%')
+
+    console.print('\n')
+    console.print(table)
+    console.print(
+        f'🖼️ Imagens processadas: [bold]{len(poses_por_imagem)}[/]'
+        + f' de {len(caminhos)}'
+        + f' ({len(poses_por_imagem) / max(processing_time, 1e-9):.1f}'
+        + ' imagens/s)'
+    )
+    console.print(
+        f'⚡ Tempo de processamento: [bold]{processing_time:.2f}[/] segundos'
+    )
+    if cache:
+        resumir_cache(cache)
+
+    # CSV
+    csv_path, por_imagem_path = salvar_csv_relatorio(
+        linha_tempo,
+        output_dir,
+        origem='imagens',
+        poses_por_imagem=poses_por_imagem,
+    )
+    console.print(f'💾 CSV salvo em: [bold]{os.path.abspath(csv_path)}[/]')
+    console.print(
+        '🗂️ Poses por imagem salvas em:'
+        + f' [bold]{os.path.abspath(por_imagem_path)}[/]'
+    )
+
+    return pose_durations
+
+
+def run_pose_monitoring(  # noqa: PLR0911, PLR0912, PLR0913, PLR0914, PLR0915, PLR0917
     midia_path=ARQUIVO_VIDEO_PADRAO,
     duration_seconds=DURACAO_PADRAO,
     weights_path=ARQUIVO_PESOS,
     annotated_frame_cv2=True,
     output_dir='./relatorios',
+    offline=False,
+    tamanho_lote=TAMANHO_LOTE_PADRAO,
+    filtro_movimento=False,
+    backend=BACKEND_PADRAO,
+    gancho_metricas=None,
+    perfilar=False,
+    rastreamento=False,
+    fps_alvo=FPS_ALVO_PADRAO,
+    suavizacao=SUAVIZACAO_PADRAO,
+    destino_alertas=None,
+    gatilho_clipes=GATILHO_CLIPE_PADRAO,
+    usar_cache=False,
 ):
+    """
+    Monitora as poses em uma imagem, vídeo ou webcam.
+    No modo offline o vídeo é processado inteiro, sem limite de tempo, e as
+    durações são calculadas pelo tempo da mídia (CAP_PROP_POS_MSEC/FPS).
+    Vídeos são inferidos em lotes de tamanho_lote frames ('auto' mede o
+    melhor tamanho na máquina atual).
+    Com filtro_movimento, frames sem mudança na cena reutilizam a última
+    detecção e continuam sendo contados em pose_durations.
+    Com rastreamento, o modelo roda a cada N frames (N adaptativo) e as
+    caixas e poses são propagadas por fluxo óptico entre as detecções.
+    Com fps_alvo > 0 (fora do modo offline), imgsz e passo de frames
+    inferidos são ajustados para manter a taxa (com rastreamento, só o
+    imgsz); os ajustes vão para o relatório e para um CSV ao lado dele.
+    Com suavizacao diferente de 'nenhuma', a pose de cada frame passa por
+    um filtro temporal antes de ser contada e de entrar na linha do tempo;
+    o relatório compara as contagens brutas e suavizadas.
+    Com destino_alertas (URL de webhook ou arquivo .jsonl), uma pose de
+    risco que persiste dispara um alerta imediato, entregue em segundo
+    plano; a latência de cada alerta vai para o relatório.
+    Com gatilho_clipes 'alertas' ou 'transicoes', cada alerta (ou mudança
+    de pose) gera um clipe MP4 com os segundos antes e depois do evento,
+    salvo em output_dir/clipes.
+    Com usar_cache, as detecções de imagens e de frames de vídeo ficam em
+    um cache em disco (chave: pesos, parâmetros, hash do arquivo e índice
+    do frame) e uma nova execução sobre a mesma mídia só decodifica e lê o
+    cache. Vale apenas quando todos os frames são inferidos (sem
+    rastreamento, filtro de movimento ou controle de latência).
+    backend escolhe entre o modelo PyTorch e o exportado (ONNX/OpenVINO).
+    A latência de cada etapa do loop é medida e salva junto ao CSV;
+    gancho_metricas(etapa, duracao_s, itens) recebe cada medição e
+    perfilar=True grava também um perfil do cProfile (.prof).
+    """
+    stream = eh_stream(midia_path)
+    offline = offline and midia_path != '0' and not stream
+
     # Inicialização do monitoramento
     console.print(
         Panel('🎥 Sistema de Monitoramento de Poses', style='bold blue')
@@ -151,24 +524,59 @@ def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
         'idoso em pe': 0,
         'idoso sentado': 0,
         'jovem': 0,
-
         POSE_NAO_DETECTADA: 0,
     }
     frame_count = 0
+    # Linha do tempo compacta das poses, usada nos relatórios
+    linha_tempo = LinhaTempoPoses()
 
     # Carregamento do modelo YOLO
     with console.status('[bold green]Carregando o modelo YOLO...'):
         try:
-            model = YOLO(weights_path)
+            # Reutiliza o modelo já carregado e aquecido em sessões
+            # anteriores; só recarrega se o arquivo de pesos mudar
+            model = carregar_modelo(weights_path, backend=backend)
             # limite às classes de interesse (ajuste conforme seu rótulo)
             model.classes = [0, 1, 2, 3]
             # confiança mínima (em versões recentes usa-se no predict)
             # manter para compatibilidade com seu código
             model.conf = 0.5
         except Exception as e:
-            console.print(f'[bold red]❌ Erro ao carregar o modelo:[/] {str(e)}')
+            console.print(
+                f'[bold red]❌ Erro ao carregar o modelo:[/] {str(e)}'
+            )
             return
 
+    # Cache de detecções: os parâmetros de inferência fazem parte da chave,
+    # inclusive o imgsz efetivo (sem controle de latência, o do modelo)
+    cache = None
+    imgsz_cache = None
+    ao_vivo = midia_path == '0' or stream
+    sem_cache = ao_vivo or rastreamento or filtro_movimento or fps_alvo > 0
+    if usar_cache and not sem_cache:
+        imgsz_cache = model.overrides.get('imgsz', TAMANHOS_ENTRADA[0])
+        cache = CacheInferencia(
+            weights_path,
+            backend,
+            {
+                'classes': model.classes,
+                'conf': model.conf,
+                'imgsz': imgsz_cache,
+            },
+        )
+
+    # Modo DIRETÓRIO (ou padrão glob) de imagens
+    if midia_path != '0' and eh_lote_imagens(midia_path):
+        return monitorar_imagens_em_lote(
+            model,
+            midia_path,
+            annotated_frame_cv2,
+            output_dir,
+            tamanho_lote,
+            cache,
+            imgsz_cache,
+        )
+
     # Modo IMAGEM
     if midia_path != '0' and eh_imagem(midia_path):
         console.print('\n📊 Configurações:')
@@ -181,41 +589,41 @@ def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
 
         # Verificando se o caminho da imagem está correto e se o arquivo existe
         if not os.path.exists(midia_path):
-            console.print(f'[bold red]❌ Erro: O arquivo de imagem não foi encontrado no caminho "{midia_path}".[/]')
+            console.print(
+                f'[bold red]❌ Erro: O arquivo de imagem não foi encontrado no caminho "{midia_path}".[/]'
+            )
             return
 
         # Tentativa de abrir a imagem
         img = cv2.imread(midia_path)
         if img is None:
-            console.print(f'[bold red]❌ Erro ao abrir a imagem! Verifique se o formato é suportado (jpg, png, etc.).[/]')
+            console.print(
+                f'[bold red]❌ Erro ao abrir a imagem! Verifique se o formato é suportado (jpg, png, etc.).[/]'
+            )
             return
 
         # Inferência
-        results = model(img, verbose=False)[0]
-        person_detected = False
-        best_confidence = 0
-        best_pose = POSE_NAO_DETECTADA
+        if cache:
+            chave = cache.chave(hash_arquivo(midia_path))
+            results = inferir_lote_com_cache(
+                model, [img], [chave], cache, imgsz=imgsz_cache
+            )[0]
+        else:
+            results = inferir_lote(model, [img])[0]
 
         if annotated_frame_cv2:
-            annotated_frame = results.plot()
-            cv2.imshow('Sistema de Monitoramento de Poses - Imagem', annotated_frame)
+            renderizador = RenderizadorAnotacoes(
+                'Sistema de Monitoramento de Poses - Imagem'
+            )
+            annotated_frame = renderizador.desenhar(img, results)
             # fecha ao pressionar qualquer tecla ou após 2s
-            if cv2.waitKey(2000) & 0xFF == ord('q'):
-                pass
+            renderizador.mostrar(annotated_frame, espera_ms=2000)
             cv2.destroyAllWindows()
 
-        # Loop sobre detecções
-        for detection in results.boxes.data:
-            class_id = int(detection[5])  # índice da classe
-            confidence = float(detection[4])  # confiança
-            if class_id in CLASSES_DETECTADAS:
-                person_detected = True
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_pose = CLASSES_DETECTADAS[class_id]
-
-        detected_pose_this_frame = best_pose if person_detected else POSE_NAO_DETECTADA
+        # Detecção mais confiante entre as classes conhecidas
+        detected_pose_this_frame, confianca = selecionar_pose(results)
         pose_durations[detected_pose_this_frame] += 1
+        linha_tempo.registrar(0.0, detected_pose_this_frame, confianca)
         frame_count = 1
 
         # tempo total ~0 para imagem (não é sequência)
@@ -228,11 +636,8 @@ def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
         table.add_column('Duração (min)', justify='right')
         table.add_column('Porcentagem', justify='right')
 
-        total_frames = max(sum(pose_durations.values()), 1)
-        for pose, frames in pose_durations.items():
-            duration_minutes = (frames / total_frames) * (total_time / 60) if total_time > 0 else 0
-            percentage = (frames / total_frames) * 100
-            table.add_row(pose, f'{duration_minutes:.2f}', f'{percentage:.1f}%')
+        for pose, duracao_s, percentage in linha_tempo.resumo():
+            table.add_row(pose, f'{duracao_s / 60:.2f}', f'{percentage:.1f}%')
 
         console.print('\n')
         console.print(table)
@@ -240,85 +645,441 @@ def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
             '\n⏱️ Tempo total processado: [bold]'
             + f'{total_time:.2f}[/] segundos'
         )
+        if cache:
+            resumir_cache(cache)
 
         # CSV
-        csv_path = salvar_csv_relatorio(
-            pose_durations, total_time, output_dir, origem='imagem'
+        csv_path, _ = salvar_csv_relatorio(
+            linha_tempo, output_dir, origem='imagem'
         )
         console.print(f'💾 CSV salvo em: [bold]{os.path.abspath(csv_path)}[/]')
 
         return pose_durations
 
-    # Modo WEBCAM/VÍDEO
-    cap = cv2.VideoCapture(0 if midia_path == '0' else midia_path)
+    # Modo WEBCAM/STREAM/VÍDEO. Streams são abertos em modo de baixa
+    # latência e reconectados se caírem
+    if stream:
+        captura = CapturaStream(midia_path)
+        cap = captura.cap
+    else:
+        cap = cv2.VideoCapture(0 if midia_path == '0' else midia_path)
     if not cap.isOpened():
         console.print('[bold red]❌ Erro ao abrir fonte de vídeo!')
         return
 
+    total_frames_midia = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
     console.print('\n📊 Configurações:')
-    console.print(f'- Duração planejada: {duration_seconds / 60:.1f} minutos')
+    if offline:
+        console.print(
+            f'- Modo offline: vídeo completo ({total_frames_midia} frames)'
+        )
+    else:
+        console.print(
+            f'- Duração planejada: {duration_seconds / 60:.1f} minutos'
+        )
     console.print(
         '- Classes detectadas:'
         + f' {[CLASSES_DETECTADAS[c] for c in model.classes]}'
     )
 
+    # Fontes ao vivo usam lote 1 para não acumular latência
+    if midia_path == '0' or stream:
+        tamanho_lote = 1
+    else:
+        with console.status('[bold green]Ajustando o tamanho do lote...'):
+            tamanho_lote = resolver_tamanho_lote(model, cap, tamanho_lote)
+    console.print(f'- Tamanho do lote de inferência: {tamanho_lote}')
+
+    # Captura em thread separada: para a webcam mantém apenas o frame
+    # mais recente, para arquivos apenas adianta a decodificação
+    if not stream:
+        captura = CapturaUltimoFrame(cap, descartar_frames=midia_path == '0')
+    captura.iniciar()
+    # Arquivos de vídeo são medidos pelo tempo da mídia; fontes ao vivo,
+    # pelo relógio
+    tempo_midia = midia_path != '0' and not stream
+
+    # Filtro de movimento antes da inferência
+    detector = DetectorMovimento() if filtro_movimento else None
+    ultimo_resultado = None
+    rastreador = RastreadorPoses() if rastreamento else None
+    suavizador = None
+    if suavizacao != 'nenhuma':
+        suavizador = SuavizadorPoses(suavizacao)
+
+    # Alertas entregues em thread própria, também exibidos no terminal
+    motor_alertas = None
+    if destino_alertas or gatilho_clipes == 'alertas':
+        saidas = [
+            SaidaCallback(
+                lambda alerta: console.print(
+                    f'🚨 [bold red]{alerta["pose"]}[/]'
+                    + f' há {alerta["duracao_s"]:.0f} s'
+                )
+            )
+        ]
+        if destino_alertas:
+            saidas.append(criar_saida(destino_alertas))
+        motor_alertas = MotorAlertas(
+            saidas,
+            tempo_real=midia_path == '0' or stream,
+            origem=(
+                os.path.basename(midia_path) if midia_path != '0' else 'webcam'
+            ),
+        )
+
+    # Buffer de vídeo para os clipes, gravados em thread própria
+    gravador = None
+    if gatilho_clipes != 'nenhum':
+        gravador = GravadorClipes(
+            os.path.join(output_dir, 'clipes'), gatilho=gatilho_clipes
+        )
+
+    # Controle de latência: imgsz e passo de frames para o FPS alvo. O
+    # rastreador já decide quais frames passam pelo modelo, então com ele
+    # só o imgsz é ajustado
+    controlador = None
+    if fps_alvo > 0 and not offline:
+        controlador = ControladorLatencia(
+            fps_alvo, passo_maximo=1 if rastreador else PASSO_MAXIMO_FRAMES
+        )
+
+    # Latência por etapa do loop (p50/p95/p99 e vazão)
+    metricas = MetricasEtapas(gancho=gancho_metricas, perfilar=perfilar)
+
+    # Anotações desenhadas apenas na taxa de atualização da tela
+    renderizador = RenderizadorAnotacoes(
+        'Sistema de Monitoramento de Poses - Deteccao em Tempo Real'
+    )
+
     with Progress(console=console) as progress:
         task = progress.add_task(
             '[cyan]Processando frames...[/cyan] [yellow](Pressione q para terminar)[/yellow]',
-            total=duration_seconds,
+            total=total_frames_midia if offline else duration_seconds,
         )
 
-        while cap.isOpened():
-            current_time = time.time()
-            elapsed = current_time - start_time
-            progress.update(task, completed=min(elapsed, duration_seconds))
+        while True:
+            if not offline:
+                current_time = time.time()
+                elapsed = current_time - start_time
+                with metricas.medir('progresso'):
+                    progress.update(
+                        task, completed=min(elapsed, duration_seconds)
+                    )
+
+                if elapsed >= duration_seconds:
+                    break
 
-            if elapsed >= duration_seconds:
+            inicio_captura = time.perf_counter()
+            frames, instantes = ler_lote(
+                captura,
+                tamanho_lote,
+                tempo_midia=tempo_midia,
+                timeout=ESPERA_FRAME_STREAM if stream else None,
+            )
+            metricas.registrar(
+                'captura', time.perf_counter() - inicio_captura, len(frames)
+            )
+            if not frames:
+                if stream and not captura.encerrada:
+                    # Stream reconectando: o monitoramento continua e o
+                    # tempo limite segue sendo verificado
+                    continue
                 break
+            inicio_processamento = time.perf_counter()
+
+            if offline:
+                # Progresso pela posição do frame dentro do arquivo
+                with metricas.medir('progresso'):
+                    progress.update(task, completed=captura.indice_frame + 1)
+
+            # Inferência em lote: uma predição para todos os frames lidos,
+            # com os resultados devolvidos na ordem de captura. Frames sem
+            # movimento reutilizam a última detecção. Com o rastreador,
+            # apenas os frames de detecção passam pelo modelo. Com o cache,
+            # só os frames que ainda não estão nele (frames de arquivos
+            # são consecutivos: o lote termina em captura.indice_frame).
+            if cache:
+                chaves = cache.chaves_arquivo(
+                    midia_path,
+                    captura.indice_frame - len(frames) + 1,
+                    len(frames),
+                )
+                resultados = inferir_lote_com_cache(
+                    model, frames, chaves, cache, metricas, imgsz_cache
+                )
+            elif rastreador:
+                resultados = inferir_lote_com_rastreamento(
+                    model,
+                    frames,
+                    rastreador,
+                    metricas,
+                    controlador.imgsz if controlador else None,
+                )
+            else:
+                resultados = inferir_lote_com_movimento(
+                    model,
+                    frames,
+                    detector,
+                    ultimo_resultado,
+                    metricas,
+                    controlador=controlador,
+                )
+            ultimo_resultado = resultados[-1]
+            # Melhor pose de cada frame, escolhida de forma vetorizada
+            with metricas.medir('selecao', len(resultados)):
+                selecoes = selecionar_poses(resultados)
+            interrompido = False
+            processados = 0
+            for frame, results in zip(frames, resultados):
+                if annotated_frame_cv2 and renderizador.pronto_para_exibir():
+                    with metricas.medir('anotacao'):
+                        annotated_frame = renderizador.desenhar(frame, results)
+                    with metricas.medir('exibicao'):
+                        key = renderizador.mostrar(annotated_frame)
+                    if key == ord('q'):
+                        console.print(
+                            '\n❌ Monitoramento interrompido pela janela'
+                            ' do OpenCV.'
+                        )
+                        interrompido = True
+                        break
+
+                # Verifica se há tecla pressionada no terminal (apenas Windows)
+                if msvcrt and msvcrt.kbhit():
+                    terminal_key = (
+                        msvcrt.getch().decode(errors='ignore').lower()
+                    )
+                    if terminal_key == 'q':
+                        console.print(
+                            '\n❌ Monitoramento interrompido pelo terminal.'
+                        )
+                        interrompido = True
+                        break
+
+                processados += 1
+
+            # Contabiliza de uma vez os frames processados do lote
+            with metricas.medir('contabilizacao', processados):
+                selecoes = selecoes[:processados]
+                if suavizador:
+                    selecoes = suavizador.suavizar_lote(selecoes)
+                contabilizar_poses(pose_durations, selecoes)
+                linha_tempo.registrar_lote(instantes[:processados], selecoes)
+            alertas = []
+            if motor_alertas:
+                with metricas.medir('alertas', processados):
+                    alertas = motor_alertas.observar_lote(instantes, selecoes)
+            if gravador:
+                with metricas.medir('clipes', processados):
+                    for frame, instante, (pose, _) in zip(
+                        frames, instantes, selecoes
+                    ):
+                        gravador.adicionar(frame, instante, pose)
+                    for alerta in alertas:
+                        gravador.disparar(alerta['instante_s'], alerta['pose'])
+            frame_count += processados
+            if controlador:
+                controlador.registrar(
+                    time.perf_counter() - inicio_processamento, processados
+                )
 
-            ret, frame = cap.read()
-            if not ret:
+            if interrompido:
                 break
 
-            frame_count += 1
-            results = model(frame, verbose=False)[0]
-            person_detected = False
-            best_confidence = 0
-            best_pose = POSE_NAO_DETECTADA
-
-            if annotated_frame_cv2:
-                annotated_frame = results.plot()
-                cv2.imshow('Sistema de Monitoramento de Poses - Deteccao em Tempo Real', annotated_frame)
-                key = cv2.waitKey(1) & 0xFF
-                if key == ord('q'):
-                    console.print('\n❌ Monitoramento interrompido pela janela do OpenCV.')
-                    break
+    # Finalização e relatório
+    metricas.finalizar()
+    if motor_alertas:
+        motor_alertas.encerrar()
+    if gravador:
+        gravador.encerrar()
+    captura.parar()
+    captura.cap.release()
+    cv2.destroyAllWindows()
+    end_time = time.time()
+    processing_time = end_time - start_time
+    # Em arquivos as durações seguem o tempo da mídia processada, também
+    # fora do modo offline
+    total_time = captura.duracao_midia() if tempo_midia else processing_time
+    linha_tempo.finalizar(1 / captura.fps if captura.fps > 0 else 0.0)
 
-            # Verifica se há tecla pressionada no terminal (apenas Windows)
-            if msvcrt and msvcrt.kbhit():
-                terminal_key = msvcrt.getch().decode(errors='ignore').lower()
-                if terminal_key == 'q':
-                    console.print('\n❌ Monitoramento interrompido pelo terminal.')
-                    break
+    # Tabela (console)
+    table = Table(title='📊 Relatório de Monitoramento de Poses')
+    table.add_column('Pose', style='cyan')
+    table.add_column('Duração (min)', justify='right')
+    table.add_column('Porcentagem', justify='right')
+
+    for pose, duracao_s, percentage in linha_tempo.resumo():
+        table.add_row(pose, f'{duracao_s / 60:.2f}', f'{percentage:.1f}%')
+
+    console.print('\n')
+    console.print(table)
+    console.print(metricas.tabela())
+    console.print(
+        '\n⏱️ Tempo total monitorado'
+        + (' (tempo da mídia)' if tempo_midia else '')
+        + f': [bold]{total_time / 60:.2f}[/] minutos'
+    )
+    console.print(
+        f'⚡ Tempo de processamento: [bold]{processing_time:.2f}[/] segundos'
+    )
+    console.print(
+        f'🎞️ Frames descartados: [bold]{captura.frames_descartados}[/]'
+        + f' | atrasados: [bold]{captura.frames_atrasados}[/]'
+        + f' | idade máxima: [bold]{captura.idade_maxima:.2f}[/] s'
+    )
+    if stream:
+        console.print(
+            f'🌐 Reconexões: [bold]{captura.reconexoes}[/]'
+            + f' | falhas: [bold]{captura.falhas_reconexao}[/]'
+            + f' | desconectado: [bold]{captura.tempo_desconectado:.1f}[/] s'
+            + f' | jitter: [bold]{captura.jitter_ms():.1f}[/] ms'
+            + ' | maior intervalo:'
+            + f' [bold]{captura.intervalo_maximo_ms():.0f}[/] ms'
+        )
+    if annotated_frame_cv2:
+        console.print(
+            f'🖼️ Frames exibidos: [bold]{renderizador.frames_exibidos}[/]'
+            + f' | não exibidos: [bold]{renderizador.frames_pulados}[/]'
+        )
+    if detector:
+        console.print(
+            '🧊 Inferências economizadas pelo filtro de movimento: [bold]'
+            + f'{detector.inferencias_puladas}[/] de'
+            + f' {detector.frames_avaliados} frames'
+            + f' ({detector.taxa_economia() * 100:.1f}%)'
+        )
+    if rastreador:
+        console.print(
+            f'🛰️ Detecções: [bold]{rastreador.deteccoes}[/]'
+            + f' | frames rastreados: [bold]{rastreador.frames_rastreados}[/]'
+            + f' ({rastreador.taxa_economia() * 100:.1f}%)'
+            + f' | antecipadas: [bold]{rastreador.deteccoes_antecipadas}[/]'
+            + f' | intervalo final: [bold]{rastreador.intervalo}[/]'
+        )
+    if cache:
+        resumir_cache(cache)
+    if suavizador:
+        console.print(suavizador.tabela())
+    if motor_alertas:
+        console.print(motor_alertas.tabela())
+        p50, p95, maxima = motor_alertas.latencias_ms()
+        console.print(
+            f'🚨 Alertas: [bold]{motor_alertas.emitidos}[/]'
+            + f' | suprimidos: [bold]{motor_alertas.suprimidos}[/]'
+            + f' | descartados: [bold]{motor_alertas.descartados}[/]'
+            + f' | falhas: [bold]{motor_alertas.falhas}[/]'
+            + ' | latência p50/p95/máx:'
+            + f' [bold]{p50:.0f}/{p95:.0f}/{maxima:.0f}[/] ms'
+        )
+    if gravador:
+        estatisticas = gravador.estatisticas()
+        console.print(
+            f'🎬 Clipes: [bold]{estatisticas["clipes"]}[/]'
+            + f' em {os.path.abspath(gravador.diretorio)}'
+            + f' | descartados: [bold]{estatisticas["clipes_descartados"]}[/]'
+            + ' | codificação média:'
+            + f' [bold]{estatisticas["codificacao_media_s"]:.2f}[/] s'
+        )
+        console.print(
+            f'🎬 Buffer: [bold]{estatisticas["memoria_pico_mb"]:.1f}[/]'
+            + f' MB no pico ({estatisticas["frames_no_buffer"]} frames)'
+            + ' | compressão:'
+            + f' [bold]{estatisticas["compressao_ms_por_frame"]:.2f}[/]'
+            + ' ms/frame'
+        )
+    if controlador:
+        console.print(controlador.tabela())
+        console.print(
+            f'🎚️ Configuração final: imgsz [bold]{controlador.imgsz}[/]'
+            + f' | passo [bold]{controlador.passo}[/]'
+            + f' | {len(controlador.ajustes)} ajustes'
+        )
+
+    # CSV
+    origem = 'webcam' if midia_path == '0' else 'stream' if stream else 'video'
+    csv_path, linha_tempo_path = salvar_csv_relatorio(
+        linha_tempo, output_dir, origem=origem
+    )
+    console.print(f'💾 CSV salvo em: [bold]{os.path.abspath(csv_path)}[/]')
+    console.print(
+        f'🕒 Linha do tempo ({len(linha_tempo)} trechos,'
+        + f' {linha_tempo.nbytes / 1024:.1f} KB) salva em:'
+        + f' [bold]{os.path.abspath(linha_tempo_path)}[/]'
+    )
+    base_csv = os.path.splitext(os.path.basename(csv_path))[0]
+    metricas_path = metricas.salvar_csv(
+        os.path.join(output_dir, f'metricas_{base_csv}.csv')
+    )
+    console.print(
+        '⏱️ Métricas por etapa salvas em:'
+        + f' [bold]{os.path.abspath(metricas_path)}[/]'
+    )
+    if controlador:
+        ajustes_path = controlador.salvar_csv(
+            os.path.join(output_dir, f'ajustes_{base_csv}.csv')
+        )
+        console.print(
+            '🎚️ Ajustes de latência salvos em:'
+            + f' [bold]{os.path.abspath(ajustes_path)}[/]'
+        )
+    perfil_path = metricas.salvar_perfil(
+        os.path.join(output_dir, f'perfil_{base_csv}.prof')
+    )
+    if perfil_path:
+        console.print(
+            '🔬 Perfil do cProfile salvo em:'
+            + f' [bold]{os.path.abspath(perfil_path)}[/]'
+        )
 
-            for detection in results.boxes.data:
-                class_id = int(detection[5])
-                confidence = float(detection[4])
+    return pose_durations
 
-                if class_id in CLASSES_DETECTADAS:
-                    person_detected = True
-                    if confidence > best_confidence:
-                        best_confidence = confidence
-                        best_pose = CLASSES_DETECTADAS[class_id]
 
-            detected_pose_this_frame = best_pose if person_detected else POSE_NAO_DETECTADA
-            pose_durations[detected_pose_this_frame] += 1
+def run_pose_monitoring_particionado(  # noqa: PLR0913, PLR0917
+    midia_path,
+    weights_path=ARQUIVO_PESOS,
+    output_dir='./relatorios',
+    processos=None,
+    tamanho_lote=TAMANHO_LOTE_PARTICAO,
+    backend=BACKEND_PADRAO,
+):
+    """
+    Processa um arquivo de vídeo inteiro dividido em partes, cada uma em um
+    processo com captura e modelo próprios. As contagens e a linha do tempo
+    das partes são unidas em um relatório igual ao do modo offline
+    sequencial (sem filtro de movimento).
+    """
+    console.print(
+        Panel('🎥 Sistema de Monitoramento de Poses', style='bold blue')
+    )
+    if not str(tamanho_lote).isdigit():
+        tamanho_lote = TAMANHO_LOTE_PARTICAO
 
-    # Finalização e relatório
-    cap.release()
-    cv2.destroyAllWindows()
-    end_time = time.time()
-    total_time = end_time - start_time
+    start_time = time.time()
+    with Progress(console=console) as progress:
+        task = progress.add_task(
+            '[cyan]Processando partes do vídeo...[/cyan]', total=None
+        )
+        try:
+            resultado = processar_video_particionado(
+                midia_path,
+                weights_path,
+                processos,
+                backend,
+                int(tamanho_lote),
+                ao_concluir_parte=lambda feitas, total: progress.update(
+                    task, completed=feitas, total=total
+                ),
+            )
+        except Exception as e:
+            console.print(
+                '[bold red]❌ Erro no processamento em paralelo:[/]'
+                + f' {str(e)}'
+            )
+            return
+    pose_durations, linha_tempo, frame_count, total_time = resultado
+    processing_time = time.time() - start_time
 
     # Tabela (console)
     table = Table(title='📊 Relatório de Monitoramento de Poses')
@@ -326,26 +1087,166 @@ def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
     table.add_column('Duração (min)', justify='right')
     table.add_column('Porcentagem', justify='right')
 
-    total_frames = max(sum(pose_durations.values()), 1)
-    for pose, frames in pose_durations.items():
-        duration_minutes = (frames / total_frames) * (total_time / 60)
-        percentage = (frames / total_frames) * 100
-        table.add_row(pose, f'{duration_minutes:.2f}', f'{percentage:.1f}%')
+    for pose, duracao_s, percentage in linha_tempo.resumo():
+        table.add_row(pose, f'{duracao_s / 60:.2f}', f'{percentage:.1f}%')
 
     console.print('\n')
     console.print(table)
-    console.print('\n⏱️ Tempo total monitorado: [bold]' + f'{total_time / 60:.2f}[/] minutos')
-    console.print(f'⚡ Tempo de processamento: [bold]{total_time:.2f}[/] segundos')
+    console.print(
+        '\n⏱️ Tempo total monitorado: [bold]'
+        + f'{total_time / 60:.2f}[/] minutos'
+    )
+    console.print(
+        f'⚡ Tempo de processamento: [bold]{processing_time:.2f}[/] segundos'
+    )
+    console.print(
+        f'🧩 Frames processados: [bold]{frame_count}[/]'
+        + f' ({frame_count / max(processing_time, 1e-9):.1f} frames/s)'
+    )
 
     # CSV
-    origem = 'webcam' if midia_path == '0' else 'video'
-    csv_path = salvar_csv_relatorio(pose_durations, total_time, output_dir, origem=origem)
+    csv_path, linha_tempo_path = salvar_csv_relatorio(
+        linha_tempo, output_dir, origem='video'
+    )
     console.print(f'💾 CSV salvo em: [bold]{os.path.abspath(csv_path)}[/]')
+    console.print(
+        '🕒 Linha do tempo salva em:'
+        + f' [bold]{os.path.abspath(linha_tempo_path)}[/]'
+    )
 
     return pose_durations
 
 
+def run_pose_monitoring_compartilhado(  # noqa: PLR0913, PLR0917
+    midia_path,
+    duration_seconds=DURACAO_PADRAO,
+    weights_path=ARQUIVO_PESOS,
+    output_dir='./relatorios',
+    processos=None,
+    backend=BACKEND_PADRAO,
+):
+    """
+    Monitora uma fonte ao vivo (webcam ou stream) com um processo de captura
+    e processos de inferência que leem os frames de um anel em memória
+    compartilhada. Os resultados voltam em ordem e o relatório é igual ao do
+    modo sequencial, sem a janela de visualização.
+    """
+    console.print(
+        Panel('🎥 Sistema de Monitoramento de Poses', style='bold blue')
+    )
+
+    start_time = time.time()
+    with Progress(console=console) as progress:
+        task = progress.add_task(
+            f'[cyan]Processando frames ({processos} processos de'
+            + ' inferência)...[/cyan]',
+            total=duration_seconds,
+        )
+        try:
+            relatorio = processar_fontes_compartilhadas(
+                [midia_path],
+                weights_path,
+                processos,
+                backend,
+                duracao=duration_seconds,
+                ao_processar=lambda *_: progress.update(
+                    task,
+                    completed=min(time.time() - start_time, duration_seconds),
+                ),
+            )[0]
+        except Exception as e:
+            console.print(
+                '[bold red]❌ Erro no processamento em paralelo:[/]'
+                + f' {str(e)}'
+            )
+            return
+    processing_time = time.time() - start_time
+    linha_tempo = relatorio['linha_tempo']
+    frame_count = relatorio['frames']
+
+    # Tabela (console)
+    table = Table(title='📊 Relatório de Monitoramento de Poses')
+    table.add_column('Pose', style='cyan')
+    table.add_column('Duração (min)', justify='right')
+    table.add_column('Porcentagem', justify='right')
+
+    for pose, duracao_s, percentage in linha_tempo.resumo():
+        table.add_row(pose, f'{duracao_s / 60:.2f}', f'{percentage:.1f}%')
+
+    console.print('\n')
+    console.print(table)
+    console.print(
+        '\n⏱️ Tempo total monitorado: [bold]'
+        + f'{processing_time / 60:.2f}[/] minutos'
+    )
+    console.print(
+        f'🧩 Frames processados: [bold]{frame_count}[/]'
+        + f' ({frame_count / max(processing_time, 1e-9):.1f} frames/s)'
+        + ' | descartados sem slot livre:'
+        + f' [bold]{relatorio["descartados"]}[/]'
+    )
+
+    # CSV
+    origem = 'webcam' if midia_path == '0' else 'stream'
+    csv_path, linha_tempo_path = salvar_csv_relatorio(
+        linha_tempo, output_dir, origem=origem
+    )
+    console.print(f'💾 CSV salvo em: [bold]{os.path.abspath(csv_path)}[/]')
+    console.print(
+        '🕒 Linha do tempo salva em:'
+        + f' [bold]{os.path.abspath(linha_tempo_path)}[/]'
+    )
+
+    return relatorio['pose_durations']
+
+
+def run_pose_monitoring_cameras(
+    cameras,
+    duration_seconds=DURACAO_PADRAO,
+    weights_path=ARQUIVO_PESOS,
+    output_dir='./relatorios',
+    backend=BACKEND_PADRAO,
+):
+    """
+    Monitora várias câmeras (lista de (nome, fonte)) com um único modelo
+    compartilhado, com relatório e CSVs separados por câmera, sem a janela
+    de visualização.
+    """
+    console.print(
+        Panel('🎥 Sistema de Monitoramento de Poses', style='bold blue')
+    )
+
+    start_time = time.time()
+    with Progress(console=console) as progress:
+        task = progress.add_task(
+            f'[cyan]Monitorando {len(cameras)} câmeras...[/cyan]',
+            total=duration_seconds,
+        )
+        try:
+            monitoradas, escalonador = monitorar_cameras(
+                cameras,
+                weights_path,
+                backend,
+                duration_seconds,
+                ao_lote=lambda _, decorrido: progress.update(
+                    task, completed=min(decorrido, duration_seconds)
+                ),
+            )
+        except Exception as e:
+            console.print(
+                f'[bold red]❌ Erro no monitoramento das câmeras:[/] {str(e)}'
+            )
+            return
+    relatar_cameras(
+        monitoradas, escalonador, time.time() - start_time, output_dir
+    )
+
+    return {camera.nome: camera.pose_durations for camera in monitoradas}
+
+
 if __name__ == '__main__':
+    # Necessário para o pool de processos no executável (PyInstaller)
+    multiprocessing.freeze_support()
     try:
         initialize_app()
         if 'pyi_splash' in sys.modules:
@@ -353,40 +1254,89 @@ if __name__ == '__main__':
         while True:
             console.clear()
             console.print(
-                Panel('🤖 Sistema de Monitoramento de Poses', style='bold magenta')
+                Panel(
+                    '🤖 Sistema de Monitoramento de Poses',
+                    style='bold magenta',
+                )
             )
 
-            start_monitoring = Confirm.ask('\n🚀 Iniciar novo monitoramento?', default=True)
+            start_monitoring = Confirm.ask(
+                '\n🚀 Iniciar novo monitoramento?', default=True
+            )
             if not start_monitoring:
                 console.print('\n👋 Até logo!', style='bold blue')
                 break
 
-            midia_path, duration_seconds, weights_path, annotated_frame_cv2, output_dir = (
-                get_user_parameters()
-            )
+            parametros = get_user_parameters()
 
             console.print('\n✨ Iniciando com as configurações:')
-            console.print(f'📦 Fonte: {midia_path}')
-            if midia_path in ('0', ARQUIVO_VIDEO_PADRAO) or not eh_imagem(midia_path):
-                console.print(f'⏱️ Duração: {duration_seconds / 60:.1f} minutos')
-            console.print(f'🎯 Arquivo de pesos: {weights_path}')
-            console.print(f'📁 Diretório de saída: {output_dir}')
-
-            if Confirm.ask('\n▶️ Confirmar e começar?', default=True):
-                _ = run_pose_monitoring(
-                    midia_path,
-                    duration_seconds,
-                    weights_path,
-                    annotated_frame_cv2,
-                    output_dir,
+            if parametros.cameras:
+                console.print(
+                    '📷 Câmeras: '
+                    + ', '.join(nome for nome, _ in parametros.cameras)
+                )
+            else:
+                console.print(f'📦 Fonte: {parametros.midia_path}')
+            if parametros.offline:
+                console.print('⚡ Modo offline: vídeo completo')
+            elif not eh_lote_imagens(parametros.midia_path) and (
+                parametros.midia_path in {'0', ARQUIVO_VIDEO_PADRAO}
+                or not eh_imagem(parametros.midia_path)
+            ):
+                console.print(
+                    '⏱️ Duração: '
+                    f'{parametros.duration_seconds / 60:.1f} minutos'
+                )
+            console.print(f'🎯 Arquivo de pesos: {parametros.weights_path}')
+            console.print(f'⚙️ Backend: {parametros.backend}')
+            console.print(f'📁 Diretório de saída: {parametros.output_dir}')
+            if parametros.processos > 1:
+                console.print(
+                    f'🧩 Processos em paralelo: {parametros.processos}'
                 )
 
-            if not Confirm.ask('\n🔄 Deseja realizar outro monitoramento?', default=True):
+            if Confirm.ask('\n▶️ Confirmar e começar?', default=True):
+                if parametros.cameras:
+                    _ = run_pose_monitoring_cameras(
+                        parametros.cameras,
+                        parametros.duration_seconds,
+                        parametros.weights_path,
+                        parametros.output_dir,
+                        parametros.backend,
+                    )
+                elif parametros.offline and parametros.processos > 1:
+                    _ = run_pose_monitoring_particionado(
+                        parametros.midia_path,
+                        parametros.weights_path,
+                        parametros.output_dir,
+                        parametros.processos,
+                        parametros.tamanho_lote,
+                        parametros.backend,
+                    )
+                elif parametros.processos > 1:
+                    _ = run_pose_monitoring_compartilhado(
+                        parametros.midia_path,
+                        parametros.duration_seconds,
+                        parametros.weights_path,
+                        parametros.output_dir,
+                        parametros.processos,
+                        parametros.backend,
+                    )
+                else:
+                    opcoes = asdict(parametros)
+                    del opcoes['processos'], opcoes['cameras']
+                    _ = run_pose_monitoring(**opcoes)
+
+            if not Confirm.ask(
+                '\n🔄 Deseja realizar outro monitoramento?', default=True
+            ):
                 console.print('\n👋 Até logo!', style='bold blue')
                 break
 
     except KeyboardInterrupt:
-        console.print('\n\n❌ Monitoramento interrompido pelo usuário', style='bold red')
+        console.print(
+            '\n\n❌ Monitoramento interrompido pelo usuário', style='bold red'
+        )
     except Exception as e:
         console.print(f'\n\n❌ Erro inesperado: {str(e)}', style='bold red')
         console.print(f'[bold red]Detalhes do erro: {repr(e)}[/]')
@@ -3,7 +3,7 @@ import sys
 import time
 import csv
 import json
-import requests
+from dataclasses import asdict, dataclass
 
 import cv2
 from rich.console import Console
@@ -11,18 +11,27 @@ from rich.panel import Panel
 from rich.progress import Progress
 from rich.prompt import Confirm, Prompt
 from rich.table import Table
-from ultralytics import YOLO
 
 from constants import (
     ARQUIVO_PESOS,
     ARQUIVO_VIDEO_PADRAO,
+    BACKEND_PADRAO,
     CLASSES_DETECTADAS,
     DURACAO_PADRAO,
+    EXTENSOES_IMAGEM,
+    JANELA_AMOSTRAGEM_PADRAO,
     POSE_NAO_DETECTADA,
+    TAXA_AMOSTRAGEM_PADRAO,
 )
+from captura import AmostradorFrames
+from deteccao import selecionar_pose
+from envio import EnviadorRelatorios
+from inferencia import inferir_lote
+from modelos import carregar_modelo
+from renderizacao import RenderizadorAnotacoes
 
 # Caminho para o arquivo de configurações
-CONFIG_FILE = "config.json"
+CONFIG_FILE = 'config.json'
 
 # Tentativa de importar o módulo msvcrt
 try:
@@ -49,6 +58,23 @@ def initialize_app():
 console = Console()
 
 
+@dataclass
+class ParametrosMonitoramento:
+    """
+    Configuração do monitoramento, com os nomes dos parâmetros de
+    run_pose_monitoring.
+    """
+
+    midia_path: str = '0'
+    weights_path: str = ARQUIVO_PESOS
+    annotated_frame_cv2: bool = True
+    output_dir: str = os.path.join('.', 'relatorios')
+    server_url: str = 'http://localhost:8000/upload'
+    taxa_amostragem: float = TAXA_AMOSTRAGEM_PADRAO
+    janela_segundos: float = JANELA_AMOSTRAGEM_PADRAO
+    backend: str = BACKEND_PADRAO
+
+
 def load_config():
     """
     Carrega as configurações do arquivo JSON se ele existir.
@@ -79,6 +105,10 @@ def get_user_parameters(config):
     annotated_frame_cv2 = config.get('annotated_frame_cv2', True)
     output_dir = config.get('output_dir', os.path.join('.', 'relatorios'))
     server_url = config.get('server_url', 'http://localhost:8000/upload')
+    taxa_amostragem = config.get('taxa_amostragem', TAXA_AMOSTRAGEM_PADRAO)
+    janela_segundos = config.get('janela_segundos', JANELA_AMOSTRAGEM_PADRAO)
+    # Backend de inferência: 'pytorch', 'onnx' ou 'openvino'
+    backend = config.get('backend', BACKEND_PADRAO)
 
     # Perguntas ao usuário caso não existam configurações
     if midia_path == '0':
@@ -95,12 +125,18 @@ def get_user_parameters(config):
                 default=ARQUIVO_VIDEO_PADRAO,
             )
         else:  # imagem
-            midia_path = Prompt.ask('🖼️ Digite o caminho da imagem (jpg, png, etc.)')
+            midia_path = Prompt.ask(
+                '🖼️ Digite o caminho da imagem (jpg, png, etc.)'
+            )
 
     if weights_path == ARQUIVO_PESOS:
-        use_default_weights = Confirm.ask('\n🎯 Usar arquivo de pesos padrão?', default=True)
+        use_default_weights = Confirm.ask(
+            '\n🎯 Usar arquivo de pesos padrão?', default=True
+        )
         if not use_default_weights:
-            weights_path = Prompt.ask('Digite o caminho para o arquivo de pesos personalizado')
+            weights_path = Prompt.ask(
+                'Digite o caminho para o arquivo de pesos personalizado'
+            )
 
     annotated_frame_cv2 = Confirm.ask(
         '\n🖼️ Visualizar frames com anotações?', default=True
@@ -124,24 +160,35 @@ def get_user_parameters(config):
     config['annotated_frame_cv2'] = annotated_frame_cv2
     config['output_dir'] = output_dir
     config['server_url'] = server_url
+    config['taxa_amostragem'] = taxa_amostragem
+    config['janela_segundos'] = janela_segundos
+    config['backend'] = backend
 
     # Salva as configurações
     save_config(config)
 
-    return midia_path, weights_path, annotated_frame_cv2, output_dir, server_url
+    return ParametrosMonitoramento(
+        midia_path=midia_path,
+        weights_path=weights_path,
+        annotated_frame_cv2=annotated_frame_cv2,
+        output_dir=output_dir,
+        server_url=server_url,
+        taxa_amostragem=taxa_amostragem,
+        janela_segundos=janela_segundos,
+        backend=backend,
+    )
 
 
 def eh_imagem(caminho: str) -> bool:
     ext = os.path.splitext(caminho)[1].lower()
-    return ext in ('.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tif', '.tiff')
+    return ext in EXTENSOES_IMAGEM
 
 
-def salvar_csv_json_relatorio(pose_durations, total_time, csv_dir, origem='midia'):
+def montar_linhas_relatorio(pose_durations, total_time):
     """
-    Salva a tabela final como CSV e JSON no diretório informado.
-    Colunas: pose, duracao_min, porcentagem
+    Monta as linhas do relatório (pose, duracao_min, porcentagem) usadas
+    no CSV, no JSON e no envio ao servidor.
     """
-    os.makedirs(csv_dir, exist_ok=True)
     total_frames = sum(pose_durations.values())
 
     # evita divisão por zero
@@ -150,20 +197,39 @@ def salvar_csv_json_relatorio(pose_durations, total_time, csv_dir, origem='midia
 
     linhas = []
     for pose, frames in pose_durations.items():
-        duracao_min = (frames / total_frames) * (total_time / 60) if total_time > 0 else 0.0
+        duracao_min = (
+            (frames / total_frames) * (total_time / 60)
+            if total_time > 0
+            else 0.0
+        )
         porcentagem = (frames / total_frames) * 100
-        linhas.append({'pose': pose, 'duracao_min': f'{duracao_min:.2f}', 'porcentagem': f'{porcentagem:.1f}%'})
+        linhas.append({
+            'pose': pose,
+            'duracao_min': f'{duracao_min:.2f}',
+            'porcentagem': f'{porcentagem:.1f}%',
+        })
+    return linhas
+
+
+def salvar_csv_json_relatorio(linhas, csv_dir, origem='midia'):
+    """
+    Salva a tabela final como CSV e JSON no diretório informado.
+    Colunas: pose, duracao_min, porcentagem
+    """
+    os.makedirs(csv_dir, exist_ok=True)
 
     timestamp = time.strftime('%Y%m%d_%H%M%S')
     nome_arquivo_csv = f'relatorio_poses_{origem}_{timestamp}.csv'
     nome_arquivo_json = f'relatorio_poses_{origem}_{timestamp}.json'
-    
+
     caminho_csv = os.path.join(csv_dir, nome_arquivo_csv)
     caminho_json = os.path.join(csv_dir, nome_arquivo_json)
 
     # Salvar como CSV
     with open(caminho_csv, mode='w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['pose', 'duracao_min', 'porcentagem'], delimiter=';')
+        writer = csv.DictWriter(
+            f, fieldnames=['pose', 'duracao_min', 'porcentagem'], delimiter=';'
+        )
         writer.writeheader()
         writer.writerows(linhas)
 
@@ -174,29 +240,16 @@ def salvar_csv_json_relatorio(pose_durations, total_time, csv_dir, origem='midia
     return caminho_csv, caminho_json
 
 
-def enviar_json_para_servidor(json_path, server_url):
-    """
-    Envia o arquivo JSON para o servidor via HTTP POST.
-    """
-    with open(json_path, 'r') as f:
-        data = json.load(f)
-    
-    try:
-        response = requests.post(server_url, json=data)
-        if response.status_code == 200:
-            console.print(f'✅ JSON enviado com sucesso para {server_url}')
-        else:
-            console.print(f'[bold red]❌ Erro ao enviar JSON para o servidor! Status: {response.status_code}[/]')
-    except Exception as e:
-        console.print(f'[bold red]❌ Erro ao tentar enviar o JSON para o servidor: {str(e)}[/]')
-
-
-def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
+def run_pose_monitoring(  # noqa: PLR0912, PLR0913, PLR0914, PLR0915, PLR0917
     midia_path=ARQUIVO_VIDEO_PADRAO,
     weights_path=ARQUIVO_PESOS,
     annotated_frame_cv2=True,
     output_dir='./relatorios',
     server_url='http://localhost:8000/upload',
+    taxa_amostragem=TAXA_AMOSTRAGEM_PADRAO,
+    janela_segundos=JANELA_AMOSTRAGEM_PADRAO,
+    enviador=None,
+    backend=BACKEND_PADRAO,
 ):
     # Inicialização do monitoramento
     console.print(
@@ -216,11 +269,15 @@ def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
     # Carregamento do modelo YOLO
     with console.status('[bold green]Carregando o modelo YOLO...'):
         try:
-            model = YOLO(weights_path)
+            # Reutiliza o modelo já carregado e aquecido em sessões
+            # anteriores; só recarrega se o arquivo de pesos mudar
+            model = carregar_modelo(weights_path, backend=backend)
             model.classes = [0, 1, 2, 3]  # Limite às classes de interesse
             model.conf = 0.5
         except Exception as e:
-            console.print(f'[bold red]❌ Erro ao carregar o modelo:[/] {str(e)}')
+            console.print(
+                f'[bold red]❌ Erro ao carregar o modelo:[/] {str(e)}'
+            )
             return
 
     # Modo WEBCAM/VÍDEO
@@ -230,77 +287,89 @@ def run_pose_monitoring(  # noqa: PLR0912, PLR0914, PLR0915
         return
 
     console.print('\n📊 Configurações:')
-    console.print(f'- Captura durante 20 segundos com intervalo de 1 segundo entre cada frame')
-    console.print(f'- Classes detectadas: {[CLASSES_DETECTADAS[c] for c in model.classes]}')
+    console.print(
+        f'- Captura durante {janela_segundos} segundos com'
+        + f' {taxa_amostragem} frame(s) por segundo'
+    )
+    console.print(
+        f'- Classes detectadas: {[CLASSES_DETECTADAS[c] for c in model.classes]}'
+    )
 
-    frame_rate = 1  # Definindo 1 FPS (intervalo de 1 segundo entre capturas)
-    duration = 20  # Captura por 20 segundos
+    # Amostragem sem deriva: os frames entre prazos são descartados com
+    # grab() e só o frame de cada prazo é decodificado
+    amostrador = AmostradorFrames(
+        cap, taxa_amostragem, janela_segundos, ao_vivo=midia_path == '0'
+    )
     start_time = time.time()
+    renderizador = RenderizadorAnotacoes(
+        'Sistema de Monitoramento de Poses - Deteccao em Tempo Real'
+    )
 
     with Progress(console=console) as progress:
         task = progress.add_task(
             '[cyan]Processando frames...[/cyan] [yellow](Pressione q para terminar)[/yellow]',
-            total=duration,
+            total=janela_segundos,
         )
 
-        while cap.isOpened():
-            current_time = time.time()
-            elapsed = current_time - start_time
-            progress.update(task, completed=min(elapsed, duration))
-
-            if elapsed >= duration:
-                break
-
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            # Controlando o FPS: espera até o próximo intervalo
-            time.sleep(frame_rate)
+        for _, instante, frame in amostrador.amostras():
+            progress.update(task, completed=min(instante, janela_segundos))
 
             frame_count += 1
-            results = model(frame, verbose=False)[0]
-            person_detected = False
-            best_confidence = 0
-            best_pose = POSE_NAO_DETECTADA
-
-            if annotated_frame_cv2:
-                annotated_frame = results.plot()
-                cv2.imshow('Sistema de Monitoramento de Poses - Deteccao em Tempo Real', annotated_frame)
-                key = cv2.waitKey(1) & 0xFF
+            results = inferir_lote(model, [frame])[0]
+
+            if annotated_frame_cv2 and renderizador.pronto_para_exibir():
+                annotated_frame = renderizador.desenhar(frame, results)
+                key = renderizador.mostrar(annotated_frame)
                 if key == ord('q'):
-                    console.print('\n❌ Monitoramento interrompido pela janela do OpenCV.')
+                    console.print(
+                        '\n❌ Monitoramento interrompido pela janela do OpenCV.'
+                    )
                     break
 
-            for detection in results.boxes.data:
-                class_id = int(detection[5])
-                confidence = float(detection[4])
-
-                if class_id in CLASSES_DETECTADAS:
-                    person_detected = True
-                    if confidence > best_confidence:
-                        best_confidence = confidence
-                        best_pose = CLASSES_DETECTADAS[class_id]
-
-            detected_pose_this_frame = best_pose if person_detected else POSE_NAO_DETECTADA
+            # Detecção mais confiante entre as classes conhecidas
+            detected_pose_this_frame, _ = selecionar_pose(results)
             pose_durations[detected_pose_this_frame] += 1
 
     # Finalização e relatório
     cap.release()
     cv2.destroyAllWindows()
     end_time = time.time()
-    total_time = end_time - start_time
+    # Em arquivos cada amostra representa um intervalo de tempo da mídia
+    if midia_path == '0':
+        total_time = end_time - start_time
+    else:
+        total_time = frame_count * amostrador.intervalo
+    console.print(
+        f'🎞️ Frames decodificados: [bold]{amostrador.frames_decodificados}[/]'
+        + f' de {amostrador.frames_capturados} capturados'
+        + f' | amostras perdidas: [bold]{amostrador.amostras_perdidas}[/]'
+    )
 
     # Salvar CSV e JSON
-    csv_path, json_path = salvar_csv_json_relatorio(pose_durations, total_time, output_dir, origem='video')
+    linhas = montar_linhas_relatorio(pose_durations, total_time)
+    csv_path, json_path = salvar_csv_json_relatorio(
+        linhas, output_dir, origem='video'
+    )
     console.print(f'💾 CSV salvo em: [bold]{os.path.abspath(csv_path)}[/]')
     console.print(f'💾 JSON salvo em: [bold]{os.path.abspath(json_path)}[/]')
 
-    # Tentar Enviar JSON para o servidor
-    try:
-        enviar_json_para_servidor(json_path, server_url)
-    except Exception as e:
-        console.print(f'[bold red]❌ Erro ao tentar enviar o JSON para o servidor: {str(e)}[/]')
+    # Envio em segundo plano, direto da memória: o próximo ciclo de
+    # monitoramento não espera pelo servidor
+    enviador_local = enviador is None
+    if enviador_local:
+        enviador = EnviadorRelatorios(
+            server_url, os.path.join(output_dir, 'spool')
+        )
+    nome_relatorio = os.path.splitext(os.path.basename(json_path))[0]
+    enviador.enviar(linhas, nome_relatorio)
+    console.print(
+        f'🌐 Envio agendado para {server_url}'
+        + f' (enviados: {enviador.enviados}, falhas: {enviador.falhas},'
+        + f' rejeitados: {enviador.rejeitados},'
+        + f' no spool: {enviador.pendentes_spool()})'
+    )
+    if enviador_local:
+        enviador.encerrar()
 
     return pose_durations
 
@@ -313,25 +382,33 @@ if __name__ == '__main__':
             pyi_splash.close()
 
         # Perguntar apenas uma vez se deseja iniciar o monitoramento
-        midia_path, weights_path, annotated_frame_cv2, output_dir, server_url = get_user_parameters(config)
+        parametros = get_user_parameters(config)
 
         console.print('\n✨ Iniciando com as configurações:')
-        console.print(f'📦 Fonte: {midia_path}')
-        console.print(f'🎯 Arquivo de pesos: {weights_path}')
-        console.print(f'📁 Diretório de saída: {output_dir}')
-        console.print(f'🌐 Envio do JSON para: {server_url}')
-
-        while True:  # Loop contínuo para o monitoramento
-            _ = run_pose_monitoring(
-                midia_path,
-                weights_path,
-                annotated_frame_cv2,
-                output_dir,
-                server_url
-            )
+        console.print(f'📦 Fonte: {parametros.midia_path}')
+        console.print(f'🎯 Arquivo de pesos: {parametros.weights_path}')
+        console.print(f'⚙️ Backend: {parametros.backend}')
+        console.print(f'📁 Diretório de saída: {parametros.output_dir}')
+        console.print(f'🌐 Envio do JSON para: {parametros.server_url}')
+
+        # Um único enviador para todos os ciclos: conexões reaproveitadas
+        # e spool esvaziado em segundo plano
+        enviador = EnviadorRelatorios(
+            parametros.server_url,
+            os.path.join(parametros.output_dir, 'spool'),
+        )
+        try:
+            while True:  # Loop contínuo para o monitoramento
+                _ = run_pose_monitoring(
+                    **asdict(parametros), enviador=enviador
+                )
+        finally:
+            enviador.encerrar(timeout=5)
 
     except KeyboardInterrupt:
-        console.print('\n\n❌ Monitoramento interrompido pelo usuário', style='bold red')
+        console.print(
+            '\n\n❌ Monitoramento interrompido pelo usuário', style='bold red'
+        )
     except Exception as e:
         console.print(f'\n\n❌ Erro inesperado: {str(e)}', style='bold red')
         console.print(f'[bold red]Detalhes do erro: {repr(e)}[/]')
@@ -0,0 +1,84 @@
+import cv2
+
+from constants import (
+    INTERVALO_MAXIMO_SEM_INFERENCIA,
+    LARGURA_MOVIMENTO,
+    LIMIAR_MOVIMENTO_AREA,
+    LIMIAR_MOVIMENTO_PIXEL,
+)
+
+
+class DetectorMovimento:
+    """
+    Detector de movimento barato usado antes da inferência.
+
+    Cada frame é reduzido para LARGURA_MOVIMENTO pixels de largura, convertido
+    para tons de cinza e comparado com o frame da última inferência. Se a
+    fração de pixels alterados ficar abaixo de limiar_area a cena é
+    considerada parada e a detecção anterior pode ser reutilizada.
+    """
+
+    def __init__(
+        self,
+        limiar_pixel=LIMIAR_MOVIMENTO_PIXEL,
+        limiar_area=LIMIAR_MOVIMENTO_AREA,
+        largura=LARGURA_MOVIMENTO,
+        intervalo_maximo=INTERVALO_MAXIMO_SEM_INFERENCIA,
+    ):
+        self.limiar_pixel = limiar_pixel
+        self.limiar_area = limiar_area
+        self.largura = largura
+        self.intervalo_maximo = intervalo_maximo
+
+        self._referencia = None
+        self._frames_sem_inferencia = 0
+
+        self.frames_avaliados = 0
+        self.inferencias_puladas = 0
+
+    def _reduzir(self, frame):
+        altura, largura = frame.shape[:2]
+        escala = self.largura / largura
+        pequeno = cv2.resize(
+            frame,
+            (self.largura, max(int(altura * escala), 1)),
+            interpolation=cv2.INTER_AREA,
+        )
+        cinza = cv2.cvtColor(pequeno, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(cinza, (5, 5), 0)
+
+    def houve_mudanca(self, frame):
+        """
+        Retorna True quando o frame precisa passar pela inferência: não há
+        referência, a cena mudou além do limiar ou o intervalo máximo sem
+        inferência foi atingido.
+        """
+        self.frames_avaliados += 1
+        atual = self._reduzir(frame)
+
+        if (
+            self._referencia is None
+            or self._referencia.shape != atual.shape
+            or self._frames_sem_inferencia >= self.intervalo_maximo
+        ):
+            mudou = True
+        else:
+            diferenca = cv2.absdiff(atual, self._referencia)
+            _, mascara = cv2.threshold(
+                diferenca, self.limiar_pixel, 255, cv2.THRESH_BINARY
+            )
+            fracao = cv2.countNonZero(mascara) / mascara.size
+            mudou = fracao >= self.limiar_area
+
+        if mudou:
+            self._referencia = atual
+            self._frames_sem_inferencia = 0
+        else:
+            self._frames_sem_inferencia += 1
+            self.inferencias_puladas += 1
+        return mudou
+
+    def taxa_economia(self):
+        if self.frames_avaliados == 0:
+            return 0.0
+        return self.inferencias_puladas / self.frames_avaliados
@@ -0,0 +1,323 @@
+import argparse
+import os
+import time
+
+import cv2
+from rich.console import Console
+from rich.progress import Progress
+from rich.table import Table
+
+from captura import CapturaStream, CapturaUltimoFrame, eh_stream
+from constants import (
+    ARQUIVO_PESOS,
+    BACKEND_PADRAO,
+    BACKENDS_INFERENCIA,
+    CLASSES_DETECTADAS,
+    DURACAO_PADRAO,
+    POSE_NAO_DETECTADA,
+)
+from deteccao import contabilizar_poses, selecionar_poses
+from inferencia import inferir_lote
+from linha_tempo import LinhaTempoPoses
+from modelos import carregar_modelo
+from relatorios import salvar_csv_relatorio
+
+# Frames por lote do escalonador (no máximo um por câmera em cada lote)
+TAMANHO_LOTE_MAXIMO = 8
+ESPERA_ESCALONADOR = 0.005  # s de espera quando nenhuma câmera tem frame
+
+console = Console()
+
+
+class Camera:
+    """
+    Estado de uma câmera no orquestrador: captura em thread própria (só o
+    frame mais recente, ou todos em arquivos), contagem de poses e linha
+    do tempo independentes das demais câmeras.
+    """
+
+    def __init__(self, nome, fonte):
+        self.nome = nome
+        self.fonte = fonte
+        self.ao_vivo = fonte == '0' or eh_stream(fonte)
+        if eh_stream(fonte):
+            self.captura = CapturaStream(fonte)
+        else:
+            cap = cv2.VideoCapture(0 if fonte == '0' else fonte)
+            self.captura = CapturaUltimoFrame(
+                cap, descartar_frames=self.ao_vivo
+            )
+
+        self.pose_durations = dict.fromkeys(CLASSES_DETECTADAS.values(), 0)
+        self.pose_durations[POSE_NAO_DETECTADA] = 0
+        self.linha_tempo = LinhaTempoPoses()
+        self.frames = 0
+
+    @property
+    def aberta(self):
+        return self.captura.cap.isOpened()
+
+    @property
+    def encerrada(self):
+        return self.captura.encerrada
+
+    def ler_pendente(self):
+        """
+        Retorna (frame, instante) se houver um frame novo, sem bloquear.
+        """
+        ret, frame = self.captura.ler(timeout=0)
+        if not ret:
+            return None
+        instante = (
+            self.captura.instante_captura
+            if self.ao_vivo
+            else self.captura.timestamp_ms / 1000
+        )
+        return frame, instante
+
+    def registrar(self, instante, selecao):
+        contabilizar_poses(self.pose_durations, [selecao])
+        self.linha_tempo.registrar(instante, *selecao)
+        self.frames += 1
+
+    def finalizar(self):
+        self.captura.parar()
+        self.captura.cap.release()
+        fps = self.captura.fps
+        self.linha_tempo.finalizar(1 / fps if fps > 0 else 0.0)
+
+
+class EscalonadorCameras:
+    """
+    Monta lotes para um único modelo com frames de várias câmeras.
+
+    Cada lote leva no máximo um frame (o mais recente) de cada câmera, e a
+    câmera por onde a varredura começa avança a cada lote: com mais câmeras
+    que tamanho_lote, todas são atendidas em rodízio e nenhuma fica sem
+    inferência porque as outras têm frames sempre prontos.
+    """
+
+    def __init__(self, cameras, tamanho_lote=TAMANHO_LOTE_MAXIMO):
+        self.cameras = cameras
+        self.tamanho_lote = tamanho_lote
+        self._inicio = 0
+
+        self.lotes = 0
+        self.frames_inferidos = 0
+
+    def ativas(self):
+        return [c for c in self.cameras if not c.encerrada]
+
+    def proximo_lote(self):
+        """
+        Lista de (camera, frame, instante) com os frames prontos agora.
+        """
+        lote = []
+        quantidade = len(self.cameras)
+        for passo in range(quantidade):
+            camera = self.cameras[(self._inicio + passo) % quantidade]
+            pendente = camera.ler_pendente()
+            if pendente is not None:
+                lote.append((camera, *pendente))
+            if len(lote) >= self.tamanho_lote:
+                break
+        if lote:
+            # A próxima varredura começa depois da última câmera atendida
+            ultima = self.cameras.index(lote[-1][0])
+            self._inicio = (ultima + 1) % quantidade
+            self.lotes += 1
+            self.frames_inferidos += len(lote)
+        return lote
+
+
+def interpretar_cameras(pares):
+    """
+    Converte pares 'nome=fonte' (fonte: webcam '0', URL de stream ou
+    arquivo) na lista de (nome, fonte) usada por monitorar_cameras.
+    """
+    cameras = []
+    for par in pares:
+        nome, separador, fonte = par.partition('=')
+        if not separador or not nome.strip() or not fonte.strip():
+            raise ValueError(f'Câmera inválida: {par!r} (use nome=fonte)')
+        cameras.append((nome.strip(), fonte.strip()))
+    if not cameras:
+        raise ValueError('Nenhuma câmera informada')
+    nomes = [nome for nome, _ in cameras]
+    if len(set(nomes)) != len(nomes):
+        raise ValueError('Os nomes das câmeras precisam ser únicos')
+    return cameras
+
+
+def monitorar_cameras(  # noqa: PLR0913, PLR0917
+    fontes,
+    weights_path=ARQUIVO_PESOS,
+    backend=BACKEND_PADRAO,
+    duracao=DURACAO_PADRAO,
+    tamanho_lote=TAMANHO_LOTE_MAXIMO,
+    ao_lote=None,
+):
+    """
+    Monitora as câmeras (lista de (nome, fonte)) com um único modelo
+    carregado uma vez. As capturas rodam em threads e o escalonador junta
+    os frames prontos de todas elas em lotes. Termina após duracao
+    segundos, com Ctrl+C ou quando todas as fontes acabarem (arquivos).
+    ao_lote(escalonador, decorrido_s) é chamada após cada lote.
+
+    Retorna (cameras, escalonador): cada Camera com pose_durations,
+    linha_tempo e os contadores da própria captura.
+    """
+    model = carregar_modelo(weights_path, backend=backend)
+    cameras = [Camera(nome, fonte) for nome, fonte in fontes]
+    fechadas = [c.nome for c in cameras if not c.aberta]
+    if fechadas:
+        for camera in cameras:
+            camera.captura.cap.release()
+        raise RuntimeError(
+            'Não foi possível abrir as câmeras: ' + ', '.join(fechadas)
+        )
+
+    escalonador = EscalonadorCameras(cameras, tamanho_lote)
+    for camera in cameras:
+        camera.captura.iniciar()
+
+    inicio = time.monotonic()
+    try:
+        while escalonador.ativas():
+            decorrido = time.monotonic() - inicio
+            if decorrido >= duracao:
+                break
+            lote = escalonador.proximo_lote()
+            if not lote:
+                time.sleep(ESPERA_ESCALONADOR)
+                continue
+
+            resultados = inferir_lote(model, [frame for _, frame, _ in lote])
+            selecoes = selecionar_poses(resultados)
+            for (camera, _, instante), selecao in zip(lote, selecoes):
+                camera.registrar(instante, selecao)
+            if ao_lote is not None:
+                ao_lote(escalonador, decorrido)
+    except KeyboardInterrupt:
+        # Ctrl+C encerra o monitoramento sem perder o relatório
+        console.print('\n❌ Monitoramento interrompido pelo usuário')
+    finally:
+        for camera in cameras:
+            camera.finalizar()
+    return cameras, escalonador
+
+
+def tabela_cameras(cameras, tempo_total):
+    table = Table(title='📷 Câmeras')
+    table.add_column('Câmera', style='cyan')
+    table.add_column('Frames', justify='right')
+    table.add_column('Frames/s', justify='right')
+    table.add_column('Descartados', justify='right')
+    table.add_column('Idade máx. (s)', justify='right')
+    table.add_column('Pose predominante')
+    for camera in cameras:
+        resumo = camera.linha_tempo.resumo()
+        predominante = max(resumo, key=lambda linha: linha[1], default=None)
+        table.add_row(
+            camera.nome,
+            str(camera.frames),
+            f'{camera.frames / max(tempo_total, 1e-9):.1f}',
+            str(camera.captura.frames_descartados),
+            f'{camera.captura.idade_maxima:.2f}',
+            predominante[0] if predominante else '-',
+        )
+    return table
+
+
+def tabela_poses(camera):
+    table = Table(title=f'📊 Poses - {camera.nome}')
+    table.add_column('Pose', style='cyan')
+    table.add_column('Duração (min)', justify='right')
+    table.add_column('Porcentagem', justify='right')
+    for pose, duracao_s, percentage in camera.linha_tempo.resumo():
+        table.add_row(pose, f'{duracao_s / 60:.2f}', f'{percentage:.1f}%')
+    return table
+
+
+def relatar_cameras(cameras, escalonador, tempo_total, output_dir):
+    """
+    Exibe as poses de cada câmera e o resumo das câmeras e do escalonador,
+    salvando os CSVs de cada câmera em output_dir.
+    """
+    for camera in cameras:
+        console.print(tabela_poses(camera))
+        csv_path, linha_tempo_path = salvar_csv_relatorio(
+            camera.linha_tempo, output_dir, origem=camera.nome
+        )
+        console.print(
+            f'💾 {camera.nome}: [bold]{os.path.abspath(csv_path)}[/]'
+            + ' | linha do tempo:'
+            + f' [bold]{os.path.abspath(linha_tempo_path)}[/]'
+        )
+    console.print(tabela_cameras(cameras, tempo_total))
+    console.print(
+        f'🧮 Lotes: [bold]{escalonador.lotes}[/]'
+        + ' | frames por lote: [bold]'
+        + f'{escalonador.frames_inferidos / max(escalonador.lotes, 1):.1f}[/]'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Monitora várias câmeras com um único modelo'
+        ' compartilhado.'
+    )
+    parser.add_argument(
+        'cameras',
+        nargs='+',
+        metavar='nome=fonte',
+        help='câmera e sua fonte (0, URL de stream ou arquivo)',
+    )
+    parser.add_argument('--pesos', default=ARQUIVO_PESOS)
+    parser.add_argument(
+        '--backend', choices=list(BACKENDS_INFERENCIA), default=BACKEND_PADRAO
+    )
+    parser.add_argument(
+        '--duracao',
+        type=float,
+        default=DURACAO_PADRAO / 60,
+        help='duração em minutos',
+    )
+    parser.add_argument(
+        '--output-dir', default=os.path.join('.', 'relatorios')
+    )
+    parser.add_argument(
+        '--lote',
+        type=int,
+        default=TAMANHO_LOTE_MAXIMO,
+        help='frames por lote',
+    )
+    args = parser.parse_args()
+    try:
+        fontes = interpretar_cameras(args.cameras)
+    except ValueError as e:
+        parser.error(str(e))
+    duracao = args.duracao * 60
+
+    console.print(
+        f'📷 {len(fontes)} câmeras | backend: {args.backend}'
+        + f' | duração: {duracao / 60:.1f} minutos'
+    )
+    inicio = time.time()
+    with Progress(console=console) as progress:
+        task = progress.add_task(
+            '[cyan]Monitorando câmeras...[/cyan]', total=duracao
+        )
+        cameras, escalonador = monitorar_cameras(
+            fontes,
+            args.pesos,
+            args.backend,
+            duracao,
+            args.lote,
+            ao_lote=lambda _, decorrido: progress.update(
+                task, completed=min(decorrido, duracao)
+            ),
+        )
+    tempo_total = time.time() - inicio
+
+    relatar_cameras(cameras, escalonador, tempo_total, args.output_dir)
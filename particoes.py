@@ -0,0 +1,172 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+from backends import exportar_modelo
+from captura import CapturaUltimoFrame
+from constants import BACKEND_PADRAO, CLASSES_DETECTADAS, POSE_NAO_DETECTADA
+from deteccao import contabilizar_poses, selecionar_poses
+from inferencia import inferir_lote, ler_lote
+from linha_tempo import LinhaTempoPoses
+from modelos import carregar_modelo
+
+# Partes por processo: partes menores equilibram a carga entre os processos
+# quando algum trecho do vídeo é mais lento de decodificar
+PARTES_POR_PROCESSO = 2
+TAMANHO_LOTE_PARTICAO = 4
+
+
+def dividir_em_partes(total_frames, quantidade):
+    """
+    Divide [0, total_frames) em até quantidade intervalos (inicio, fim)
+    contíguos. O último termina em None (até o fim do arquivo), pois
+    CAP_PROP_FRAME_COUNT é apenas uma estimativa em alguns formatos.
+    """
+    quantidade = max(min(quantidade, total_frames), 1)
+    limites = [total_frames * i // quantidade for i in range(quantidade + 1)]
+    partes = list(zip(limites[:-1], limites[1:]))
+    partes[-1] = (partes[-1][0], None)
+    return partes
+
+
+def _posicionar(cap, video_path, inicio):
+    """
+    Posiciona a captura no frame inicio. Se o backend não conseguir
+    posicionar exatamente, reabre o arquivo e avança com grab().
+    """
+    if inicio == 0:
+        return cap
+    cap.set(cv2.CAP_PROP_POS_FRAMES, inicio)
+    if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == inicio:
+        return cap
+    cap.release()
+    cap = cv2.VideoCapture(video_path)
+    for _ in range(inicio):
+        cap.grab()
+    return cap
+
+
+def _inicializar_processo(threads):
+    # Cada processo usa sua fatia dos núcleos, sem disputar com os demais
+    import torch  # noqa: PLC0415
+
+    torch.set_num_threads(threads)
+    cv2.setNumThreads(1)
+
+
+def processar_parte(
+    video_path, inicio, fim, caminho_modelo, tamanho_lote=TAMANHO_LOTE_PARTICAO
+):
+    """
+    Processa os frames [inicio, fim) do vídeo com captura e modelo próprios
+    e retorna (pose_durations, linha_tempo, frames, timestamp_final_ms).
+    caminho_modelo são os pesos ou o modelo já exportado para o backend.
+    """
+    # O processo principal já exportou o modelo: o arquivo é carregado
+    # como está, sem nova exportação
+    model = carregar_modelo(caminho_modelo, backend='pytorch')
+    cap = _posicionar(cv2.VideoCapture(video_path), video_path, inicio)
+    captura = CapturaUltimoFrame(
+        cap, descartar_frames=False, indice_inicial=inicio
+    )
+    pose_durations = dict.fromkeys(CLASSES_DETECTADAS.values(), 0)
+    pose_durations[POSE_NAO_DETECTADA] = 0
+    linha_tempo = LinhaTempoPoses()
+    frames_processados = 0
+    timestamp_final_ms = 0.0
+
+    with captura:
+        while True:
+            frames, instantes = ler_lote(
+                captura, tamanho_lote, tempo_midia=True
+            )
+            if fim is not None:
+                # O lote pode ter passado do fim da parte
+                excedentes = max(captura.indice_frame + 1 - fim, 0)
+                frames = frames[: len(frames) - excedentes]
+                instantes = instantes[: len(instantes) - excedentes]
+            if not frames:
+                break
+
+            selecoes = selecionar_poses(inferir_lote(model, frames))
+            contabilizar_poses(pose_durations, selecoes)
+            linha_tempo.registrar_lote(instantes, selecoes)
+            frames_processados += len(frames)
+            timestamp_final_ms = instantes[-1] * 1000
+
+            if fim is not None and captura.indice_frame + 1 >= fim:
+                break
+    cap.release()
+
+    return pose_durations, linha_tempo, frames_processados, timestamp_final_ms
+
+
+def processar_video_particionado(  # noqa: PLR0913, PLR0917
+    video_path,
+    weights_path,
+    processos=None,
+    backend=BACKEND_PADRAO,
+    tamanho_lote=TAMANHO_LOTE_PARTICAO,
+    ao_concluir_parte=None,
+):
+    """
+    Divide o vídeo em partes processadas por um pool de processos e junta
+    os resultados na ordem do vídeo. Retorna (pose_durations, linha_tempo,
+    frames, duracao_midia_s), iguais aos de uma execução sequencial sem
+    filtro de movimento. ao_concluir_parte(concluidas, total) é chamada a
+    cada parte terminada.
+    """
+    processos = processos or os.cpu_count() or 1
+    cap = cv2.VideoCapture(video_path)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+    cap.release()
+
+    partes = dividir_em_partes(total_frames, processos * PARTES_POR_PROCESSO)
+    # Exporta uma única vez antes de criar os processos, para que eles não
+    # gravem o mesmo artefato ONNX/OpenVINO ao mesmo tempo
+    caminho_modelo = exportar_modelo(weights_path, backend)
+    threads = max((os.cpu_count() or 1) // processos, 1)
+    resultados = [None] * len(partes)
+
+    with ProcessPoolExecutor(
+        max_workers=processos,
+        initializer=_inicializar_processo,
+        initargs=(threads,),
+    ) as executor:
+        futuros = {
+            executor.submit(
+                processar_parte,
+                video_path,
+                inicio,
+                fim,
+                caminho_modelo,
+                tamanho_lote,
+            ): i
+            for i, (inicio, fim) in enumerate(partes)
+        }
+        for concluidas, futuro in enumerate(as_completed(futuros), 1):
+            resultados[futuros[futuro]] = futuro.result()
+            if ao_concluir_parte is not None:
+                ao_concluir_parte(concluidas, len(partes))
+
+    pose_durations = dict.fromkeys(CLASSES_DETECTADAS.values(), 0)
+    pose_durations[POSE_NAO_DETECTADA] = 0
+    linha_tempo = LinhaTempoPoses()
+    frames = 0
+    timestamp_final_ms = 0.0
+    for duracoes_parte, linha_parte, frames_parte, timestamp_ms in resultados:
+        for pose, quantidade in duracoes_parte.items():
+            pose_durations[pose] += quantidade
+        linha_tempo.anexar(linha_parte)
+        frames += frames_parte
+        if frames_parte:
+            timestamp_final_ms = timestamp_ms
+
+    duracao_frame = 1 / fps if fps > 0 else 0.0
+    linha_tempo.finalizar(duracao_frame)
+    duracao_midia = 0.0
+    if frames:
+        duracao_midia = timestamp_final_ms / 1000 + duracao_frame
+    return pose_durations, linha_tempo, frames, duracao_midia
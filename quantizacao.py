@@ -0,0 +1,250 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+import yaml
+from rich.console import Console
+from rich.table import Table
+from ultralytics import YOLO
+
+from backends import caminho_exportado
+from constants import ARQUIVO_PESOS, BASE_DIR, CLASSES_DETECTADAS
+
+# Dataset usado na calibração (train) e na avaliação (valid/test)
+DATASET_QUANTIZACAO = BASE_DIR / 'downloads' / 'YOLOElderlyPose.v3i.yolov11'
+BACKEND_QUANTIZADO = 'openvino-int8'
+TAMANHO_QUANTIZACAO = 640
+
+# Orçamento de precisão: quedas absolutas máximas de mAP50-95 em relação
+# ao modelo FP32, no geral e em cada classe
+QUEDA_MAXIMA_MAP = 0.01
+QUEDA_MAXIMA_CLASSE = 0.03
+
+ARQUIVO_RELATORIO = 'relatorio_quantizacao.json'
+
+console = Console()
+
+
+def _gravar_yaml_dataset(destino, dataset, split_val):
+    """
+    Grava um data.yaml com caminhos absolutos (o do Roboflow usa caminhos
+    relativos como ../train/images) apontando 'val' para split_val.
+    """
+    with open(os.path.join(dataset, 'data.yaml'), encoding='utf-8') as f:
+        original = yaml.safe_load(f)
+    with open(destino, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(
+            {
+                'path': str(dataset),
+                'train': 'train/images',
+                'val': split_val,
+                'test': 'test/images',
+                'nc': original['nc'],
+                'names': original['names'],
+            },
+            f,
+            allow_unicode=True,
+        )
+    return destino
+
+
+def avaliar_modelo(model_path, data_yaml, imgsz=TAMANHO_QUANTIZACAO):
+    """
+    Valida o modelo no split 'val' do data.yaml e retorna mAP50, mAP50-95 e
+    o mAP50-95 de cada classe.
+    """
+    metricas = YOLO(model_path).val(
+        data=data_yaml, imgsz=imgsz, batch=1, plots=False, verbose=False
+    )
+    return {
+        'map50': float(metricas.box.map50),
+        'map': float(metricas.box.map),
+        'classes': {
+            nome: float(metricas.box.maps[i])
+            for i, nome in CLASSES_DETECTADAS.items()
+        },
+    }
+
+
+def violacoes_orcamento(
+    fp32,
+    int8,
+    queda_maxima_map=QUEDA_MAXIMA_MAP,
+    queda_maxima_classe=QUEDA_MAXIMA_CLASSE,
+):
+    """
+    Lista as métricas em que o modelo INT8 perdeu mais que o permitido.
+    """
+    violacoes = []
+    queda = fp32['map'] - int8['map']
+    if queda > queda_maxima_map:
+        violacoes.append(f'mAP50-95 caiu {queda:.4f}')
+    for nome, valor in fp32['classes'].items():
+        queda = valor - int8['classes'][nome]
+        if queda > queda_maxima_classe:
+            violacoes.append(f'{nome}: mAP50-95 caiu {queda:.4f}')
+    return violacoes
+
+
+def _substituir_modelo(exportado, destino):
+    """
+    Troca o modelo em destino pelo exportado. A cópia é feita primeiro para
+    um diretório ao lado do destino, de modo que o modelo anterior só é
+    removido depois que o novo está completo no lugar.
+    """
+    novo = destino + '.novo'
+    antigo = destino + '.antigo'
+    shutil.rmtree(novo, ignore_errors=True)
+    shutil.rmtree(antigo, ignore_errors=True)
+    shutil.copytree(exportado, novo)
+    if os.path.exists(destino):
+        os.replace(destino, antigo)
+    os.replace(novo, destino)
+    shutil.rmtree(antigo, ignore_errors=True)
+
+
+def quantizar_int8(  # noqa: PLR0913, PLR0917
+    weights_path=ARQUIVO_PESOS,
+    dataset=DATASET_QUANTIZACAO,
+    split='valid',
+    imgsz=TAMANHO_QUANTIZACAO,
+    queda_maxima_map=QUEDA_MAXIMA_MAP,
+    queda_maxima_classe=QUEDA_MAXIMA_CLASSE,
+):
+    """
+    Quantiza os pesos para INT8 (OpenVINO/NNCF) calibrando com as imagens de
+    treino do dataset e compara com o FP32 no split informado ('valid' ou
+    'test'). O modelo só é mantido ao lado dos pesos, onde o backend
+    'openvino-int8' o encontra, se a queda de precisão couber no orçamento.
+    """
+    destino = caminho_exportado(weights_path, BACKEND_QUANTIZADO)
+
+    with tempfile.TemporaryDirectory() as temporario:
+        # O ultralytics calibra com o split 'val' do data.yaml: aqui ele
+        # aponta para as imagens de treino
+        yaml_calibracao = _gravar_yaml_dataset(
+            os.path.join(temporario, 'calibracao.yaml'),
+            dataset,
+            'train/images',
+        )
+        yaml_avaliacao = _gravar_yaml_dataset(
+            os.path.join(temporario, 'avaliacao.yaml'),
+            dataset,
+            f'{split}/images',
+        )
+
+        # O ultralytics grava o modelo exportado ao lado dos pesos, que é o
+        # destino do modelo aprovado: exporta a partir de uma cópia para
+        # não sobrescrevê-lo antes de conferir o orçamento
+        pesos_exportacao = weights_path
+        if os.path.exists(weights_path):
+            pesos_exportacao = shutil.copy2(weights_path, temporario)
+        exportado = str(
+            YOLO(pesos_exportacao).export(
+                format='openvino', int8=True, data=yaml_calibracao, imgsz=imgsz
+            )
+        )
+
+        fp32 = avaliar_modelo(weights_path, yaml_avaliacao, imgsz)
+        int8 = avaliar_modelo(exportado, yaml_avaliacao, imgsz)
+
+        violacoes = violacoes_orcamento(
+            fp32, int8, queda_maxima_map, queda_maxima_classe
+        )
+        resumo = {
+            'pesos': os.path.abspath(weights_path),
+            'dataset': str(dataset),
+            'split': split,
+            'imgsz': imgsz,
+            'queda_maxima_map': queda_maxima_map,
+            'queda_maxima_classe': queda_maxima_classe,
+            'fp32': fp32,
+            'int8': int8,
+            'violacoes': violacoes,
+            'aprovado': not violacoes,
+            'modelo': None,
+        }
+        if violacoes:
+            # Fora do orçamento: o modelo aprovado antes, se houver, fica
+            # intacto e o novo some com o diretório temporário
+            return resumo
+
+        with open(
+            os.path.join(exportado, ARQUIVO_RELATORIO), 'w', encoding='utf-8'
+        ) as f:
+            json.dump(
+                resumo | {'modelo': destino}, f, ensure_ascii=False, indent=2
+            )
+        _substituir_modelo(exportado, destino)
+
+    resumo['modelo'] = destino
+    return resumo
+
+
+def tabela_quantizacao(resumo):
+    table = Table(title='🗜️ Quantização INT8 x FP32')
+    table.add_column('Métrica', style='cyan')
+    table.add_column('FP32', justify='right')
+    table.add_column('INT8', justify='right')
+    table.add_column('Queda', justify='right')
+
+    linhas = [('mAP50', 'map50'), ('mAP50-95', 'map')]
+    for nome, chave in linhas:
+        fp32, int8 = resumo['fp32'][chave], resumo['int8'][chave]
+        table.add_row(
+            nome, f'{fp32:.4f}', f'{int8:.4f}', f'{fp32 - int8:+.4f}'
+        )
+    for nome, fp32 in resumo['fp32']['classes'].items():
+        int8 = resumo['int8']['classes'][nome]
+        table.add_row(
+            f'mAP50-95 {nome}',
+            f'{fp32:.4f}',
+            f'{int8:.4f}',
+            f'{fp32 - int8:+.4f}',
+        )
+    return table
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Quantiza o modelo para INT8 e só o mantém se a queda de'
+        ' precisão couber no orçamento.'
+    )
+    parser.add_argument('--pesos', default=ARQUIVO_PESOS)
+    parser.add_argument('--dataset', default=str(DATASET_QUANTIZACAO))
+    parser.add_argument('--split', choices=['valid', 'test'], default='valid')
+    parser.add_argument('--imgsz', type=int, default=TAMANHO_QUANTIZACAO)
+    parser.add_argument(
+        '--queda-maxima-map', type=float, default=QUEDA_MAXIMA_MAP
+    )
+    parser.add_argument(
+        '--queda-maxima-classe', type=float, default=QUEDA_MAXIMA_CLASSE
+    )
+    args = parser.parse_args()
+
+    with console.status('[bold green]Calibrando e avaliando o modelo INT8...'):
+        resumo = quantizar_int8(
+            args.pesos,
+            args.dataset,
+            args.split,
+            args.imgsz,
+            args.queda_maxima_map,
+            args.queda_maxima_classe,
+        )
+
+    console.print(tabela_quantizacao(resumo))
+    if resumo['aprovado']:
+        console.print(
+            '[bold green]✓ Modelo INT8 dentro do orçamento, salvo em:[/]'
+            + f' [bold]{os.path.abspath(resumo["modelo"])}[/]'
+        )
+        console.print(
+            f"⚙️ Use o backend '{BACKEND_QUANTIZADO}' no monitoramento."
+        )
+    else:
+        console.print('[bold red]❌ Modelo INT8 descartado:[/]')
+        for violacao in resumo['violacoes']:
+            console.print(f'  - {violacao}')
+        raise SystemExit(1)
@@ -0,0 +1,236 @@
+import cv2
+import lap
+import numpy as np
+
+from constants import (
+    CONCORDANCIA_RASTREAMENTO_ESTAVEL,
+    CONCORDANCIA_RASTREAMENTO_MINIMA,
+    INTERVALO_DETECCAO_MAXIMO,
+    INTERVALO_DETECCAO_PADRAO,
+    IOU_ASSOCIACAO,
+    LADO_MINIMO_CAIXA,
+    LARGURA_RASTREAMENTO,
+    LIMIAR_DESLOCAMENTO,
+    LIMIAR_PONTOS_PERDIDOS,
+)
+from deteccao import COLUNA_CLASSE, dados_deteccoes
+
+PONTOS_POR_CAIXA = 20
+PARAMETROS_FLUXO = {
+    'winSize': (15, 15),
+    'maxLevel': 2,
+    'criteria': (cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
+}
+
+
+def matriz_iou(caixas_a, caixas_b):
+    """
+    IoU entre cada caixa de caixas_a (N, 4) e de caixas_b (M, 4), em uma
+    matriz (N, M).
+    """
+    a = caixas_a[:, None, :4]
+    b = caixas_b[None, :, :4]
+    largura = np.clip(
+        np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]),
+        0,
+        None,
+    )
+    altura = np.clip(
+        np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]),
+        0,
+        None,
+    )
+    intersecao = largura * altura
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return intersecao / np.maximum(area_a + area_b - intersecao, 1e-9)
+
+
+def associar(previstas, novas, iou_minimo=IOU_ASSOCIACAO):
+    """
+    Associa as caixas previstas pelo rastreamento às novas detecções
+    (atribuição linear com lap sobre o custo 1 - IoU) e retorna a lista de
+    pares (i, j). Pares com IoU abaixo de iou_minimo ficam de fora.
+    """
+    if not len(previstas) or not len(novas):
+        return []
+    custo = 1 - matriz_iou(previstas, novas).astype(np.float64)
+    _, linhas, _ = lap.lapjv(
+        custo, extend_cost=True, cost_limit=1 - iou_minimo
+    )
+    return [(i, int(j)) for i, j in enumerate(linhas) if j >= 0]
+
+
+class RastreadorPoses:
+    """
+    Roda o detector a cada N frames e, entre as detecções, leva as caixas e
+    os rótulos de pose adiante com fluxo óptico (Lucas-Kanade) sobre frames
+    reduzidos para LARGURA_RASTREAMENTO pixels de largura.
+
+    N se adapta: a cada detecção as caixas propagadas são comparadas com as
+    novas; se quase todas concordam (mesma pose e IoU suficiente) o
+    intervalo cresce um frame, se muitas divergem ele cai pela metade. Uma
+    detecção também é antecipada quando o rastreamento perde pontos demais
+    ou uma caixa se desloca muito entre dois frames.
+    """
+
+    def __init__(
+        self,
+        intervalo=INTERVALO_DETECCAO_PADRAO,
+        intervalo_maximo=INTERVALO_DETECCAO_MAXIMO,
+        largura=LARGURA_RASTREAMENTO,
+    ):
+        self.intervalo = intervalo
+        self.intervalo_maximo = intervalo_maximo
+        self.largura = largura
+
+        self._deteccoes = np.empty((0, 6), dtype=np.float32)
+        self._pontos = []
+        self._cinza = None
+        self._escala = 1.0
+        self._frames_desde_deteccao = 0
+        self._forcar = True
+
+        self.deteccoes = 0
+        self.frames_rastreados = 0
+        self.deteccoes_antecipadas = 0
+
+    def _reduzir(self, frame):
+        altura, largura = frame.shape[:2]
+        self._escala = self.largura / largura
+        pequeno = cv2.resize(
+            frame,
+            (self.largura, max(int(altura * self._escala), 1)),
+            interpolation=cv2.INTER_AREA,
+        )
+        return cv2.cvtColor(pequeno, cv2.COLOR_BGR2GRAY)
+
+    def _pontos_caixa(self, caixa):
+        altura, largura = self._cinza.shape
+        x1, y1, x2, y2 = (caixa[:4] * self._escala).astype(int)
+        x1, y1 = max(x1, 0), max(y1, 0)
+        x2, y2 = min(x2, largura), min(y2, altura)
+        if x2 - x1 < LADO_MINIMO_CAIXA or y2 - y1 < LADO_MINIMO_CAIXA:
+            return np.empty((0, 1, 2), dtype=np.float32)
+        pontos = cv2.goodFeaturesToTrack(
+            self._cinza[y1:y2, x1:x2],
+            maxCorners=PONTOS_POR_CAIXA,
+            qualityLevel=0.01,
+            minDistance=3,
+        )
+        if pontos is None:
+            return np.empty((0, 1, 2), dtype=np.float32)
+        return pontos + np.array([x1, y1], dtype=np.float32)
+
+    def deve_detectar(self):
+        """
+        Retorna True quando o próximo frame precisa passar pelo detector.
+        """
+        return (
+            self._forcar
+            or self._cinza is None
+            or self._frames_desde_deteccao >= self.intervalo
+        )
+
+    def concordancia(self, novas):
+        """
+        Fração das caixas (propagadas ou novas) associadas com a mesma pose.
+        """
+        previstas = self._deteccoes
+        if not len(previstas) and not len(novas):
+            return 1.0
+        pares = associar(previstas, novas)
+        iguais = sum(
+            previstas[i, COLUNA_CLASSE] == novas[j, COLUNA_CLASSE]
+            for i, j in pares
+        )
+        return iguais / max(len(previstas), len(novas))
+
+    def atualizar_deteccao(self, frame, resultado):
+        """
+        Registra a detecção do frame, ajusta o intervalo e reinicia os
+        pontos rastreados. Retorna as detecções em um array (N, 6).
+        """
+        novas = dados_deteccoes(resultado).copy()
+        if self._cinza is not None and self._frames_desde_deteccao:
+            concordancia = self.concordancia(novas)
+            if concordancia >= CONCORDANCIA_RASTREAMENTO_ESTAVEL:
+                self.intervalo = min(self.intervalo + 1, self.intervalo_maximo)
+            elif concordancia < CONCORDANCIA_RASTREAMENTO_MINIMA:
+                self.intervalo = max(self.intervalo // 2, 1)
+
+        self._cinza = self._reduzir(frame)
+        self._deteccoes = novas
+        self._pontos = [self._pontos_caixa(caixa) for caixa in novas]
+        self._frames_desde_deteccao = 0
+        self._forcar = False
+        self.deteccoes += 1
+        return novas
+
+    def propagar(self, frame):
+        """
+        Desloca cada caixa pela mediana do fluxo óptico de seus pontos e
+        retorna as detecções propagadas em um array (N, 6), com a pose e a
+        confiança da última detecção.
+        """
+        atual = self._reduzir(frame)
+        self.frames_rastreados += 1
+        self._frames_desde_deteccao += 1
+
+        contagens = [len(p) for p in self._pontos]
+        if sum(contagens) == 0:
+            # Sem pontos para seguir: as caixas (se houver) ficam paradas
+            # até a próxima detecção, que é antecipada
+            if len(self._deteccoes):
+                self._antecipar()
+            self._cinza = atual
+            return self._deteccoes.copy()
+
+        anteriores = np.concatenate(self._pontos)
+        seguintes, status, _ = cv2.calcOpticalFlowPyrLK(
+            self._cinza, atual, anteriores, None, **PARAMETROS_FLUXO
+        )
+        status = status.ravel().astype(bool)
+
+        inicio = 0
+        for i, quantidade in enumerate(contagens):
+            fim = inicio + quantidade
+            validos = status[inicio:fim]
+            antes = anteriores[inicio:fim][validos]
+            depois = seguintes[inicio:fim][validos]
+            self._pontos[i] = depois
+            inicio = fim
+            if len(antes) < quantidade * (1 - LIMIAR_PONTOS_PERDIDOS):
+                self._antecipar()
+            if len(antes):
+                self._deslocar_caixa(
+                    self._deteccoes[i], antes, depois, frame.shape[:2]
+                )
+
+        self._cinza = atual
+        return self._deteccoes.copy()
+
+    def _deslocar_caixa(self, caixa, antes, depois, tamanho_frame):
+        """
+        Desloca a caixa pela mediana do fluxo de seus pontos, limitada ao
+        frame, e antecipa a detecção se o deslocamento for grande.
+        """
+        altura, largura = tamanho_frame
+        dx, dy = np.median(depois - antes, axis=(0, 1)) / self._escala
+        if abs(dx) > LIMIAR_DESLOCAMENTO * max(caixa[2] - caixa[0], 1) or abs(
+            dy
+        ) > LIMIAR_DESLOCAMENTO * max(caixa[3] - caixa[1], 1):
+            self._antecipar()
+        caixa[[0, 2]] = np.clip(caixa[[0, 2]] + dx, 0, largura)
+        caixa[[1, 3]] = np.clip(caixa[[1, 3]] + dy, 0, altura)
+
+    def _antecipar(self):
+        if not self._forcar:
+            self._forcar = True
+            self.deteccoes_antecipadas += 1
+
+    def taxa_economia(self):
+        total = self.deteccoes + self.frames_rastreados
+        if total == 0:
+            return 0.0
+        return self.frames_rastreados / total
@@ -0,0 +1,49 @@
+import csv
+import os
+import time
+
+
+def salvar_csv_relatorio(
+    linha_tempo, csv_dir, origem='midia', poses_por_imagem=None
+):
+    """
+    Salva a tabela final como CSV no diretório informado, calculada a partir
+    da linha do tempo das poses, junto com os trechos da própria linha do
+    tempo. Com poses_por_imagem (lista de (imagem, pose, confiança)), o
+    segundo arquivo traz a pose de cada imagem no lugar da linha do tempo.
+    Colunas: pose, duracao_min, porcentagem
+    """
+    os.makedirs(csv_dir, exist_ok=True)
+
+    linhas = []
+    for pose, duracao_s, porcentagem in linha_tempo.resumo():
+        linhas.append([pose, f'{duracao_s / 60:.2f}', f'{porcentagem:.1f}%'])
+
+    timestamp = time.strftime('%Y%m%d_%H%M%S')
+    nome_arquivo = f'relatorio_poses_{origem}_{timestamp}.csv'
+    caminho_csv = os.path.join(csv_dir, nome_arquivo)
+    caminho_linha_tempo = os.path.join(
+        csv_dir, f'linha_tempo_poses_{origem}_{timestamp}.csv'
+    )
+    caminho_por_imagem = os.path.join(
+        csv_dir, f'poses_por_imagem_{origem}_{timestamp}.csv'
+    )
+
+    with open(caminho_csv, mode='w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(['pose', 'duracao_min', 'porcentagem'])
+        writer.writerows(linhas)
+
+    if poses_por_imagem is not None:
+        with open(
+            caminho_por_imagem, mode='w', newline='', encoding='utf-8'
+        ) as f:
+            writer = csv.writer(f, delimiter=';')
+            writer.writerow(['imagem', 'pose', 'confianca'])
+            for imagem, pose, confianca in poses_por_imagem:
+                writer.writerow([imagem, pose, f'{confianca:.3f}'])
+        return caminho_csv, caminho_por_imagem
+
+    linha_tempo.salvar_csv(caminho_linha_tempo)
+
+    return caminho_csv, caminho_linha_tempo
@@ -0,0 +1,99 @@
+import time
+
+import cv2
+import numpy as np
+
+from constants import (
+    CLASSES_DETECTADAS,
+    COR_BBOX,
+    ESPESSURA_BBOX,
+    TAMANHO_FONTE,
+    TAXA_ATUALIZACAO_TELA,
+)
+from deteccao import dados_deteccoes
+
+FONTE = cv2.FONT_HERSHEY_SIMPLEX
+COR_TEXTO = (0, 0, 0)  # Preto em BGR, sobre o fundo na cor da caixa
+
+
+class RenderizadorAnotacoes:
+    """
+    Desenha as detecções com cv2.rectangle/cv2.putText em um buffer
+    reutilizado, no lugar de results.plot(), que copia o frame e passa pelo
+    anotador genérico do ultralytics a cada chamada.
+
+    A exibição acompanha a taxa de atualização da tela e não a taxa de
+    inferência: pronto_para_exibir() indica quando o próximo frame deve ser
+    desenhado e mostrado; nos demais frames nada é desenhado.
+    """
+
+    def __init__(self, titulo, taxa_atualizacao=TAXA_ATUALIZACAO_TELA):
+        self.titulo = titulo
+        self.intervalo = 1 / taxa_atualizacao if taxa_atualizacao > 0 else 0.0
+        self._buffer = None
+        self._ultima_exibicao = -np.inf
+
+        self.frames_exibidos = 0
+        self.frames_pulados = 0
+
+    def pronto_para_exibir(self):
+        if time.perf_counter() - self._ultima_exibicao >= self.intervalo:
+            return True
+        self.frames_pulados += 1
+        return False
+
+    def desenhar(self, frame, resultado):
+        """
+        Copia o frame para o buffer reutilizado e desenha caixas e rótulos
+        (pose e confiança). O frame original não é alterado.
+        """
+        if self._buffer is None or self._buffer.shape != frame.shape:
+            self._buffer = np.empty_like(frame)
+        np.copyto(self._buffer, frame)
+
+        espessura_texto = max(ESPESSURA_BBOX - 1, 1)
+        for *caixa, conf, classe in dados_deteccoes(resultado):
+            esquerda, cima, direita, baixo = (int(v) for v in caixa)
+            cv2.rectangle(
+                self._buffer,
+                (esquerda, cima),
+                (direita, baixo),
+                COR_BBOX,
+                ESPESSURA_BBOX,
+            )
+
+            rotulo = f'{CLASSES_DETECTADAS.get(int(classe), int(classe))}'
+            rotulo += f' {conf:.2f}'
+            (largura, altura), base = cv2.getTextSize(
+                rotulo, FONTE, TAMANHO_FONTE, espessura_texto
+            )
+            # Rótulo acima da caixa, ou dentro dela quando não cabe
+            topo = cima - altura - base if cima - altura - base >= 0 else cima
+            cv2.rectangle(
+                self._buffer,
+                (esquerda, topo),
+                (esquerda + largura, topo + altura + base),
+                COR_BBOX,
+                cv2.FILLED,
+            )
+            cv2.putText(
+                self._buffer,
+                rotulo,
+                (esquerda, topo + altura),
+                FONTE,
+                TAMANHO_FONTE,
+                COR_TEXTO,
+                espessura_texto,
+                cv2.LINE_AA,
+            )
+        return self._buffer
+
+    def mostrar(self, imagem, espera_ms=1):
+        """
+        Exibe a imagem na janela e retorna a tecla pressionada (cv2.waitKey).
+        """
+        cv2.imshow(self.titulo, imagem)
+        tecla = cv2.waitKey(espera_ms) & 0xFF
+        self._ultima_exibicao = time.perf_counter()
+        self.frames_exibidos += 1
+        return tecla
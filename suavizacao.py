@@ -0,0 +1,164 @@
+import numpy as np
+from rich.table import Table
+
+from constants import (
+    ALFA_SUAVIZACAO,
+    CLASSES_DETECTADAS,
+    CONFIRMACAO_HISTERESE,
+    JANELA_SUAVIZACAO,
+    METODOS_SUAVIZACAO,
+    POSE_NAO_DETECTADA,
+)
+
+POSES = (*CLASSES_DETECTADAS.values(), POSE_NAO_DETECTADA)
+_INDICES_POSES = {pose: i for i, pose in enumerate(POSES)}
+
+
+class SuavizadorPoses:
+    """
+    Suaviza a pose escolhida em cada frame antes da contagem, para que
+    frames isolados na fronteira entre duas poses (sentado/deitado) não
+    gerem transições espúrias.
+
+    Métodos:
+    - 'maioria': pose mais frequente nas últimas `janela` poses, mantidas
+      em um buffer circular com as contagens atualizadas a cada frame
+      (entra uma, sai uma); em empate fica a pose atual.
+    - 'ema': média móvel exponencial da confiança de cada pose (peso
+      `alfa` para o frame atual); vence a maior.
+    - 'histerese': a pose só muda depois de `confirmacao` frames seguidos
+      com a mesma pose nova.
+
+    Todos custam tempo e memória constantes por frame. As contagens e
+    transições brutas e suavizadas ficam disponíveis para o relatório.
+    """
+
+    def __init__(
+        self,
+        metodo='maioria',
+        janela=JANELA_SUAVIZACAO,
+        alfa=ALFA_SUAVIZACAO,
+        confirmacao=CONFIRMACAO_HISTERESE,
+    ):
+        if metodo not in METODOS_SUAVIZACAO or metodo == 'nenhuma':
+            raise ValueError(f'Método de suavização inválido: {metodo!r}')
+        self.metodo = metodo
+        self.janela = janela
+        self.alfa = alfa
+        self.confirmacao = confirmacao
+
+        # Buffer circular da votação por maioria
+        self._buffer_poses = np.full(janela, -1, dtype=np.int8)
+        self._buffer_confiancas = np.zeros(janela, dtype=np.float32)
+        self._posicao = 0
+        self._contagens = np.zeros(len(POSES), dtype=np.int32)
+        self._somas_confianca = np.zeros(len(POSES), dtype=np.float64)
+
+        # Média móvel exponencial por pose
+        self._pontuacoes = np.zeros(len(POSES), dtype=np.float64)
+
+        # Histerese
+        self._candidata = None
+        self._seguidos = 0
+        self._ultima_confianca = np.zeros(len(POSES), dtype=np.float32)
+
+        self._atual = None
+        self._ultima_bruta = None
+
+        self.contagens_brutas = dict.fromkeys(POSES, 0)
+        self.contagens_suavizadas = dict.fromkeys(POSES, 0)
+        self.transicoes_brutas = 0
+        self.transicoes_suavizadas = 0
+
+    def _maioria(self, indice, confianca):
+        saindo = self._buffer_poses[self._posicao]
+        if saindo >= 0:
+            self._contagens[saindo] -= 1
+            self._somas_confianca[saindo] -= self._buffer_confiancas[
+                self._posicao
+            ]
+        self._buffer_poses[self._posicao] = indice
+        self._buffer_confiancas[self._posicao] = confianca
+        self._contagens[indice] += 1
+        self._somas_confianca[indice] += confianca
+        self._posicao = (self._posicao + 1) % self.janela
+
+        vencedora = int(self._contagens.argmax())
+        if (
+            self._atual is not None
+            and self._contagens[self._atual] == self._contagens[vencedora]
+        ):
+            vencedora = self._atual
+        media = self._somas_confianca[vencedora] / self._contagens[vencedora]
+        return vencedora, float(media)
+
+    def _ema(self, indice, confianca):
+        # Frames sem detecção não têm confiança: contam com peso 1
+        peso = confianca if POSES[indice] != POSE_NAO_DETECTADA else 1.0
+        self._pontuacoes *= 1 - self.alfa
+        self._pontuacoes[indice] += self.alfa * peso
+        vencedora = int(self._pontuacoes.argmax())
+        return vencedora, float(self._pontuacoes[vencedora])
+
+    def _histerese(self, indice, confianca):
+        self._ultima_confianca[indice] = confianca
+        if self._atual is None or indice == self._atual:
+            self._candidata = None
+            self._seguidos = 0
+            return indice, confianca
+
+        if indice == self._candidata:
+            self._seguidos += 1
+        else:
+            self._candidata = indice
+            self._seguidos = 1
+        if self._seguidos >= self.confirmacao:
+            self._candidata = None
+            self._seguidos = 0
+            return indice, confianca
+        return self._atual, float(self._ultima_confianca[self._atual])
+
+    def suavizar(self, pose, confianca):
+        """
+        Recebe a (pose, confiança) bruta de um frame e retorna a suavizada.
+        """
+        indice = _INDICES_POSES[pose]
+        if self.metodo == 'maioria':
+            suavizada, confianca_suavizada = self._maioria(indice, confianca)
+        elif self.metodo == 'ema':
+            suavizada, confianca_suavizada = self._ema(indice, confianca)
+        else:
+            suavizada, confianca_suavizada = self._histerese(indice, confianca)
+
+        self.contagens_brutas[pose] += 1
+        if self._ultima_bruta is not None and indice != self._ultima_bruta:
+            self.transicoes_brutas += 1
+        self._ultima_bruta = indice
+
+        self.contagens_suavizadas[POSES[suavizada]] += 1
+        if self._atual is not None and suavizada != self._atual:
+            self.transicoes_suavizadas += 1
+        self._atual = suavizada
+        return POSES[suavizada], confianca_suavizada
+
+    def suavizar_lote(self, selecoes):
+        return [self.suavizar(pose, conf) for pose, conf in selecoes]
+
+    def tabela(self, titulo='🪄 Suavização das poses'):
+        table = Table(title=f'{titulo} ({self.metodo})')
+        table.add_column('Pose', style='cyan')
+        table.add_column('Frames (bruto)', justify='right')
+        table.add_column('Frames (suavizado)', justify='right')
+        for pose in POSES:
+            table.add_row(
+                pose,
+                str(self.contagens_brutas[pose]),
+                str(self.contagens_suavizadas[pose]),
+            )
+        table.add_row(
+            'Transições',
+            str(self.transicoes_brutas),
+            str(self.transicoes_suavizadas),
+            style='bold',
+        )
+        return table
@@ -0,0 +1,255 @@
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from envio import EnviadorRelatorios
+
+# Esperas curtas para os testes não dependerem dos valores de produção
+ESPERA_TESTE = 0.05
+ESPERA_MAXIMA_TESTE = 0.2
+PRAZO_TESTE = 5.0
+QUANTIDADE_RELATORIOS = 3
+
+
+class _Servidor(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, endereco):
+        super().__init__(endereco, _Manipulador)
+        self.respostas = []  # status das próximas respostas (padrão 200)
+        self.atraso = 0.0  # segundos antes de responder
+        self.recebidos = []  # (instante, porta do cliente, corpo)
+        self._trava = threading.Lock()
+
+    def proxima_resposta(self):
+        with self._trava:
+            return self.respostas.pop(0) if self.respostas else 200
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    # HTTP/1.1 mantém a conexão aberta entre requisições
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        tamanho = int(self.headers['Content-Length'])
+        corpo = json.loads(self.rfile.read(tamanho))
+        time.sleep(self.server.atraso)
+        status = self.server.proxima_resposta()
+        with self.server._trava:
+            self.server.recebidos.append((
+                time.monotonic(),
+                self.client_address[1],
+                corpo,
+            ))
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _iniciar_servidor(porta=0):
+    servidor = _Servidor(('127.0.0.1', porta))
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _aguardar(condicao, prazo=PRAZO_TESTE):
+    limite = time.monotonic() + prazo
+    while time.monotonic() < limite:
+        if condicao():
+            return True
+        time.sleep(0.01)
+    return condicao()
+
+
+@pytest.fixture
+def servidor():
+    servidor = _iniciar_servidor()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+@pytest.fixture
+def criar_enviador(tmp_path):
+    enviadores = []
+
+    def criar(url, **opcoes):
+        opcoes.setdefault('espera_inicial', ESPERA_TESTE)
+        opcoes.setdefault('espera_maxima', ESPERA_MAXIMA_TESTE)
+        enviador = EnviadorRelatorios(url, str(tmp_path / 'spool'), **opcoes)
+        enviadores.append(enviador)
+        return enviador
+
+    yield criar
+    for enviador in enviadores:
+        enviador.encerrar(timeout=PRAZO_TESTE)
+
+
+def _url(servidor):
+    return f'http://127.0.0.1:{servidor.server_address[1]}/relatorios'
+
+
+def test_envia_relatorios_reaproveitando_a_conexao(servidor, criar_enviador):
+    enviador = criar_enviador(_url(servidor))
+
+    for i in range(QUANTIDADE_RELATORIOS):
+        enviador.enviar({'relatorio': i}, f'relatorio_{i}')
+    assert _aguardar(lambda: enviador.enviados == QUANTIDADE_RELATORIOS)
+
+    assert [corpo for _, _, corpo in servidor.recebidos] == [
+        {'relatorio': 0},
+        {'relatorio': 1},
+        {'relatorio': 2},
+    ]
+    # Mesma porta de origem: todas as requisições usaram uma só conexão
+    assert len({porta for _, porta, _ in servidor.recebidos}) == 1
+    assert enviador.falhas == 0
+    assert enviador.pendentes_spool() == 0
+
+
+def test_servidor_lento_estoura_o_tempo_limite(servidor, criar_enviador):
+    servidor.atraso = 0.5
+    enviador = criar_enviador(_url(servidor), timeout=(1.0, 0.1), tentativas=1)
+
+    inicio = time.monotonic()
+    enviador.enviar({'relatorio': 0}, 'relatorio_0')
+    assert _aguardar(lambda: enviador.falhas == 1)
+
+    assert time.monotonic() - inicio < servidor.atraso
+    assert 'timed out' in enviador.ultimo_erro
+    assert enviador.pendentes_spool() == 1
+
+
+def test_erro_5xx_e_reenviado_com_backoff(servidor, criar_enviador):
+    servidor.respostas = [500, 503]
+    tentativas = len(servidor.respostas) + 1
+    enviador = criar_enviador(_url(servidor), tentativas=tentativas)
+
+    enviador.enviar({'relatorio': 0}, 'relatorio_0')
+    assert _aguardar(lambda: enviador.enviados == 1)
+
+    instantes = [instante for instante, _, _ in servidor.recebidos]
+    assert len(instantes) == tentativas
+    primeira_espera = instantes[1] - instantes[0]
+    segunda_espera = instantes[2] - instantes[1]
+    assert primeira_espera >= ESPERA_TESTE
+    assert segunda_espera >= 2 * ESPERA_TESTE
+    assert enviador.falhas == 0
+    assert enviador.pendentes_spool() == 0
+
+
+def test_erro_de_conexao_e_reenviado_e_vai_para_o_spool(criar_enviador):
+    enviador = criar_enviador(
+        f'http://127.0.0.1:{_porta_livre()}/relatorios', tentativas=2
+    )
+
+    inicio = time.monotonic()
+    enviador.enviar({'relatorio': 0}, 'relatorio_0')
+    assert _aguardar(lambda: enviador.falhas == 1)
+
+    # Uma espera entre as duas tentativas
+    assert time.monotonic() - inicio >= ESPERA_TESTE
+    assert enviador.enviados == 0
+    assert enviador.pendentes_spool() == 1
+
+
+def test_spool_e_esvaziado_quando_o_servidor_volta(tmp_path, criar_enviador):
+    porta = _porta_livre()
+    enviador = criar_enviador(
+        f'http://127.0.0.1:{porta}/relatorios', tentativas=1
+    )
+
+    for i in range(QUANTIDADE_RELATORIOS):
+        enviador.enviar({'relatorio': i}, f'relatorio_{i}')
+    assert _aguardar(lambda: enviador.falhas == QUANTIDADE_RELATORIOS)
+    assert sorted(os.listdir(tmp_path / 'spool')) == [
+        'relatorio_0.json',
+        'relatorio_1.json',
+        'relatorio_2.json',
+    ]
+
+    servidor = _iniciar_servidor(porta)
+    try:
+        assert _aguardar(lambda: enviador.pendentes_spool() == 0)
+        assert [corpo for _, _, corpo in servidor.recebidos] == [
+            {'relatorio': 0},
+            {'relatorio': 1},
+            {'relatorio': 2},
+        ]
+        assert enviador.enviados == QUANTIDADE_RELATORIOS
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+
+
+def test_spool_de_execucao_anterior_e_reenviado(
+    servidor, tmp_path, criar_enviador
+):
+    spool = tmp_path / 'spool'
+    spool.mkdir()
+    (spool / 'antigo.json').write_text(
+        json.dumps({'relatorio': 'antigo'}), encoding='utf-8'
+    )
+    (spool / 'corrompido.json').write_text('{', encoding='utf-8')
+
+    enviador = criar_enviador(_url(servidor))
+
+    assert _aguardar(lambda: enviador.pendentes_spool() == 0)
+    assert [corpo for _, _, corpo in servidor.recebidos] == [
+        {'relatorio': 'antigo'}
+    ]
+    # O arquivo corrompido é separado para não bloquear os demais
+    assert (spool / 'corrompido.json.invalido').exists()
+
+
+def test_relatorio_rejeitado_nao_e_reenviado(servidor, criar_enviador):
+    servidor.respostas = [422]
+    enviador = criar_enviador(_url(servidor), tentativas=3)
+
+    enviador.enviar({'relatorio': 0}, 'relatorio_0')
+    assert _aguardar(lambda: enviador.rejeitados == 1)
+
+    assert len(servidor.recebidos) == 1
+    assert enviador.falhas == 0
+    assert enviador.pendentes_spool() == 0
+    assert os.path.exists(
+        os.path.join(enviador.diretorio_spool, 'relatorio_0.json.invalido')
+    )
+
+
+def test_spool_rejeitado_nao_bloqueia_os_seguintes(
+    servidor, tmp_path, criar_enviador
+):
+    spool = tmp_path / 'spool'
+    spool.mkdir()
+    for nome in ('a', 'b'):
+        (spool / f'{nome}.json').write_text(
+            json.dumps({'relatorio': nome}), encoding='utf-8'
+        )
+    servidor.respostas = [400]
+
+    enviador = criar_enviador(_url(servidor))
+
+    assert _aguardar(lambda: enviador.pendentes_spool() == 0)
+    assert [corpo for _, _, corpo in servidor.recebidos] == [
+        {'relatorio': 'a'},
+        {'relatorio': 'b'},
+    ]
+    assert enviador.enviados == 1
+    assert enviador.rejeitados == 1
+    # O relatório rejeitado é separado como o arquivo corrompido
+    assert (spool / 'a.json.invalido').exists()
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from constants import POSE_NAO_DETECTADA
+from linha_tempo import LinhaTempoPoses
+
+DURACAO_FRAME = 0.1
+
+DEITADO = 'idoso deitado'
+EM_PE = 'idoso em pe'
+SENTADO = 'idoso sentado'
+
+# (pose, confiança) de cada frame de um vídeo a 10 fps
+SEQUENCIA = [
+    (pose, 0.5 + 0.01 * i)
+    for i, pose in enumerate(
+        [SENTADO] * 5
+        + [DEITADO] * 4
+        + [POSE_NAO_DETECTADA] * 2
+        + [DEITADO] * 3
+        + [EM_PE] * 6
+    )
+]
+INSTANTES = [i * DURACAO_FRAME for i in range(len(SEQUENCIA))]
+
+
+def _linha_tempo(inicio, fim):
+    linha = LinhaTempoPoses()
+    linha.registrar_lote(INSTANTES[inicio:fim], SEQUENCIA[inicio:fim])
+    return linha
+
+
+@pytest.mark.parametrize(
+    'cortes',
+    [
+        (3,),  # no meio do primeiro trecho
+        (2, 7, 16),  # todos no meio de trechos
+        (5, 9, 11),  # nas trocas de pose
+        (1, 2, 3, 4),  # partes de um único frame
+    ],
+)
+def test_partes_anexadas_equivalem_a_execucao_sequencial(cortes):
+    sequencial = _linha_tempo(0, len(SEQUENCIA))
+    sequencial.finalizar(DURACAO_FRAME)
+
+    limites = [0, *cortes, len(SEQUENCIA)]
+    juntada = LinhaTempoPoses()
+    for inicio, fim in zip(limites, limites[1:]):
+        juntada.anexar(_linha_tempo(inicio, fim))
+    juntada.finalizar(DURACAO_FRAME)
+
+    assert len(juntada) == len(sequencial)
+    for esperado, obtido in zip(sequencial.trechos(), juntada.trechos()):
+        np.testing.assert_allclose(obtido, esperado)
+    for pose in sequencial.duracoes():
+        assert juntada.tempo_em_pose(pose) == pytest.approx(
+            sequencial.tempo_em_pose(pose)
+        )
+    assert juntada.contagens() == sequencial.contagens()
+
+
+def test_anexar_junta_trecho_que_atravessa_a_divisao():
+    linha = _linha_tempo(0, 3)
+    linha.anexar(_linha_tempo(3, 5))
+    linha.finalizar(DURACAO_FRAME)
+
+    inicio, fim, _, frames, _ = linha.trechos()
+    assert len(linha) == 1
+    assert frames[0] == len(SEQUENCIA[:5])
+    assert inicio[0] == pytest.approx(0.0)
+    assert fim[0] == pytest.approx(INSTANTES[4] + DURACAO_FRAME)
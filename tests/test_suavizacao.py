@@ -0,0 +1,70 @@
+import pytest
+
+pytest.importorskip('rich')
+
+from suavizacao import SuavizadorPoses  # noqa: E402
+
+DEITADO = 'idoso deitado'
+SENTADO = 'idoso sentado'
+
+JANELA_TESTE = 4
+ALFA_TESTE = 0.3
+CONFIRMACAO_TESTE = 2
+
+# Pessoa sentada que oscila com deitado antes de se deitar de vez
+SEQUENCIA = (
+    [(SENTADO, 0.6)] * 3
+    + [(DEITADO, 0.55), (SENTADO, 0.6), (DEITADO, 0.55), (SENTADO, 0.6)]
+    + [(DEITADO, 0.55)] * 4
+)
+TRANSICOES_BRUTAS = 5
+
+
+# frames_sentado: frames suavizados antes da mudança para deitado
+@pytest.mark.parametrize(
+    ('metodo', 'frames_sentado'),
+    [('maioria', 8), ('ema', 7), ('histerese', 8)],
+)
+def test_oscilacao_na_fronteira_vira_uma_unica_transicao(
+    metodo, frames_sentado
+):
+    suavizador = SuavizadorPoses(
+        metodo,
+        janela=JANELA_TESTE,
+        alfa=ALFA_TESTE,
+        confirmacao=CONFIRMACAO_TESTE,
+    )
+
+    poses = [pose for pose, _ in suavizador.suavizar_lote(SEQUENCIA)]
+
+    esperado = [SENTADO] * frames_sentado + [DEITADO] * (
+        len(SEQUENCIA) - frames_sentado
+    )
+    assert poses == esperado
+    assert suavizador.transicoes_brutas == TRANSICOES_BRUTAS
+    assert suavizador.transicoes_suavizadas == 1
+    assert suavizador.contagens_brutas[SENTADO] == sum(
+        pose == SENTADO for pose, _ in SEQUENCIA
+    )
+    assert suavizador.contagens_suavizadas[SENTADO] == frames_sentado
+
+
+def test_maioria_em_empate_mantem_a_pose_atual():
+    suavizador = SuavizadorPoses('maioria', janela=JANELA_TESTE)
+    suavizador.suavizar_lote([(SENTADO, 0.6), (SENTADO, 0.6)])
+
+    # Janela 2 x 2: o argmax escolheria deitado (índice menor)
+    pose, confianca = suavizador.suavizar_lote([
+        (DEITADO, 0.55),
+        (DEITADO, 0.55),
+    ])[-1]
+    assert pose == SENTADO
+    assert confianca == pytest.approx(0.6)
+
+    pose, _ = suavizador.suavizar(DEITADO, 0.55)
+    assert pose == DEITADO
+
+
+def test_metodo_invalido():
+    with pytest.raises(ValueError, match='inválido'):
+        SuavizadorPoses('nenhuma')